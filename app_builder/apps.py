@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppBuilderConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_builder'
+
+    def ready(self):
+        from . import signals  # noqa
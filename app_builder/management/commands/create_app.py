@@ -13,6 +13,9 @@ from django.core.management import call_command
 from django.conf import settings
 from django.db import connection
 
+from app_builder.utils import hot_registry
+from utils.shared_cache import is_shared_cache
+
 # Configure logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -304,6 +307,9 @@ class Command(BaseCommand):
         parser.add_argument('--skip-tests', action='store_true', help='Skip test file generation')
         parser.add_argument('--skip-admin', action='store_true', help='Skip admin registration')
         parser.add_argument('--skip-urls', action='store_true', help='Skip URL generation')
+        parser.add_argument('--hot', action='store_true',
+                            help='Register the app in the hot apps manifest and load it into running '
+                                 'workers instead of editing settings.py')
 
     def handle(self, *args, **kwargs):
         logger.info(f"Arguments: {args}, Options: {kwargs}")
@@ -315,6 +321,7 @@ class Command(BaseCommand):
         skip_tests = kwargs.get('skip_tests')
         skip_admin = kwargs.get('skip_admin')
         skip_urls = kwargs.get('skip_urls')
+        hot = kwargs.get('hot')
 
         # Check if running in non-interactive mode (from API)
         self.non_interactive = os.environ.get('DJANGO_SUPERUSER_PASSWORD') == 'yes'
@@ -327,6 +334,13 @@ class Command(BaseCommand):
             logger.error(f"Invalid app name: {app_name}")
             raise CommandError(f"Invalid app name: {app_name}")
 
+        if hot and not is_shared_cache():
+            # publish_hot_apps() would only bump this process's own cache
+            raise CommandError(
+                "--hot needs a cache shared by all workers (set REDIS_CACHE_URL); "
+                "with the per-process default cache running workers never load "
+                "the app. Run without --hot to register it in settings.py instead.")
+
         # Step 1: Load and validate model definitions
         models = self.load_model_definitions(models_definition, models_file)
 
@@ -382,31 +396,24 @@ class Command(BaseCommand):
 
         # Step 3: Create app structure and files
         try:
-            self.register_app_in_settings(app_name)
-            self.add_middleware_to_settings(app_name)
-            self.create_app_files(app_name, app_path)
-            # sleep(10)
-            self.generate_logger_file(app_path, app_name)
-            self.generate_utils_folder(app_path, app_name)
-            self.generate_crud_folder(app_path, app_name)
-            self.generate_mixins_file(app_path, app_name)
-            self.generate_models_file(app_path, models, app_name)
-            self.generate_signals_file(app_path, models, app_name)
-            self.generate_middleware_file(app_path, app_name)
-            self.generate_serializers_file(app_path, models, app_name)
-            self.generate_views_file(app_path, models, app_name)
-            # self.register_app_in_settings(app_name)
-            # self.add_middleware_to_settings(app_name)
-
-            if not skip_urls:
-                self.generate_urls_file(app_path, models, app_name)
-            self.generate_dynamic_form_builder(app_path, app_name, models)
-            if not skip_admin:
-                self.generate_admin_file(app_path, models, app_name)
-            if not skip_tests:
-                self.generate_tests_file(app_path, models, app_name)
-            self.generate_commands_file(app_path)
-            self.create_migrations(app_name)
+            if not hot:
+                self.register_app_in_settings(app_name)
+                self.add_middleware_to_settings(app_name)
+            self.generate_app(
+                app_name, app_path, models, skip_tests, skip_admin, skip_urls)
+            if hot:
+                # Listed only once its files exist: every process loads the manifest at startup
+                added = self.register_hot_app(app_name, overwrite)
+                try:
+                    self.create_migrations(app_name)
+                except CommandError:
+                    if added:
+                        hot_registry.remove_hot_app(app_name)
+                    raise
+                # Running workers install the app on their next request or task
+                hot_registry.publish_hot_apps()
+            else:
+                self.create_migrations(app_name)
 
             self.stdout.write(self.style.SUCCESS(f"Application '{app_name}' created successfully."))
             logger.info(f"Application '{app_name}' created successfully.")
@@ -417,6 +424,32 @@ class Command(BaseCommand):
             logger.exception(f"An unexpected error occurred: {e}")
             raise CommandError(f"An unexpected error occurred: {e}")
 
+    def generate_app(self, app_name, app_path, models,
+                     skip_tests=False, skip_admin=False, skip_urls=False):
+        """Write every file of the app package at ``app_path``."""
+        self.create_app_files(app_name, app_path)
+        # sleep(10)
+        self.generate_logger_file(app_path, app_name)
+        self.generate_utils_folder(app_path, app_name)
+        self.generate_crud_folder(app_path, app_name)
+        self.generate_mixins_file(app_path, app_name)
+        self.generate_models_file(app_path, models, app_name)
+        self.generate_signals_file(app_path, models, app_name)
+        self.generate_middleware_file(app_path, app_name)
+        self.generate_serializers_file(app_path, models, app_name)
+        self.generate_views_file(app_path, models, app_name)
+        # self.register_app_in_settings(app_name)
+        # self.add_middleware_to_settings(app_name)
+
+        if not skip_urls:
+            self.generate_urls_file(app_path, models, app_name)
+        self.generate_dynamic_form_builder(app_path, app_name, models)
+        if not skip_admin:
+            self.generate_admin_file(app_path, models, app_name)
+        if not skip_tests:
+            self.generate_tests_file(app_path, models, app_name)
+        self.generate_commands_file(app_path)
+
     def load_model_definitions(self, models_definition, models_file):
         """
         Load model definitions from either a string or a file, and validate the schema.
@@ -451,6 +484,20 @@ class Command(BaseCommand):
 
         return models
 
+    def register_hot_app(self, app_name, overwrite=False):
+        """
+        List the app in the hot apps manifest, which settings.py reads at
+        startup and running workers read on publish, instead of editing settings.py.
+        """
+        if hot_registry.add_hot_app(app_name):
+            self.stdout.write(self.style.SUCCESS(f"App '{app_name}' added to the hot apps manifest."))
+            return True
+        self.stdout.write(self.style.WARNING(f"App '{app_name}' is already in the hot apps manifest."))
+        if overwrite:
+            self.stdout.write(self.style.WARNING(
+                f"App '{app_name}' is already loaded; running workers keep its old models until restarted."))
+        return False
+
     def create_app_files(self, app_name, app_path):
         """
         Create basic files for the Django app with advanced configuration in apps.py.
@@ -802,6 +849,14 @@ class BaseModelSerializer(serializers.ModelSerializer):
     Enhanced base serializer to support full_clean(), user injection, and ManyToMany handling.
     \"\"\"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Field selection (?fields=...) passed in by the view
+        requested_fields = self.context.get('requested_fields')
+        if requested_fields is not None:
+            for field_name in set(self.fields) - set(requested_fields):
+                self.fields.pop(field_name)
+
     def _run_model_clean(self, instance):
         user = self.context.get('request', None) and self.context['request'].user
         if hasattr(instance, 'set_validation_user'):
@@ -884,6 +939,19 @@ class ValidationRuleSerializer(serializers.ModelSerializer):
             f.write(code)
         logger.debug("Generated 'serializers.py'.")
 
+    def get_queryset_plan(self, model):
+        """
+        (select_related, prefetch_related) field names for a model definition:
+        ForeignKey and OneToOneField are joined, ManyToManyField is prefetched.
+        """
+        select_related, prefetch_related = [], []
+        for field in model.get("fields", []) + model.get("relationships", []):
+            if field["type"] in ["ForeignKey", "OneToOneField"]:
+                select_related.append(field["name"])
+            elif field["type"] == "ManyToManyField":
+                prefetch_related.append(field["name"])
+        return tuple(select_related), tuple(prefetch_related)
+
     def generate_views_file(self, app_path, models, app_name):
         """
         Generate views.py with DRF ViewSets, applying conditional logic.
@@ -904,6 +972,54 @@ class ValidationRuleSerializer(serializers.ModelSerializer):
         # Start views file content
         views_code = imports
 
+        views_code += """
+class OptimizedQuerysetMixin:
+    \"\"\"
+    Loads the relations listed in select_related_fields/prefetch_related_fields
+    with the rows, and for list and retrieve calls with ?fields=a,b only the
+    requested columns and relations.
+    \"\"\"
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def get_requested_fields(self):
+        if self.action not in ('list', 'retrieve'):
+            return None
+        fields = self.request.query_params.get('fields')
+        if not fields:
+            return None
+        opts = self.queryset.model._meta
+        known = {field.name for field in opts.concrete_fields} | {field.name for field in opts.many_to_many}
+        return [name for name in (part.strip() for part in fields.split(',')) if name in known]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select_related = self.select_related_fields
+        prefetch_related = self.prefetch_related_fields
+
+        requested_fields = self.get_requested_fields()
+        if requested_fields is not None:
+            select_related = [name for name in select_related if name in requested_fields]
+            prefetch_related = [name for name in prefetch_related if name in requested_fields]
+            m2m_names = {field.name for field in queryset.model._meta.many_to_many}
+            columns = [name for name in requested_fields if name not in m2m_names]
+            queryset = queryset.only(queryset.model._meta.pk.name, *columns)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        requested_fields = self.get_requested_fields()
+        if requested_fields is not None:
+            context['requested_fields'] = requested_fields
+        return context
+
+"""
+
         # IntegrationConfig ViewSet
         views_code += """
 class IntegrationConfigViewSet(viewsets.ModelViewSet):
@@ -939,11 +1055,14 @@ class ValidationRuleViewSet(viewsets.ModelViewSet):
         for model in models:
             model_name = model["name"]
             serializer_name = f"{model_name}Serializer"
+            select_related_fields, prefetch_related_fields = self.get_queryset_plan(model)
             views_code += f"""
-class {model_name}ViewSet(viewsets.ModelViewSet):
+class {model_name}ViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = {model_name}.objects.all()
     serializer_class = {serializer_name}
     permission_classes = (CRUDPermissionDRF, )
+    select_related_fields = {select_related_fields!r}
+    prefetch_related_fields = {prefetch_related_fields!r}
     def list(self, request, *args, **kwargs):
         # Add conditional filtering based on query params
         queryset = self.get_queryset()
@@ -1045,12 +1164,18 @@ if not logger.handlers:
         mixin_code = f"""from {app_name}.forms import DynamicFormBuilder
 from {app_name}.crud.managers import user_can
 import json
+import re
+import threading
+import time
 from {app_name}.utils.custom_validation import VALIDATOR_REGISTRY
 from {app_name}.utils.condition_evaluator import ConditionEvaluator
 from datetime import datetime
 from {app_name}.middleware import get_current_user
 from {app_name}.logger import logger
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.apps import apps
 
@@ -1249,6 +1374,142 @@ class DynamicAdminMixin:
             raise e
 
 
+# Attribute names __str__ tries after a model's own display_fields
+DISPLAY_COMMON_FIELDS = (
+    'name', 'title', 'label', 'display_name', 'full_name',
+    'username', 'email', 'code', 'slug', 'key', 'identifier',
+    'description', 'text', 'content', 'value', 'term',
+    # Add more based on your domain
+)
+
+
+def resolve_display_plan(model):
+    \"\"\"
+    What ModelCommonMixin.__str__ tries for ``model``, worked out once per
+    class: whether it has get_display_name(), then (attribute, truncate)
+    candidates in strategy order - display_fields, the common names the
+    model has, its CharFields from shortest to longest, its TextFields.
+    \"\"\"
+    candidates = []
+    seen = set()
+
+    def add(name, truncate=False):
+        if name not in seen:
+            seen.add(name)
+            candidates.append((name, truncate))
+
+    for name in getattr(model, 'display_fields', None) or ():
+        add(name)
+    for name in DISPLAY_COMMON_FIELDS:
+        if hasattr(model, name):
+            add(name)
+
+    plain_fields = [field for field in model._meta.concrete_fields if not field.is_relation]
+    char_fields = [field for field in plain_fields if field.get_internal_type() == 'CharField']
+    # Shorter fields are more likely to be names
+    for field in sorted(char_fields, key=lambda field: field.max_length or float('inf')):
+        add(field.name)
+    for field in plain_fields:
+        if field.get_internal_type() == 'TextField':
+            add(field.name, truncate=True)
+
+    has_display_method = callable(getattr(model, 'get_display_name', None))
+    return has_display_method, tuple(candidates)
+
+
+VALIDATION_PLAN_VERSION_KEY = "{app_name}:validation_plan_version"
+_UNLOADED = object()
+
+# Compiled ValidationRules per model name, dropped when the plan version
+# changes (ValidationRule saves, deletes and role changes; see signals.py).
+_validation_plans = {{'version': _UNLOADED, 'plans': {{}}}}
+_validation_plans_lock = threading.Lock()
+
+
+class CompiledValidationRule:
+    \"\"\"
+    A ValidationRule with its roles, regex and validator resolved once.
+    Validators still receive the ValidationRule row itself.
+    \"\"\"
+    __slots__ = ('id', 'validation_rule', 'field_name', 'validator_type', 'error_message', 'role_ids',
+                 'regex', 'condition_logic', 'function_name', 'validator', 'params')
+
+    def __init__(self, rule, params):
+        self.id = rule.id
+        self.validation_rule = rule
+        self.field_name = rule.field_name
+        self.validator_type = rule.validator_type
+        self.error_message = rule.error_message
+        self.role_ids = frozenset(role.pk for role in rule.user_roles.all())
+        self.condition_logic = rule.condition_logic
+        self.function_name = rule.function_name
+        self.validator = VALIDATOR_REGISTRY.get(rule.function_name) if rule.function_name else None
+        self.params = params
+
+        self.regex = None
+        pattern = rule.regex_pattern or (rule.function_params or {{}}).get('pattern')
+        if rule.validator_type == 'regex' and pattern:
+            try:
+                self.regex = re.compile(pattern)
+            except re.error as e:
+                logger.error(f"Invalid regex in validation rule {{rule.id}}: {{e}}")
+
+
+def get_validation_plan_version():
+    version = cache.get(VALIDATION_PLAN_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted counter can't restart at a
+        # version another process already compiled its plans under.
+        cache.add(VALIDATION_PLAN_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VALIDATION_PLAN_VERSION_KEY)
+    return version
+
+
+def invalidate_validation_plans(sender=None, **kwargs):
+    \"\"\"Drop the compiled plans here and, after commit, in every other process.\"\"\"
+    _validation_plans['version'] = _UNLOADED
+
+    def bump():
+        try:
+            cache.incr(VALIDATION_PLAN_VERSION_KEY)
+        except ValueError:
+            get_validation_plan_version()
+    transaction.on_commit(bump)
+
+
+def get_validation_plan(instance):
+    \"\"\"The compiled rules of ``instance``'s model, compiling them when missing or stale.\"\"\"
+    version = get_validation_plan_version()
+    if _validation_plans['version'] is _UNLOADED or _validation_plans['version'] != version:
+        with _validation_plans_lock:
+            _validation_plans['plans'] = {{}}
+            _validation_plans['version'] = version
+
+    model_name = instance.__class__.__name__
+    plan = _validation_plans['plans'].get(model_name)
+    if plan is None:
+        ValidationRuleModel = apps.get_model('{app_name}', 'ValidationRule')
+        rules = ValidationRuleModel.objects.filter(model_name=model_name).prefetch_related('user_roles')
+        plan = tuple(
+            CompiledValidationRule(rule, instance._prepare_validator_params(rule))
+            for rule in rules.order_by('id')
+        )
+        _validation_plans['plans'][model_name] = plan
+    return plan
+
+
+def get_user_group_ids(user):
+    \"\"\"The user's group ids, resolved once per user object (i.e. once per request).\"\"\"
+    group_ids = getattr(user, '_validation_group_ids', None)
+    if group_ids is None:
+        group_ids = frozenset(user.groups.values_list('pk', flat=True))
+        try:
+            user._validation_group_ids = group_ids
+        except AttributeError:
+            pass
+    return group_ids
+
+
 class ModelCommonMixin(models.Model):
     \"\"\"
     A mixin that adds created_at, updated_at, plus dynamic validation logic in clean().
@@ -1276,70 +1537,43 @@ class ModelCommonMixin(models.Model):
 
     def __str__(self):
         \"\"\"
-        Advanced __str__ method that intelligently finds the best field to display.
-        Tries multiple strategies to find a meaningful representation.
+        The first non-empty display candidate of the instance, tried in the
+        order resolve_display_plan() worked out for its class.
         \"\"\"
-        # Strategy 1: Check if model has a custom display method
-        if hasattr(self, 'get_display_name') and callable(getattr(self, 'get_display_name')):
+        has_display_method, candidates = self._display_plan
+
+        # Strategy 1: the model's own display method
+        if has_display_method:
             try:
                 return self.get_display_name()
             except:
                 pass  # Fall through to other strategies
-        
-        # Strategy 2: Check for model-specific display_fields attribute
-        display_fields = getattr(self, 'display_fields', None)
-        if display_fields:
-            for field in display_fields:
-                value = getattr(self, field, None)
-                if value and str(value).strip():
-                    return str(value)
-        
-        # Strategy 3: Try common field names in priority order
-        common_fields = [
-            'name', 'title', 'label', 'display_name', 'full_name',
-            'username', 'email', 'code', 'slug', 'key', 'identifier',
-            'description', 'text', 'content', 'value', 'term',
-            # Add more based on your domain
-        ]
-        
-        for field in common_fields:
-            value = getattr(self, field, None)
+
+        # Strategies 2-4: display_fields, common names, CharFields, TextFields
+        for name, truncate in candidates:
+            value = getattr(self, name, None)
             if value and str(value).strip():
+                if truncate:
+                    # For TextField, return truncated version
+                    text = str(value).strip()
+                    return text[:50] + '...' if len(text) > 50 else text
                 return str(value)
-        
-        # Strategy 4: Intelligently inspect model fields
-        if hasattr(self, '_meta'):
-            # First, try to find short CharFields (likely to be names/titles)
-            char_fields = []
-            for field in self._meta.get_fields():
-                if (field.concrete and not field.many_to_many and 
-                    not field.one_to_many and not field.related_model):
-                    if field.get_internal_type() == 'CharField':
-                        char_fields.append((field, getattr(field, 'max_length', float('inf'))))
-            
-            # Sort by max_length (shorter fields are more likely to be names)
-            char_fields.sort(key=lambda x: x[1])
-            
-            for field, _ in char_fields:
-                value = getattr(self, field.name, None)
-                if value and str(value).strip():
-                    return str(value)
-            
-            # If no CharField found, try TextField
-            for field in self._meta.get_fields():
-                if (field.concrete and not field.many_to_many and 
-                    not field.one_to_many and field.get_internal_type() == 'TextField'):
-                    value = getattr(self, field.name, None)
-                    if value and str(value).strip():
-                        # For TextField, return truncated version
-                        text = str(value).strip()
-                        return text[:50] + '...' if len(text) > 50 else text
-        
+
         # Strategy 5: Final fallback with safe ID access
         class_name = self.__class__.__name__
         obj_id = getattr(self, 'id', getattr(self, 'pk', 'N/A'))
         return f"{{class_name}} (ID: {{obj_id}})"
 
+    @property
+    def _display_plan(self):
+        # Set per class by prepare_display_plan(); resolved here for classes
+        # prepared before the receiver was connected.
+        model = self.__class__
+        plan = model.__dict__.get('_display_plan_cache')
+        if plan is None:
+            plan = model._display_plan_cache = resolve_display_plan(model)
+        return plan
+
     def clean(self):
         \"\"\"
         The single source of truth for dynamic validation rules.
@@ -1351,61 +1585,76 @@ class ModelCommonMixin(models.Model):
         if not user:
             raise ValidationError("User context is missing.")
 
-        # 1) Grab relevant ValidationRule objects
-        ValidationRuleModel = apps.get_model('{app_name}', 'ValidationRule')
-        model_name = self.__class__.__name__
-        rules = ValidationRuleModel.objects.filter(model_name=model_name)
+        self._apply_validation_plan(get_validation_plan(self), user)
+
+    @classmethod
+    def clean_many(cls, instances, user=None):
+        \"\"\"
+        Validate many instances for a bulk load, compiling the rules and
+        resolving the user's groups once. Returns {{position: ValidationError}}
+        for the instances that failed.
+        \"\"\"
+        errors = {{}}
+        plan = None
+        for position, instance in enumerate(instances):
+            try:
+                super(ModelCommonMixin, instance).clean()
+                instance_user = user or getattr(instance, '_validation_user', None) or get_current_user()
+                if not instance_user:
+                    raise ValidationError("User context is missing.")
+                if plan is None:
+                    plan = get_validation_plan(instance)
+                instance._apply_validation_plan(plan, instance_user)
+            except ValidationError as e:
+                errors[position] = e
+        return errors
+
+    def _apply_validation_plan(self, plan, user):
+        if not plan:
+            return
 
-        # 2) Build record_data for ConditionEvaluator
+        # 1) Build record_data for ConditionEvaluator
         record_data = {{}}
         for field in self._meta.fields:
             field_name = field.name
             record_data[field_name] = getattr(self, field_name, None)
+        cond_eval = None
 
-        # 3) Loop over rules
-        for rule in rules:
+        # 2) Loop over rules
+        for rule in plan:
             # --- (a) check user_roles ---
-            if rule.user_roles.exists():
-                user_groups = set(user.groups.all())
-                required_roles = set(rule.user_roles.all())
-
-                # If you truly want to BLOCK the user from saving if they lack these roles, you can:
-                if not user_groups.intersection(required_roles):
-                    # Raise an error if this field requires a certain role
-                    raise ValidationError({{
-                        rule.field_name: rule.error_message or "You do not have permission to modify this field."
-                    }})
-                    # Or "skip" the rule if you only want to skip that rule's validation,
-                    # but typically you'd raise an error if the user is unauthorized.
+            if rule.role_ids and not get_user_group_ids(user) & rule.role_ids:
+                # Raise an error if this field requires a certain role
+                raise ValidationError({{
+                    rule.field_name: rule.error_message or "You do not have permission to modify this field."
+                }})
             if rule.validator_type == 'regex':
-                pass
+                if rule.regex is not None:
+                    field_value = getattr(self, rule.field_name, None)
+                    if field_value not in (None, '') and not rule.regex.match(str(field_value)):
+                        raise ValidationError({{rule.field_name: rule.error_message or "Invalid format"}})
             elif rule.validator_type == 'condition':
-                # --- (b) condition logic (skip or fail) ---
+                # --- (b) condition logic: block saving when not satisfied ---
                 if rule.condition_logic:
-                    cond_eval = ConditionEvaluator(record_data)
-                    evaluation_result = cond_eval.evaluate(rule.condition_logic)
-                    if not evaluation_result:
-                        # If the condition is not satisfied, do you want to skip this rule
-                        # or block saving? Typically "skip" means "don't validate this rule."
-                        # So we just continue:
+                    if cond_eval is None:
+                        cond_eval = ConditionEvaluator(record_data)
+                    if not cond_eval.evaluate(rule.condition_logic):
                         raise ValidationError({{rule.field_name: rule.error_message}})
             elif rule.validator_type == 'function':
-                # --- (c) apply the actual validation (regex, function, etc.) ---
-                validator = VALIDATOR_REGISTRY[rule.function_name]
-                if not validator:
+                # --- (c) apply the registered validation function ---
+                if not rule.validator:
                     raise ValidationError({{
                         "__all__": f"Unknown validation rule type: {{rule.validator_type}}, {{rule.function_name}}"
                     }})
 
                 try:
-                    params = self._prepare_validator_params(rule)
                     field_value = getattr(self, rule.field_name, None)
 
                     # If your validator fails, it should raise ValidationError itself
-                    validator(
+                    rule.validator(
                         field_value,
-                        rule,
-                        **params,
+                        rule.validation_rule,
+                        **rule.params,
                     )
                 except ValidationError as ve:
                     # re-raise so admin shows it near `rule.field_name`
@@ -1431,6 +1680,13 @@ class ModelCommonMixin(models.Model):
     def set_validation_user(self, user):
         \"\"\"If needed, store the user for use in validations.\"\"\"
         setattr(self, '_validation_user', user)
+
+
+@receiver(class_prepared)
+def prepare_display_plan(sender, **kwargs):
+    \"\"\"Resolve the __str__ display plan of each ModelCommonMixin model as its class is prepared.\"\"\"
+    if issubclass(sender, ModelCommonMixin):
+        sender._display_plan_cache = resolve_display_plan(sender)
 """
         # Write the mixins.py file
         with open(os.path.join(app_path, 'mixins.py'), 'w') as f:
@@ -2212,18 +2468,22 @@ class DynamicFormBuilder(forms.ModelForm):
     def generate_signals_file(self, app_path, models, app_name):
         """
         Generate signals.py to handle dynamic pre-save and post-save hooks for models.
+        AutoCompute receivers are connected per model of the app, and rules are
+        read from an in-process index invalidated when a rule is saved or deleted.
         """
         logger.info("Generating 'signals.py' with dynamic signal handlers...")
         signal_code = (
-            f"from django.db.models.signals import pre_save, post_save\n"
+            f"from django.db.models.signals import pre_save, post_save, post_delete, post_init, m2m_changed\n"
             f"from django.dispatch import receiver\n"
-            f"from {app_name}.models import AutoComputeRule, {', '.join(model['name'] for model in models)}\n"
+            f"from {app_name}.mixins import invalidate_validation_plans\n"
+            f"from {app_name}.models import AutoComputeRule, ValidationRule, {', '.join(model['name'] for model in models)}\n"
             f"from {app_name}.utils.auto_value_evaluator import AutoValueEvaluator\n"
             f"import logging\n"
             f"import threading\n"
+            f"import time\n"
             f"from django.apps import apps\n"
+            f"from django.core.cache import cache\n"
             f"from django.db import transaction, connection\n"
-            f"from django.core.exceptions import ObjectDoesNotExist\n"
             f"logger = logging.getLogger(__name__)\n\n"
         )
 
@@ -2257,167 +2517,196 @@ def post_save_{model_name.lower()}(sender, instance, created, **kwargs):
 # Thread-local storage to hold state flags
 _thread_locals = threading.local()
 
-def table_exists(table_name):
-    \"\"\"Check if a database table exists.\"\"\"
-    try:
-        with connection.cursor() as cursor:
-            tables = connection.introspection.table_names()
-            return table_name in tables
-    except:
-        return False
+RULES_VERSION_KEY = "{app_name}:auto_compute_rules_version"
+_MISSING = object()
+_UNLOADED = object()
+
+# AutoComputeRules by model label ("{app_name}.Model"), with the attnames of
+# their concrete trigger fields, rebuilt when the rules version changes.
+_rule_index = {{'version': _UNLOADED, 'rules': {{}}, 'tracked': {{}}}}
+_rule_index_lock = threading.Lock()
+_app_ready = False
+
 
 def is_app_ready():
-    \"\"\"Check if the app's models are ready and tables exist.\"\"\"
-    try:
-        # Check if the app is ready
-        app_config = apps.get_app_config('{app_name}')
-        if not app_config.models_ready:
+    \"\"\"Whether the AutoComputeRule table exists; checked until it does, then remembered.\"\"\"
+    global _app_ready
+    if not _app_ready:
+        try:
+            _app_ready = AutoComputeRule._meta.db_table in connection.introspection.table_names()
+        except Exception:
             return False
-        
-        # Check if AutoComputeRule table exists
-        return table_exists(AutoComputeRule._meta.db_table)
-    except:
-        return False
+    return _app_ready
+
+
+def get_rules_version():
+    version = cache.get(RULES_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted counter can't restart at a
+        # version another process already loaded its index under.
+        cache.add(RULES_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(RULES_VERSION_KEY)
+    return version
+
+
+def _load_rule_index(version):
+    rules = {{}}
+    for rule in AutoComputeRule.objects.order_by('priority', 'id'):
+        rules.setdefault(rule.model_name, []).append(rule)
+
+    tracked = {{}}
+    for label, model_rules in rules.items():
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            continue
+        attnames = set()
+        for rule in model_rules:
+            for field_name in rule.trigger_fields or []:
+                try:
+                    field = model._meta.get_field(field_name)
+                except Exception:
+                    continue  # Not a field; always treated as changed
+                if field.concrete and not field.many_to_many:
+                    attnames.add(field.attname)
+        tracked[label] = tuple(attnames)
+
+    with _rule_index_lock:
+        _rule_index['rules'] = rules
+        _rule_index['tracked'] = tracked
+        _rule_index['version'] = version
 
-@receiver(pre_save)
-def pre_save_auto_compute_handler(sender, instance, **kwargs):
+
+def get_rule_index(check_version=True):
     \"\"\"
-    pre_save handler to store the previous state of the instance.
+    The rule index, reloaded when the rules version moved. Without
+    ``check_version`` an already loaded index is returned as is.
+    \"\"\"
+    if _rule_index['version'] is _UNLOADED or check_version:
+        version = get_rules_version()
+        if _rule_index['version'] is _UNLOADED or _rule_index['version'] != version:
+            _load_rule_index(version)
+    return _rule_index
+
+
+def invalidate_rule_index(sender, **kwargs):
+    _rule_index['version'] = _UNLOADED
+
+    def bump():
+        try:
+            cache.incr(RULES_VERSION_KEY)
+        except ValueError:
+            get_rules_version()
+    transaction.on_commit(bump)
+
+
+def model_label(sender):
+    return f"{{sender._meta.app_label}}.{{sender.__name__}}"
+
+
+def _snapshot(instance, attnames):
+    return {{attname: instance.__dict__.get(attname, _MISSING) for attname in attnames}}
+
+
+def track_loaded_state(sender, instance, **kwargs):
+    \"\"\"
+    post_init handler remembering the loaded values of the model's trigger
+    fields, so post_save can tell what changed without re-reading the row.
     \"\"\"
-    # Only process models from this app
-    if sender._meta.app_label != '{app_name}':
-        return
-    
-    # Skip if app is not ready or table doesn't exist
     if not is_app_ready():
         return
-    
-    # Skip the AutoComputeRule model itself
-    if sender.__name__ == 'AutoComputeRule':
-        return
-    
-    # Initialize the flag if not present
-    if not hasattr(_thread_locals, 'auto_compute_running'):
-        _thread_locals.auto_compute_running = False
+    attnames = get_rule_index(check_version=False)['tracked'].get(model_label(sender))
+    if attnames:
+        instance._auto_compute_loaded = _snapshot(instance, attnames)
 
-    if _thread_locals.auto_compute_running:
-        # If AutoCompute is running, no need to fetch previous instance
-        _thread_locals.previous_instance = None
-        return
 
-    if not hasattr(sender, 'objects'):
-        return  # Skip if sender does not have a manager
+def _changed_fields(sender, instance, rules):
+    loaded = getattr(instance, '_auto_compute_loaded', None) or {{}}
+    changed = set()
+    for rule in rules:
+        for field_name in rule.trigger_fields or []:
+            try:
+                attname = sender._meta.get_field(field_name).attname
+            except Exception:
+                changed.add(field_name)
+                continue
+            old_value = loaded.get(attname, _MISSING)
+            if old_value is _MISSING or old_value != instance.__dict__.get(attname, _MISSING):
+                changed.add(field_name)
+    return changed
 
-    if not instance.pk:
-        # New instance, no previous data
-        _thread_locals.previous_instance = None
-    else:
+
+def _context_objects(sender, instance):
+    context_objects = {{sender.__name__.lower(): instance}}
+
+    # Include related objects based on ForeignKey and OneToOne relationships
+    for rel in instance._meta.related_objects:
+        if rel.related_model._meta.app_label != '{app_name}':
+            continue  # Skip relationships to models outside this app
+
+        related_name = rel.get_accessor_name()
         try:
-            previous = sender.objects.get(pk=instance.pk)
-            _thread_locals.previous_instance = previous
-        except ObjectDoesNotExist:
-            _thread_locals.previous_instance = None
+            related_manager = getattr(instance, related_name, None)
+            if rel.one_to_one:
+                if related_manager:
+                    context_objects[related_manager.__class__.__name__.lower()] = related_manager
+            else:
+                # For reverse ForeignKey relationships
+                if related_manager and hasattr(related_manager, 'exists') and related_manager.exists():
+                    context_objects[related_name] = related_manager.all()
+        except Exception:
+            # Skip if there's any error accessing the related manager
+            pass
+    return context_objects
+
 
-@receiver(post_save)
 def post_save_auto_compute_handler(sender, instance, created, **kwargs):
     \"\"\"
-    post_save handler to process AutoComputeRules for any model.
+    post_save handler to process the AutoComputeRules of the saved model.
     \"\"\"
-    # Only process models from this app
-    if sender._meta.app_label != '{app_name}':
-        return
-    
-    # Skip if app is not ready or table doesn't exist
     if not is_app_ready():
         return
-    
-    # Skip the AutoComputeRule model itself to avoid recursion
-    if sender.__name__ == 'AutoComputeRule':
-        return
-    
-    model_label = f"{{sender._meta.app_label}}.{{sender.__name__}}"
 
+    label = model_label(sender)
     try:
-        # 1. Find all rules for the model, ordered by priority
-        rules = AutoComputeRule.objects.filter(model_name=model_label).order_by('priority')
-
-        if not rules.exists():
+        index = get_rule_index()
+        rules = index['rules'].get(label)
+        if not rules:
             return  # No rules to process
 
-        # 2. Determine if any trigger_fields were changed
-        changed_fields = []
-        previous = getattr(_thread_locals, 'previous_instance', None)
-
-        if previous:
-            # Aggregate all trigger_fields from all applicable rules
-            all_trigger_fields = set()
-            for rule in rules:
-                all_trigger_fields.update(rule.trigger_fields)
-
-            for field in all_trigger_fields:
-                try:
-                    old_value = getattr(previous, field, None)
-                    new_value = getattr(instance, field, None)
-                    if old_value != new_value:
-                        changed_fields.append(field)
-                except AttributeError:
-                    # Field might not exist on the model
-                    pass
-        else:
-            # If created, consider all trigger_fields as changed
-            for rule in rules:
-                changed_fields.extend(rule.trigger_fields)
-
-        # Remove duplicates
-        changed_fields = list(set(changed_fields))
+        # 1. Determine which trigger_fields changed since the instance was loaded;
+        # saves made by AutoCompute actions and creations run every rule.
+        run_all = created or getattr(_thread_locals, 'auto_compute_running', False)
+        changed_fields = set() if run_all else _changed_fields(sender, instance, rules)
 
-        # Reset the previous_instance to avoid stale data
-        _thread_locals.previous_instance = None
+        # The saved state is the baseline of the next save
+        attnames = index['tracked'].get(label)
+        if attnames:
+            instance._auto_compute_loaded = _snapshot(instance, attnames)
 
-        if not changed_fields and not created:
+        if not run_all and not changed_fields:
             return  # No relevant fields changed and it's not a creation
 
-        logger.debug(f"Changed fields for {{model_label}} (ID: {{instance.pk}}): {{changed_fields}}")
+        logger.debug(f"Changed fields for {{label}} (ID: {{instance.pk}}): {{sorted(changed_fields)}}")
 
-        # 3. Evaluate each rule
+        record_data = None
+        context_objects = None
         for rule in rules:
-            # Check if any of the trigger fields are in changed_fields
-            if not set(rule.trigger_fields).intersection(changed_fields) and not created:
-                continue  # Skip if no relevant fields changed and it's not a creation
+            # 2. Check if any of the trigger fields are in changed_fields
+            if not run_all and not changed_fields.intersection(rule.trigger_fields or []):
+                continue
 
             logger.debug(f"Evaluating rule: {{rule}}")
 
-            # 4. Gather record data
-            record_data = {{}}
-            for field in instance._meta.fields:
-                record_data[field.name] = getattr(instance, field.name, None)
+            # 3. Gather record data and related objects, once per save
+            if record_data is None:
+                record_data = {{field.name: getattr(instance, field.name, None) for field in instance._meta.fields}}
+                context_objects = _context_objects(sender, instance)
 
-            # 5. Gather related objects if needed
-            context_objects = {{sender.__name__.lower(): instance}}
-
-            # Include related objects based on ForeignKey and OneToOne relationships
-            for rel in instance._meta.related_objects:
-                if rel.related_model._meta.app_label != '{app_name}':
-                    continue  # Skip relationships to models outside this app
-                    
-                related_name = rel.get_accessor_name()
-                try:
-                    related_manager = getattr(instance, related_name, None)
-                    if rel.one_to_one:
-                        if related_manager:
-                            context_objects[related_manager.__class__.__name__.lower()] = related_manager
-                    else:
-                        # For reverse ForeignKey relationships
-                        if related_manager and hasattr(related_manager, 'exists') and related_manager.exists():
-                            context_objects[related_name] = related_manager.all()
-                except:
-                    # Skip if there's any error accessing the related manager
-                    pass
-
-            # 6. Initialize the evaluator
+            # 4. Initialize the evaluator
             evaluator = AutoValueEvaluator(record_data)
 
-            # 7. Evaluate condition
+            # 5. Evaluate condition
             condition_passed = True  # Default if no condition
             if rule.condition_logic:
                 try:
@@ -2428,7 +2717,7 @@ def post_save_auto_compute_handler(sender, instance, created, **kwargs):
 
             logger.debug(f"Condition passed for rule {{rule.id}}: {{condition_passed}}")
 
-            # 8. Execute actions if condition is met
+            # 6. Execute actions if condition is met
             if condition_passed and rule.action_logic:
                 logger.debug(f"Executing actions for rule {{rule.id}}")
                 # Apply actions within an atomic transaction
@@ -2447,9 +2736,30 @@ def post_save_auto_compute_handler(sender, instance, created, **kwargs):
                         _thread_locals.auto_compute_running = False
     except Exception as e:
         # Log the error but don't raise it to avoid breaking the save operation
-        logger.error(f"Error in auto compute handler for {{sender._meta.app_label}}.{{sender.__name__}}: {{e}}")
-        return
-                    
+        logger.error(f"Error in auto compute handler for {{label}}: {{e}}")
+
+
+# Receivers are bound to this app's models only, so saves elsewhere in the
+# project never reach them.
+for _model in apps.get_app_config('{app_name}').get_models():
+    if _model is AutoComputeRule:
+        post_save.connect(invalidate_rule_index, sender=_model,
+                          dispatch_uid="{app_name}_auto_compute_rule_save")
+        post_delete.connect(invalidate_rule_index, sender=_model,
+                            dispatch_uid="{app_name}_auto_compute_rule_delete")
+        continue
+    post_init.connect(track_loaded_state, sender=_model,
+                      dispatch_uid=f"{app_name}_auto_compute_init_{{_model.__name__}}")
+    post_save.connect(post_save_auto_compute_handler, sender=_model,
+                      dispatch_uid=f"{app_name}_auto_compute_save_{{_model.__name__}}")
+
+# Compiled validation plans (mixins.get_validation_plan) follow rule changes
+post_save.connect(invalidate_validation_plans, sender=ValidationRule,
+                  dispatch_uid="{app_name}_validation_rule_save")
+post_delete.connect(invalidate_validation_plans, sender=ValidationRule,
+                    dispatch_uid="{app_name}_validation_rule_delete")
+m2m_changed.connect(invalidate_validation_plans, sender=ValidationRule.user_roles.through,
+                    dispatch_uid="{app_name}_validation_rule_roles")
 """
         # Write the signals file
         signals_file_path = os.path.join(app_path, 'signals.py')
@@ -0,0 +1,9 @@
+from celery.signals import task_prerun
+
+from app_builder.utils.hot_registry import sync_hot_apps
+
+
+@task_prerun.connect(dispatch_uid="app_builder_sync_hot_apps")
+def sync_hot_apps_before_task(**kwargs):
+    # Celery workers never pass through HotAppsMiddleware
+    sync_hot_apps()
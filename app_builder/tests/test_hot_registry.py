@@ -0,0 +1,78 @@
+import os
+import sys
+import tempfile
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import clear_url_caches, resolve
+
+from app_builder.management.commands.create_app import Command
+from app_builder.utils import hot_registry
+
+MODELS = [{
+    "name": "Item",
+    "fields": [{"name": "title", "type": "CharField", "options": "max_length=100"}],
+}]
+
+
+class HotAppInstallTests(TestCase):
+    """A generated app is installed into the running registry and served
+    without a restart."""
+    app_name = "hot_registry_test_app"
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        sys.path.insert(0, self.tmpdir.name)
+        app_path = os.path.join(self.tmpdir.name, self.app_name)
+        Command().generate_app(self.app_name, app_path, MODELS)
+
+        urlconf = import_module(settings.ROOT_URLCONF)
+        previous = (apps.app_configs, settings.INSTALLED_APPS, urlconf.urlpatterns)
+
+        def restore():
+            apps.app_configs, settings.INSTALLED_APPS, urlconf.urlpatterns = previous
+            for model in [model for model in admin.site._registry
+                          if model._meta.app_label == self.app_name]:
+                admin.site.unregister(model)
+            apps.all_models.pop(self.app_name, None)
+            apps.clear_cache()
+            clear_url_caches()
+            hot_registry._runtime_apps.discard(self.app_name)
+            for module in [name for name in sys.modules
+                           if name.split(".")[0] == self.app_name]:
+                del sys.modules[module]
+            sys.path.remove(self.tmpdir.name)
+            self.tmpdir.cleanup()
+        self.addCleanup(restore)
+
+    def test_installed_app_urls_resolve(self):
+        self.assertTrue(hot_registry.install_app(self.app_name))
+        hot_registry.mount_app_urls([self.app_name])
+
+        self.assertTrue(apps.is_installed(self.app_name))
+        self.assertTrue(hot_registry.is_runtime_app(self.app_name))
+        model = apps.get_model(self.app_name, "Item")
+        self.assertEqual(model._meta.app_label, self.app_name)
+        match = resolve(f"/{self.app_name}/item/")
+        self.assertEqual(match.func.cls.__module__, f"{self.app_name}.views")
+
+    def test_label_taken_is_refused(self):
+        self.assertTrue(hot_registry.install_app(self.app_name))
+        self.assertFalse(hot_registry.install_app(self.app_name))
+
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class HotAppCacheRequirementTests(SimpleTestCase):
+    def test_hot_refused_on_process_local_cache(self):
+        message = "--hot needs a cache shared by all workers"
+        with self.assertRaisesMessage(CommandError, message):
+            call_command("create_app", "never_created_app", models="[]", hot=True)
@@ -0,0 +1,211 @@
+"""
+Runtime registration of generated apps.
+
+``create_app --hot`` lists the new app in the manifest at ``HOT_APPS_MANIFEST``
+instead of editing settings.py, applies its migrations and bumps a version
+counter in the shared cache. Every web and Celery worker compares that
+counter before handling work (``HotAppsMiddleware``, ``task_prerun``), at
+most once per ``HOT_APPS_SYNC_INTERVAL`` seconds, and when it moved installs
+the manifest's new apps into its running app registry and swaps in a root
+URLconf that mounts them - no restart, no cold caches. The counter only
+reaches other processes through a shared cache (``REDIS_CACHE_URL``), so
+``--hot`` is refused on the per-process default cache.
+
+At startup settings.py reads the same manifest, so restarted processes and
+management commands see the apps as regular CUSTOM_APPS. Replacing an app
+that is already loaded (``--overwrite``) still needs a restart; model
+classes can't be reloaded in place.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from importlib import import_module
+from importlib.util import find_spec
+
+from django.apps import AppConfig, apps
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import clear_url_caches, include, path
+
+logger = logging.getLogger(__name__)
+
+HOT_APPS_VERSION_KEY = "app_builder:hot_apps_version"
+
+_synced = {"version": None, "checked_at": float("-inf")}
+_sync_lock = threading.Lock()
+_registry_lock = threading.Lock()
+_runtime_apps = set()
+
+
+def get_manifest_path():
+    default = os.path.join(settings.BASE_DIR, "dynamic_apps.json")
+    return getattr(settings, "HOT_APPS_MANIFEST", default)
+
+
+def read_hot_apps(manifest_path):
+    """App names listed in the manifest; empty when it doesn't exist yet."""
+    try:
+        with open(manifest_path, "r") as f:
+            return [name for name in json.load(f)
+                    if isinstance(name, str) and name.isidentifier()]
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not read hot apps manifest {manifest_path}: {e}")
+        return []
+
+
+def _write_hot_apps(manifest_path, app_names):
+    # Written to a temporary file and renamed, so readers never see half a list
+    directory = os.path.dirname(os.path.abspath(manifest_path))
+    with tempfile.NamedTemporaryFile(
+            "w", dir=directory, delete=False, suffix=".tmp") as f:
+        json.dump(app_names, f, indent=2)
+    os.replace(f.name, manifest_path)
+
+
+def add_hot_app(app_name, manifest_path=None):
+    """List ``app_name`` in the manifest; returns False if it already was."""
+    manifest_path = manifest_path or get_manifest_path()
+    app_names = read_hot_apps(manifest_path)
+    if app_name in app_names:
+        return False
+    _write_hot_apps(manifest_path, app_names + [app_name])
+    return True
+
+
+def remove_hot_app(app_name, manifest_path=None):
+    """Drop ``app_name`` from the manifest, e.g. when its migrations failed."""
+    manifest_path = manifest_path or get_manifest_path()
+    app_names = read_hot_apps(manifest_path)
+    if app_name in app_names:
+        _write_hot_apps(manifest_path, [name for name in app_names if name != app_name])
+
+
+def hot_app_middleware(app_name):
+    """The middlewares every generated app ships, by router."""
+    return {
+        "current_user": [f"{app_name}.middleware.CurrentUserMiddleware"],
+        "app": [f"{app_name}.middleware.DynamicModelMiddleware"],
+    }
+
+
+def is_runtime_app(app_name):
+    """Whether ``app_name`` was installed into this process after startup."""
+    return app_name in _runtime_apps
+
+
+def get_sync_interval():
+    return getattr(settings, "HOT_APPS_SYNC_INTERVAL", 5)
+
+
+def get_hot_apps_version():
+    version = cache.get(HOT_APPS_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted counter can't restart at a
+        # version workers already synced to.
+        cache.add(HOT_APPS_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(HOT_APPS_VERSION_KEY)
+    return version
+
+
+def publish_hot_apps():
+    """Tell every worker to load the manifest's new apps."""
+    try:
+        return cache.incr(HOT_APPS_VERSION_KEY)
+    except ValueError:
+        return get_hot_apps_version()
+
+
+def sync_hot_apps(force=False):
+    """
+    Install the manifest's apps this process doesn't have yet, if the
+    version moved since the last sync. The version is read at most once per
+    ``HOT_APPS_SYNC_INTERVAL`` seconds unless ``force``. Returns the names
+    installed.
+    """
+    now = time.monotonic()
+    if not force and now - _synced["checked_at"] < get_sync_interval():
+        return []
+    _synced["checked_at"] = now
+
+    version = get_hot_apps_version()
+    if version == _synced["version"]:
+        return []
+
+    with _sync_lock:
+        if version == _synced["version"]:
+            return []
+        installed = [
+            app_name for app_name in read_hot_apps(get_manifest_path())
+            if not apps.is_installed(app_name) and install_app(app_name)
+        ]
+        if installed:
+            mount_app_urls(installed)
+        _synced["version"] = version
+    return installed
+
+
+def install_app(app_name):
+    """
+    Add ``app_name`` to the running app registry the way
+    ``Apps.populate()`` would: config, models, then ready(). The registry
+    and INSTALLED_APPS are replaced rather than mutated, so threads
+    iterating them meanwhile keep a consistent copy.
+    """
+    try:
+        app_config = AppConfig.create(app_name)
+    except Exception:
+        logger.exception(f"Failed to load app '{app_name}'")
+        return False
+    with _registry_lock:
+        if app_config.label in apps.app_configs:
+            logger.error(f"Cannot install app '{app_name}': "
+                         f"label '{app_config.label}' is taken")
+            return False
+
+        previous_configs = apps.app_configs
+        try:
+            apps.app_configs = {**previous_configs, app_config.label: app_config}
+            app_config.apps = apps
+            app_config.import_models()
+            apps.clear_cache()
+            app_config.ready()
+            if find_spec(f"{app_name}.admin"):
+                import_module(f"{app_name}.admin")
+        except Exception:
+            logger.exception(f"Failed to install app '{app_name}'")
+            apps.app_configs = previous_configs
+            apps.clear_cache()
+            return False
+
+        settings.INSTALLED_APPS = [*settings.INSTALLED_APPS, app_name]
+        _runtime_apps.add(app_name)
+    logger.info(f"Installed app '{app_name}' at runtime")
+    return True
+
+
+def mount_app_urls(app_names):
+    """
+    Swap the root URLconf's patterns for a copy that also mounts
+    ``app_names`` and rebuilds the admin URLs for their models. Requests
+    already resolving keep the previous resolver.
+    """
+    from django.contrib import admin
+
+    urlconf = import_module(settings.ROOT_URLCONF)
+    with _registry_lock:
+        patterns = []
+        for pattern in urlconf.urlpatterns:
+            if getattr(pattern, "app_name", None) == "admin":
+                pattern = path("admin/", admin.site.urls)
+            patterns.append(pattern)
+        for app_name in app_names:
+            if find_spec(f"{app_name}.urls"):
+                patterns.append(path(f"{app_name}/", include(f"{app_name}.urls")))
+
+        urlconf.urlpatterns = patterns
+        clear_url_caches()
@@ -36,6 +36,7 @@ from django.core.exceptions import ValidationError
 
 from app_builder.services import create_application_from_diagram
 from app_builder.utils.erd_converter import convert_erd_to_django
+from utils.shared_cache import is_shared_cache
 
 
 class DiagramImportView(APIView):
@@ -411,6 +412,9 @@ def compile_and_create_app_api(request):
     """
     app_id = request.data.get('application_id')
     create_options = request.data.get('create_options', {})
+    # Running workers only hear about a hot app through a shared cache;
+    # otherwise settings.py is edited and the autoreloader restarts them.
+    hot = create_options.get('hot', is_shared_cache())
 
     if not app_id:
         return Response({"error": "application_id is required"}, status=400)
@@ -519,6 +523,9 @@ try:
         cmd_args.append('--skip-tests')
     if {create_options.get('skip_urls', False)}:
         cmd_args.append('--skip-urls')
+    if {hot}:
+        # Loaded by the running workers instead of restarting them
+        cmd_args.append('--hot')
     
 # Handle interactive prompts by providing defaults
     os.environ['DJANGO_SUPERUSER_PASSWORD'] = 'yes'  # Auto-confirm prompts
@@ -552,8 +559,9 @@ try:
     update_status('completed', 'create_app')
     print("App creation completed!")
     
-    # The server will auto-restart due to file changes
-    print("Server will restart automatically...")
+    if not {hot}:
+        # The server will auto-restart due to file changes
+        print("Server will restart automatically...")
     
 except Exception as e:
     print(f"Error: {{e}}")
@@ -584,7 +592,8 @@ except Exception as e:
     return Response({
         'job_id': job_id,
         'status': 'started',
-        'message': 'Compilation and app creation started. Server may restart.',
+        'message': ('Compilation and app creation started.'
+                    + ('' if hot else ' Server may restart.')),
         'check_status_url': f'/app_builder/api/job-status/{job_id}/',
         'log_file': log_file
     }, status=202)
@@ -20,6 +20,7 @@ from scohaz_platform.settings import (DOMAIN,
 import os
 # from utils.constant_lists_variables import ApplicationStatus
 # from utils.constant_lists_variables import ErrorCodes
+from utils.conditional_get import conditional_get, make_etag
 from utils.send_email import ScohazEmailHelper
 from authentication.tokens import account_activation_token
 from rest_framework import status, viewsets
@@ -441,13 +442,26 @@ class ContentTypeModelListView(APIView):
         return Response(models)
 
 
+def translation_file_path(language):
+    # Path to the translations folder
+    translations_dir = os.path.join(settings.BASE_DIR, 'local')
+    return os.path.join(translations_dir, f'{language}.json')
+
+
+def translation_etag(request, language, *args, **kwargs):
+    try:
+        stat = os.stat(translation_file_path(language))
+    except OSError:
+        return None
+    return make_etag(request, stat.st_mtime_ns, stat.st_size)
+
+
 class TranslationAPIView(APIView):
     permission_classes = (AllowAny,)
 
+    @conditional_get(translation_etag)
     def get(self, request, language, *args, **kwargs):
-        # Path to the translations folder
-        translations_dir = os.path.join(settings.BASE_DIR, 'local')
-        file_path = os.path.join(translations_dir, f'{language}.json')
+        file_path = translation_file_path(language)
 
         # Check if the translation file exists
         if os.path.exists(file_path):
@@ -80,11 +80,11 @@ class CaseAdmin(admin.ModelAdmin):
         return self.readonly_fields
 
     def run_mapping(self, request, queryset):
-        from case.plugins.default_plugin import process_records
+        from case.plugins.default_plugin import default_processor
         for case in queryset:
             for target in MapperTarget.objects.filter(case_type=case.case_type):
                 try:
-                    process_records(case, target, found_object=None)
+                    default_processor(target)(case, target, found_object=None)
                 except Exception as e:
                     self.message_user(request, f"❌ Error for Case {case.id}: {e}", level='error')
         self.message_user(request, "✅ Mapping executed.")
@@ -137,6 +137,7 @@ class MapperTargetAdmin(admin.ModelAdmin):
         "content_type",
         "finder_function_path",
         "processor_function_path",
+        "bulk_mode",
         "preview_button",  # ✅ New
     )
     search_fields = ("finder_function_path", "processor_function_path")
@@ -4,23 +4,22 @@ import ast
 # from Tools.scripts.generate_token import update_file
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.utils import timezone
-import os
+from django.db import transaction
 
 from icecream import ic
 from rest_framework.generics import get_object_or_404
-from dynamicflow.models import Field
-from dynamicflow.services.api_trigger_service import APITriggerService
 
-from case.models import Case, MapperExecutionLog, MapperFieldRule, MapperTarget, CaseMapper, ApprovalRecord
+from case.models import Case, CaseDocument, MapperExecutionLog, MapperFieldRule, MapperTarget, CaseMapper, ApprovalRecord
 from conditional_approval.apis.serializers import NoteSerializer, ActionBasicSerializer
 from conditional_approval.models import ApprovalStep, Action, ActionStep # Ensure ActionStep is imported
 from dynamicflow.utils.dynamicflow_helper import DynamicFlowHelper
 from dynamicflow.utils.dynamicflow_validator_helper import DynamicFlowValidator
-from urllib.parse import unquote
+from case.utils.case_update import CaseUpdatePipeline
+from case.utils.documents import (
+    create_document, delete_document, delete_legacy_upload, delete_unreferenced_content, document_entry
+)
 from rest_framework import serializers
 from lookup.models import Lookup
-from django.core.files.storage import default_storage
 
 
 class LightActionStepSerializer(serializers.ModelSerializer):
@@ -150,15 +149,17 @@ class CaseSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         # Retrieve service flow dynamically (adjust based on your query fetching logic)
-        query = [data["case_type"].code]
-        service_flow = DynamicFlowHelper(query).get_flow()
+        case_type = data.get("case_type") or getattr(self.instance, "case_type", None)
+        query = [case_type.code]
+        flow_helper = DynamicFlowHelper(query)
+        service_flow = flow_helper.get_flow()
 
         # case_obj = get_object_or_404(Case, pk=self.instance.pk)
-        case_obj = Case.objects.filter(pk=self.instance.pk).first() if self.instance else None
+        case_obj = self.instance
 
         # Initialize and apply the validator
         # Pass the service flow to the validator
-        validator = DynamicFlowValidator(service_flow, case_obj, data)
+        validator = DynamicFlowValidator(service_flow, case_obj, data, flow_version=flow_helper.flow_version)
         # Perform the full validation
         validation_results = validator.validate()
 
@@ -196,154 +197,58 @@ class CaseSerializer(serializers.ModelSerializer):
                     f"'{file_type}' is not a valid document type.")
         return file_types
 
-    def rename_files(self, created_case, case_data, datetime_str):
-        # Now, update the file names with the actual serial_number
-        if created_case.serial_number != 'unknown_case_number':
-            # Loop through the uploaded files
-            # and rename them with the actual serial number
-            for file_entry in case_data.get('uploaded_files', []):
-                old_url = file_entry['file_url']
-                # Extract the file name from the URL
-                old_file_name = os.path.basename(old_url)
-                # Ensure old file path is relative to 'uploads/'
-                old_file_path = os.path.join('uploads', old_file_name)
-
-                # Capture the original file name (before upload)
-                # Get the part after case type and serial number
-                original_file_name = (
-                    old_file_name.split('-', 2))[-1]
-
-                # Generate the new file name with the
-                # actual serial number and original file name
-                new_file_name = (f"{created_case.case_type.code}_"
-                                 f"{created_case.serial_number}-"
-                                 f"{datetime_str}_{original_file_name}")
-                new_file_path = os.path.join(
-                    'uploads', new_file_name)  # New path relative to 'uploads/'
-
-                # Check if the file exists before renaming
-                if default_storage.exists(old_file_path):
-                    # Copy the file to the new location
-                    with default_storage.open(old_file_path, 'rb') as old_file:
-                        default_storage.save(new_file_path, old_file)
-
-                    # Delete the old file
-                    default_storage.delete(old_file_path)
-
-                    # Update the file entry with the new URL
-                    new_file_url = default_storage.url(new_file_path)
-                    file_entry['file_url'] = new_file_url
-
-            # Update case data with the new file URLs
-            if "uploaded_files" in case_data:
-                created_case.case_data['uploaded_files'] = case_data['uploaded_files']
-            created_case.save()  # Save the case again with updated file URLs
-        return created_case
-
-    def create_file_entries_handler(self, files, file_types, validated_data, datetime_str):
-        # Process files and their types together
-        file_entries = []
-
+    def create_file_entries_handler(self, files, file_types, case, documents, uploaded_by=None):
+        """
+        Store each upload once in the content-addressed document store,
+        appending its document to ``documents`` as it is created, and return
+        the ``uploaded_files`` entries (keyed by a stable document id).
+        """
+        document_types = self._document_types(file_types)
         for file_obj, file_type in zip(files, file_types):
-            # Ensure the file type corresponds to a valid Lookup entry
-            document_type = Lookup.objects.get(
-                parent_lookup__name='Document Type', code=file_type)
-
-            # Retrieve case type and serial number
-            case_type = validated_data.get('case_type')
-            case_number = validated_data.get('serial_number', 'unknown_case_number')
-
-
-            # Capture the original file name (before upload) for each file
-            # This is the original file name from the device
-            original_file_name = file_obj.name
-
-            # Generate the custom file name
-            # format using the original file name
-            file_extension = file_obj.name.split(
-                '.')[-1]  # Extract file extension
-            if case_number == 'unknown_case_number':
-                # Use the case type and timestamp for
-                # the file name if the case number is unknown
-                new_file_name = f"{case_type.code}-{datetime_str}_{original_file_name}"
-            else:
-                # Use the case type, serial number, and timestamp for the file name
-                new_file_name = (f"{case_type.code}_{case_number}-"
-                                 f"{datetime_str}_{original_file_name}")
-
-            # Ensure the final file name is unique by checking if it already exists
-            file_path = os.path.join('uploads', new_file_name)
-            file_name = file_path
-            counter = 1
-            while default_storage.exists(file_name):
-                # Append a suffix to make the file name unique if needed
-                file_name = file_path.replace(
-                    f'.{file_extension}',
-                    f'_{counter}.{file_extension}')
-                counter += 1
-
-            # Save the file with the unique name
-            file_name = default_storage.save(file_name, file_obj)
-            file_url = default_storage.url(file_name)
-
-            file_entries.append({
-                'file_url': file_url,
-                # Use the name or any field you want from the Lookup model
-                'type': document_type.name
-            })
-        return file_entries
-
-    def update_file_entries_handler(self, files,
-                                    file_types,
-                                    validated_data,
-                                    existing_files,
-                                    instance,
-                                    case_data,
-                                    datetime_str):
+            documents.append(create_document(
+                file_obj, document_type=document_types[file_type], case=case, uploaded_by=uploaded_by))
+        return [document_entry(document) for document in documents]
+
+    def update_file_entries_handler(self, files, file_types, instance, case_data, uploaded_by=None):
+        """
+        Store new uploads for ``instance``; an upload replaces the case's
+        previous documents of the same type. Updates
+        ``case_data['uploaded_files']`` in place and returns the new entries.
+        """
+        document_types = self._document_types(file_types)
+        existing_files = case_data.setdefault('uploaded_files', [])
         updated_files = []
-        case_type = validated_data.get('case_type', instance.case_type)
-        case_number = instance.serial_number
 
         for file_obj, file_type in zip(files, file_types):
-            document_type = Lookup.objects.get(
-                parent_lookup__name='Document Type', code=file_type)
-            original_file_name = file_obj.name
-
-            # file_extension = file_obj.name.split('.')[-1]
-            new_file_name = (
-                f"{case_type.code}_{case_number}-{datetime_str}_"
-                f"{original_file_name}"
-            )
-
-            file_path = os.path.join('uploads', new_file_name)
-            file_name = default_storage.save(file_path, file_obj)
-            file_url = default_storage.url(file_name)
-            for existing_file in existing_files:
-                old_url = existing_file['file_url']
-                old_file_name = os.path.basename(old_url)
-                decoded_file_name = unquote(old_file_name)
-                old_file_path = os.path.join('uploads', decoded_file_name)
-
-                file_prefix = f"{case_type.code}_{case_number}"
-
-                if decoded_file_name.startswith(
-                        file_prefix
-                ) and existing_file['type'] == document_type.name:
+            document_type = document_types[file_type]
+            document = create_document(
+                file_obj, document_type=document_type, case=instance, uploaded_by=uploaded_by)
+
+            for existing_file in list(existing_files):
+                if existing_file.get('type') != document_type.name:
+                    continue
+                existing_files.remove(existing_file)
+                if not existing_file.get('document_id'):
+                    delete_legacy_upload(existing_file)
+                    continue
+                old_document = CaseDocument.objects.filter(
+                    id=existing_file.get('document_id'), case=instance).first()
+                if old_document and old_document.id != document.id:
                     try:
-                        if default_storage.exists(old_file_path):
-                            logger.debug(f"Deleting file: {old_file_path}")
-                            default_storage.delete(old_file_path)
-
-                            # Remove the old entry from existing_files
-                            case_data['uploaded_files'].remove(existing_file)
+                        delete_document(old_document)
                     except Exception as e:
-                        logger.error(f"Error deleting file {old_file_path}: {e}")
-            updated_files.append({
-                'file_url': file_url,
-                'type': document_type.name
-            })
+                        logger.error(f"Error deleting document {old_document.id}: {e}")
+
+            updated_files.append(document_entry(document))
+        existing_files.extend(updated_files)
         return updated_files
 
+    def _document_types(self, file_types):
+        return {
+            lookup.code: lookup
+            for lookup in Lookup.objects.filter(
+                parent_lookup__name='Document Type', code__in=set(file_types))
+        }
 
     def create(self, validated_data):
         ic(validated_data)
@@ -374,12 +279,6 @@ class CaseSerializer(serializers.ModelSerializer):
 
         # Handle case_data JSON field
         case_data = validated_data.get('case_data', {})
-        # Retrieve the current datetime in the desired format
-        datetime_str = timezone.now().strftime('%Y-%m-%d_%H-%M-%S')
-        file_entries = self.create_file_entries_handler(files, file_types, validated_data, datetime_str)
-        if file_entries:
-            case_data['uploaded_files'] = file_entries
-
         validated_data['case_data'] = case_data
 
         # ADD THIS: Remove validation-related fields before creating the object
@@ -414,7 +313,19 @@ class CaseSerializer(serializers.ModelSerializer):
         #     if key in valid_fields
         # }
 
-        created_case = super(CaseSerializer, self).create(validated_data)
+        # The documents are created with the case, so a failure leaves neither
+        documents = []
+        try:
+            with transaction.atomic():
+                created_case = super(CaseSerializer, self).create(validated_data)
+                if files:
+                    case_data['uploaded_files'] = self.create_file_entries_handler(
+                        files, file_types, created_case, documents, uploaded_by=user)
+                    created_case.save(update_fields=['case_data'])
+        except Exception:
+            # Their rows rolled back; drop the content only they had stored
+            delete_unreferenced_content(document.sha256 for document in documents)
+            raise
 
         # # ====== ADD THIS SECTION: Post-save API Calls ======
         # for field in fields_with_api_calls:
@@ -426,94 +337,64 @@ class CaseSerializer(serializers.ModelSerializer):
         #     )
         # # ====== END OF POST-SAVE API CALLS ======
 
-        created_case = self.rename_files(created_case, case_data, datetime_str)
         return created_case
 
     def update(self, instance, validated_data):
-        print("validated_data")
-        ic(validated_data)
+        """
+        ``validate`` has already compiled the flow and validated the merged
+        data; apply it in one pass, running only the integrations of the
+        case_data keys that changed. Post-save integrations are queued as one
+        Celery task.
+        """
+        if not validated_data.get("is_valid", False):
+            raise serializers.ValidationError(validated_data.get("field_errors", "Unknown error"))
 
-        # ====== ADD THIS LINE: Store old data for 'on_change' triggers ======
-        old_case_data = instance.case_data.copy() if instance.case_data else {}
-        # ====== END ======
+        pipeline = CaseUpdatePipeline(instance)
+        user = self.context['request'].user
 
-        case_data = instance.case_data or {}
-        validated_data = self.remove_invalid_data(validated_data, case_data)
-        ic(validated_data)
-        # Perform the validation before processing the data
-        validation_results = self.validate(validated_data)
-        ic(validation_results)
-        if not validation_results["is_valid"]:
-            raise serializers.ValidationError(validation_results["field_errors"])
+        with pipeline.stage('prepare'):
+            case_data = instance.case_data or {}
+            validated_data = self.remove_invalid_data(validated_data, case_data)
+            for key in ('is_valid', 'extra_keys', 'missing_keys', 'field_errors'):
+                validated_data.pop(key, None)
 
-        files = validated_data.pop('files', [])
-        file_types = validated_data.pop('file_types', [])
-        keys_to_remove_str = self.context['request'].data.get('keys_to_remove', [])
-        keys_to_remove = ast.literal_eval(
-            keys_to_remove_str) if keys_to_remove_str else []
+            files = validated_data.pop('files', [])
+            file_types = validated_data.pop('file_types', [])
+            keys_to_remove_str = self.context['request'].data.get('keys_to_remove', [])
+            keys_to_remove = ast.literal_eval(
+                keys_to_remove_str) if keys_to_remove_str else []
 
-        user = self.context['request'].user
-        validated_data['updated_by'] = user
+            case_data.update(validated_data.pop('case_data', None) or {})
+            for key in keys_to_remove:
+                case_data.pop(key, None)
 
-        # ====== ADD THIS SECTION: Get new case_data and Pre-save API Calls ======
-        # Get the new case_data that will be saved
-        new_case_data = validated_data.get('case_data', {})
-
-        # Pre-save API Calls
-        fields_with_api_calls = Field.objects.filter(
-            _api_call_config__isnull=False,
-            _field_name__in=list(old_case_data.keys()) + list(new_case_data.keys())
-        ).exclude(_api_call_config=[])
-
-        for field in fields_with_api_calls:
-            APITriggerService.trigger_api_calls(
-                field=field,
-                event="pre_save",
-                case_data=new_case_data,
-                instance=instance,
-                old_case_data=old_case_data
-            )
-        # ====== END OF PRE-SAVE API CALLS ======
+        with pipeline.stage('files'):
+            if files:
+                self.update_file_entries_handler(files, file_types, instance, case_data, uploaded_by=user)
 
-        # Handle case_data JSON field
-        updated_files = []
-        # ... rest of your existing code for file handling ...
-
-        # ... existing code continues until instance.save() ...
-
-        instance.save()
-
-        # ====== ADD THIS SECTION: On-change and Post-save API Calls ======
-        # On-change API Calls
-        for field in fields_with_api_calls:
-            field_name = field._field_name
-            old_value = old_case_data.get(field_name)
-            new_value = instance.case_data.get(field_name)
-
-            if old_value != new_value:
-                APITriggerService.trigger_on_change_for_field(
-                    field=field,
-                    old_value=old_value,
-                    new_value=new_value,
-                    full_old_data=old_case_data,
-                    full_new_data=instance.case_data,
-                    instance=instance
-                )
-
-        # Post-save API Calls
-        for field in fields_with_api_calls:
-            APITriggerService.trigger_api_calls(
-                field=field,
-                event="post_save",
-                case_data=instance.case_data,
-                instance=instance,
-                old_case_data=old_case_data
-            )
-        # ====== END OF API CALLS ======
+        with pipeline.stage('diff'):
+            pipeline.load_integrations(case_data)
+
+        with pipeline.stage('pre_save'):
+            pipeline.run('pre_save', case_data)
+
+        with pipeline.stage('save'):
+            # Only the applicant's data; status, assignment and approval
+            # fields move through the approval actions, never through here.
+            instance.case_data = case_data
+            instance.updated_by = user
+            instance.save()
+
+        with pipeline.stage('on_change'):
+            pipeline.run('on_change', instance.case_data)
+
+        with pipeline.stage('post_save'):
+            pipeline.dispatch_post_save(instance.case_data)
 
         logger.debug(
             f"Updated case with ID {instance.id}"
-            f", files: {case_data.get('uploaded_files', [])}")
+            f", files: {case_data.get('uploaded_files', [])}"
+            f", stage timings: {pipeline.timings}")
         return instance
 
 class ApprovalRecordSerializer(serializers.ModelSerializer):
@@ -541,6 +422,10 @@ class RunMapperInputSerializer(serializers.Serializer):
     case_id = serializers.IntegerField()
     mapper_target_id = serializers.IntegerField()
 
+class StartMapperRunInputSerializer(serializers.Serializer):
+    case_id = serializers.IntegerField()
+    mapper_target_id = serializers.UUIDField(required=False, allow_null=True)
+
 class DryRunMapperInputSerializer(serializers.Serializer):
     case_id = serializers.IntegerField()
     mapper_target_id = serializers.IntegerField()
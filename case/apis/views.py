@@ -1,8 +1,6 @@
 import json
 
-from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status, views, generics
 from rest_framework.exceptions import ValidationError
@@ -16,14 +14,17 @@ from dynamicflow.services.api_trigger_service import APITriggerService
 from dynamicflow.utils.dynamicflow_validator_helper import DynamicFlowValidator
 from lookup.models import Lookup
 from utils.conditional_approval import evaluate_conditions
+from case.utils.inbox import EmployeeInbox, InboxCursorPagination
+from case.utils.mapper_runs import get_run_header, queue_mapper_run, run_status, start_mapper_run
 from dynamicflow.utils.dynamicflow_helper import DynamicFlowHelper
 from .serializers import CaseSerializer, RunMapperInputSerializer, DryRunMapperInputSerializer, \
-    MapperExecutionLogSerializer, CaseMapperSerializer, MapperTargetSerializer, MapperFieldRuleSerializer, ApplicantActionInputSerializer
+    MapperExecutionLogSerializer, CaseMapperSerializer, MapperTargetSerializer, MapperFieldRuleSerializer, ApplicantActionInputSerializer, \
+    StartMapperRunInputSerializer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
-from ..plugins.default_plugin import process_records, dry_run
+from ..plugins.default_plugin import default_processor, dry_run
 
 
 class CaseViewSet(viewsets.ModelViewSet):
@@ -102,10 +103,12 @@ class SubmitApplication(APIView):
 
         # Retrieve service flow dynamically using the case type
         query = [case_obj.case_type.code]
-        service_flow = DynamicFlowHelper(query).get_flow()
+        flow_helper = DynamicFlowHelper(query)
+        service_flow = flow_helper.get_flow()
 
         # Initialize and apply the validator
-        validator = DynamicFlowValidator(service_flow, case_obj, request_body, submit=True)
+        validator = DynamicFlowValidator(service_flow, case_obj, request_body, submit=True,
+                                         flow_version=flow_helper.flow_version)
         validation_results = validator.validate()
 
         if not validation_results["is_valid"]:
@@ -231,7 +234,7 @@ class TriggerFieldAPIView(APIView):
             integrations = field.field_integrations.filter(
                 trigger_event=trigger_event,
                 active=True
-            ).order_by('order')
+            ).select_related('integration').order_by('order')
 
             if not integrations.exists():
                 return Response({
@@ -244,6 +247,7 @@ class TriggerFieldAPIView(APIView):
             executed = []
             failed = []
 
+            sync_calls = []
             with transaction.atomic():
                 for field_integration in integrations:
                     try:
@@ -252,19 +256,18 @@ class TriggerFieldAPIView(APIView):
                             continue
 
                         # Prepare request data including path parameters
-                        payload, query_params, headers, path_params = field_integration.prepare_request_data(
-                            case_data, field_value
+                        request_data = APITriggerService._build_request_data(
+                            *field_integration.prepare_request_data(case_data, field_value)
                         )
 
                         # Execute the integration
                         if field_integration.is_async:
-                            from dynamicflow.services.api_trigger_service import APITriggerService
                             APITriggerService._execute_integration_async.delay(
                                 field_integration.id,
-                                payload,
-                                query_params,
-                                headers,
-                                path_params,  # Include path params
+                                request_data['body'],
+                                request_data['query_params'],
+                                request_data['headers'],
+                                request_data['path_params'],  # Include path params
                                 case.id,
                                 case_data
                             )
@@ -274,39 +277,19 @@ class TriggerFieldAPIView(APIView):
                                 "async": True
                             })
                         else:
-                            # Synchronous execution
-                            response = field_integration.integration.make_api_request(
-                                body=payload,
-                                query_params=query_params,
-                                headers=headers,
-                                path_params=path_params  # Include path params
-                            )
-
-                            # Handle response updates if configured
-                            response_data = {}
-                            if field_integration.update_field_on_response:
-                                # Extract value from response
-                                if field_integration.response_field_path:
-                                    from jsonpath_ng import parse
-                                    jsonpath_expr = parse(field_integration.response_field_path)
-                                    matches = jsonpath_expr.find(response)
-                                    if matches:
-                                        response_data['field_value'] = matches[0].value
-
-                                # Extract additional mapped fields
-                                response_data['mapped_fields'] = {}
-                                for resp_path, case_field in field_integration.response_field_mapping.items():
-                                    jsonpath_expr = parse(f"$.{resp_path}")
-                                    matches = jsonpath_expr.find(response)
-                                    if matches:
-                                        response_data['mapped_fields'][case_field] = matches[0].value
-
-                            executed.append({
-                                "integration": field_integration.integration.name,
-                                "status": "success",
-                                "response_data": response_data,
-                                "url_called": field_integration.integration.build_url(path_params) if path_params else field_integration.integration.endpoint
-                            })
+                            # Over the rate limit: defer to a task instead of calling now
+                            wait = APITriggerService._check_rate_limit(field_integration.integration, case.id)
+                            if wait:
+                                APITriggerService.schedule_integration(
+                                    field_integration, request_data, case.id, case_data, countdown=wait)
+                                executed.append({
+                                    "integration": field_integration.integration.name,
+                                    "status": "deferred",
+                                    "retry_after": wait,
+                                    "async": True
+                                })
+                                continue
+                            sync_calls.append((field_integration, request_data))
 
                     except Exception as e:
                         failed.append({
@@ -314,6 +297,48 @@ class TriggerFieldAPIView(APIView):
                             "error": str(e)
                         })
 
+            # Synchronous integrations are sent concurrently, so the slowest
+            # upstream (not their sum) bounds the response time.
+            results = APITriggerService.execute_concurrently(sync_calls)
+
+            for (field_integration, request_data), (response, _duration_ms) in zip(sync_calls, results):
+                try:
+                    if isinstance(response, Exception):
+                        raise response
+
+                    # Handle response updates if configured
+                    response_data = {}
+                    if field_integration.update_field_on_response:
+                        from jsonpath_ng import parse
+
+                        # Extract value from response
+                        if field_integration.response_field_path:
+                            jsonpath_expr = parse(field_integration.response_field_path)
+                            matches = jsonpath_expr.find(response)
+                            if matches:
+                                response_data['field_value'] = matches[0].value
+
+                        # Extract additional mapped fields
+                        response_data['mapped_fields'] = {}
+                        for resp_path, case_field in field_integration.response_field_mapping.items():
+                            jsonpath_expr = parse(f"$.{resp_path}")
+                            matches = jsonpath_expr.find(response)
+                            if matches:
+                                response_data['mapped_fields'][case_field] = matches[0].value
+
+                    executed.append({
+                        "integration": field_integration.integration.name,
+                        "status": "success",
+                        "response_data": response_data,
+                        "url_called": field_integration.integration.resolve_url(request_data['path_params'])
+                    })
+
+                except Exception as e:
+                    failed.append({
+                        "integration": field_integration.integration.name,
+                        "error": str(e)
+                    })
+
             return Response({
                 "status": "success",
                 "integrations_executed": len(executed),
@@ -385,260 +410,55 @@ class FieldIntegrationsListView(APIView):
             )
 
 class EmployeeCasesView(APIView):
+    """
+    Employee inbox. Each category is cursor-paginated on its own:
+    ``?<category>_cursor=...`` pages one category, ``?category=<category>``
+    limits the response to that category and ``?page_size=`` sets the page size.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        user_groups = user.groups.all()
-
-        # -------- My Cases (assigned to me OR parallel approval cases I can act on) --------
-        # Only include unassigned cases if they are parallel approval cases
-        my_cases_query = Case.objects.filter(
-            Q(assigned_emp=user) |  # Cases directly assigned to me
-            (
-                    Q(assigned_emp__isnull=True) & (  # Unassigned cases where...
-                # I'm in a parallel approval group
-                    Q(current_approval_step__parallel_approval_groups__group__in=user_groups) |
-                    # OR I'm a priority approver
-                    Q(current_approval_step__priority_approver_groups__in=user_groups)
-            )
-            )
-        ).distinct()
+        inbox = EmployeeInbox(request.user)
 
-        # Categorize them
-        assigned_to_me = []
-        pending_my_approval = []
-        already_approved = []
+        requested = request.query_params.get('category')
+        if requested and requested not in EmployeeInbox.CATEGORIES:
+            return Response(
+                {"error": f"Unknown category. Choose one of: {', '.join(EmployeeInbox.CATEGORIES)}"},
+                status=status.HTTP_400_BAD_REQUEST)
 
-        for case in my_cases_query:
-            case_data = self._serialize_case_with_actions(case, user_groups, user)
+        pages = {}
+        for category in EmployeeInbox.CATEGORIES:
+            if requested and category != requested:
+                continue
+            queryset = inbox.get_queryset(category)
+            paginator = InboxCursorPagination()
+            paginator.cursor_query_param = f'{category}_cursor'
+            cases = paginator.paginate_queryset(queryset, request, view=self)
 
-            if case.assigned_emp == user:
-                # Directly assigned to me
-                assigned_to_me.append(case_data)
+            if category == 'available_cases':
+                results = CaseSerializer(cases, many=True).data
             else:
-                # It's a parallel approval case
-                approval_step = case.current_approval_step
-                if approval_step and approval_step.parallel_approval_groups.exists():
-                    # Check if I've already approved
-                    user_approved = ApprovalRecord.objects.filter(
-                        case=case,
-                        approval_step=approval_step,
-                        approved_by=user
-                    ).exists()
-
-                    if user_approved:
-                        already_approved.append(case_data)
-                    else:
-                        pending_my_approval.append(case_data)
+                results = inbox.serialize_cases(cases)
 
-        # -------- Available Cases (unassigned non-parallel cases in my groups) --------
-        # These are cases I can assign to myself
-        available_cases = Case.objects.filter(
-            Q(assigned_emp__isnull=True) &  # Not assigned to anyone
-            Q(assigned_group__in=user_groups) &  # In my groups
-            # Exclude parallel approval cases (they go in my_cases)
-            ~Q(current_approval_step__parallel_approval_groups__isnull=False) &
-            # Exclude priority approval cases
-            ~Q(current_approval_step__priority_approver_groups__in=user_groups)
-        ).distinct()
+            pages[category] = {
+                'count': queryset.count(),
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+                'results': results,
+            }
 
-        available_cases_data = CaseSerializer(available_cases, many=True).data
+        if requested:
+            return Response(pages[requested])
 
+        my_cases = {category: pages[category] for category in EmployeeInbox.MY_CASE_CATEGORIES}
         return Response({
             'my_cases': {
-                'total_count': len(assigned_to_me) + len(pending_my_approval) + len(already_approved),
-                'categories': {
-                    'assigned_to_me': {
-                        'count': len(assigned_to_me),
-                        'results': assigned_to_me
-                    },
-                    'pending_my_approval': {
-                        'count': len(pending_my_approval),
-                        'results': pending_my_approval
-                    },
-                    'already_approved': {
-                        'count': len(already_approved),
-                        'results': already_approved
-                    }
-                }
+                'total_count': sum(page['count'] for page in my_cases.values()),
+                'categories': my_cases,
             },
-            'available_cases': {
-                'count': available_cases.count(),
-                'results': available_cases_data
-            }
+            'available_cases': pages['available_cases'],
         })
 
-    def _serialize_case_with_actions(self, case, user_groups, user):
-        """
-        Serialize a single case with its available actions and approval info.
-        """
-        case_data = CaseSerializer(case).data
-        case_data["available_actions"] = []
-        case_data["approval_info"] = None
-        case_data["approval_history"] = []  # Add approval history
-
-        # Get all historical approvals for this case
-        historical_approvals = ApprovalRecord.objects.filter(
-            case=case
-        ).select_related('approved_by', 'approval_step', 'action_taken').order_by('-approved_at')
-
-        # Group historical approvals by approval step
-        approval_history_by_step = {}
-        for record in historical_approvals:
-            step_id = record.approval_step.id
-            if step_id not in approval_history_by_step:
-                approval_history_by_step[step_id] = {
-                    'approval_step': {
-                        'id': record.approval_step.id,
-                        'status': record.approval_step.status.name if record.approval_step.status else None,
-                        'group': record.approval_step.group.name if record.approval_step.group else None,
-                        'step_type': record.approval_step.get_step_type_display() if record.approval_step.step_type else None,
-                    },
-                    'approvals': []
-                }
-
-            approval_history_by_step[step_id]['approvals'].append({
-                'approved_by': record.approved_by.get_full_name() or record.approved_by.username,
-                'approved_at': record.approved_at,
-                'action_taken': record.action_taken.name if record.action_taken else 'Unknown',
-                'department': None  # Will be filled below
-            })
-
-        # Convert to list and add department info
-        for step_data in approval_history_by_step.values():
-            # Determine if this was a parallel approval step
-            step_id = step_data['approval_step']['id']
-            try:
-                step_obj = ApprovalStep.objects.get(id=step_id)
-                parallel_groups = step_obj.parallel_approval_groups.all()
-
-                if parallel_groups.exists():
-                    step_data['approval_step']['type'] = 'parallel'
-                    step_data['approval_step']['required_approvals'] = step_obj.required_approvals
-
-                    # Add department info to each approval
-                    for approval in step_data['approvals']:
-                        user_obj = get_user_model().objects.filter(
-                            username=approval['approved_by'].split(' ')[0]  # Rough match
-                        ).first()
-
-                        if user_obj:
-                            user_groups_ids = user_obj.groups.values_list('id', flat=True)
-                            for pg in parallel_groups:
-                                if pg.group.id in user_groups_ids:
-                                    approval['department'] = pg.group.name
-                                    break
-                else:
-                    step_data['approval_step']['type'] = 'sequential'
-            except ApprovalStep.DoesNotExist:
-                step_data['approval_step']['type'] = 'unknown'
-
-            case_data["approval_history"].append(step_data)
-
-        approval_step = getattr(case, "current_approval_step", None)
-        if not approval_step:
-            return case_data
-
-        # Check if this is a parallel approval step
-        parallel_groups = approval_step.parallel_approval_groups.all()
-        if parallel_groups.exists() and approval_step.required_approvals:
-            # Get approval progress for current step
-            approval_records = ApprovalRecord.objects.filter(
-                case=case,
-                approval_step=approval_step
-            ).select_related('approved_by')
-
-            # Check if current user already approved
-            user_approved = approval_records.filter(approved_by=user).exists()
-
-            # Get list of who has approved
-            approvers = []
-            approved_groups = set()
-
-            for record in approval_records:
-                approver_groups = record.approved_by.groups.all()
-                approver_info = {
-                    'user': record.approved_by.get_full_name() or record.approved_by.username,
-                    'approved_at': record.approved_at,
-                    'department': None
-                }
-
-                # Find which group this approver represents
-                for pg in parallel_groups:
-                    if pg.group in approver_groups:
-                        approver_info['department'] = pg.group.name
-                        approved_groups.add(pg.group.id)
-                        break
-
-                if not approver_info['department'] and case.assigned_group in approver_groups:
-                    approver_info['department'] = case.assigned_group.name
-                    approved_groups.add(case.assigned_group.id)
-
-                approvers.append(approver_info)
-
-            case_data["approval_info"] = {
-                "type": "parallel",
-                "required_approvals": approval_step.required_approvals,
-                "current_approvals": len(approved_groups),
-                "remaining_approvals": max(0, approval_step.required_approvals - len(approved_groups)),
-                "user_has_approved": user_approved,
-                "can_approve": not user_approved,
-                "approvers": approvers,
-                "pending_groups": [
-                    {"id": pg.group.id, "name": pg.group.name}
-                    for pg in parallel_groups
-                    if pg.group.id not in approved_groups
-                ]
-            }
-        else:
-            # Regular sequential approval
-            case_data["approval_info"] = {
-                "type": "sequential",
-                "can_approve": case.assigned_emp == user or
-                               (case.assigned_emp is None and
-                                case.assigned_group in user_groups)
-            }
-
-        # Get available actions based on approval type
-        action_steps = approval_step.actions.filter(
-            active_ind=True,
-            action__active_ind=True,
-        ).select_related('action')
-
-        allowed_actions = []
-        for step in action_steps:
-            action = step.action
-            if not action:
-                continue
-
-            action_groups = action.groups.all()
-            if not action_groups.exists() or action_groups.intersection(user_groups).exists():
-                # Check if user can perform this action
-                if case_data["approval_info"]["type"] == "parallel":
-                    if case_data["approval_info"]["can_approve"]:
-                        allowed_actions.append(action)
-                else:
-                    if case_data["approval_info"]["can_approve"]:
-                        allowed_actions.append(action)
-
-        case_data["available_actions"] = ActionBasicSerializer(allowed_actions, many=True).data
-
-        # Add UI hints for better UX
-        if case_data["approval_info"]["type"] == "parallel":
-            if case_data["approval_info"]["user_has_approved"]:
-                case_data["ui_status"] = "You have approved this case"
-                case_data["ui_status_color"] = "green"
-            elif case_data["approval_info"]["remaining_approvals"] > 0:
-                case_data["ui_status"] = f"Awaiting {case_data['approval_info']['remaining_approvals']} more approval(s)"
-                case_data["ui_status_color"] = "orange"
-            else:
-                case_data["ui_status"] = "All approvals received"
-                case_data["ui_status_color"] = "green"
-
-        return case_data
-
-
 
 class AssignCaseView(APIView):
     permission_classes = [IsAuthenticated]
@@ -1802,7 +1622,7 @@ class RunMapperAPIView(views.APIView):
         target = MapperTarget.objects.get(id=serializer.validated_data['mapper_target_id'])
 
         try:
-            result = process_records(case, target, found_object=None)
+            result = default_processor(target)(case, target, found_object=None)
             return Response({
                 "message": "✅ Mapping executed successfully.",
                 "result_count": len(result) if isinstance(result, list) else 1
@@ -1810,6 +1630,42 @@ class RunMapperAPIView(views.APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=400)
 
+class MapperRunAPIView(views.APIView):
+    """Queue a chunked, resumable mapper run; poll MapperRunStatusAPIView for progress."""
+    def post(self, request):
+        serializer = StartMapperRunInputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        case = get_object_or_404(Case, id=serializer.validated_data['case_id'])
+        target_id = serializer.validated_data.get('mapper_target_id')
+        target = get_object_or_404(MapperTarget, id=target_id) if target_id else None
+
+        header = start_mapper_run(case, target)
+        return Response(run_status(header), status=status.HTTP_202_ACCEPTED)
+
+class MapperRunStatusAPIView(views.APIView):
+    def get(self, request, run_id):
+        try:
+            header = get_run_header(run_id)
+        except MapperExecutionLog.DoesNotExist:
+            return Response({"error": "Mapper run not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(run_status(header))
+
+    def post(self, request, run_id):
+        """Resume a failed run from its last committed chunk."""
+        try:
+            header = get_run_header(run_id)
+        except MapperExecutionLog.DoesNotExist:
+            return Response({"error": "Mapper run not found."}, status=status.HTTP_404_NOT_FOUND)
+        if header.status != MapperExecutionLog.RUN_FAILED:
+            return Response({"error": f"Only failed runs can be resumed (status: {header.status})."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        MapperExecutionLog.objects.filter(pk=header.pk).update(status=MapperExecutionLog.RUN_PENDING)
+        header.status = MapperExecutionLog.RUN_PENDING
+        queue_mapper_run(header.run_id)
+        return Response(run_status(header), status=status.HTTP_202_ACCEPTED)
+
 class DryRunMapperAPIView(views.APIView):
     def post(self, request):
         # from .plugins.default_plugin import dry_run
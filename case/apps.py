@@ -5,3 +5,6 @@ class CaseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'case'
     verbose_name = 'Cases'
+
+    def ready(self):
+        import case.signals  # noqa
@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from case.utils.expression_evaluator import compile_expression, eval_expression
+
+EXPRESSIONS = [
+    "amount > 1000 and status == 'active'",
+    "category in allowed_categories or priority >= 3",
+    "not archived and owner != None",
+]
+
+
+class Command(BaseCommand):
+    help = ('Evaluate mapper-style condition expressions over a mapped list, parsing every '
+            'item with merged variables versus the cached compiled expressions')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        items = [
+            {
+                'amount': index * 7 % 5000,
+                'status': 'active' if index % 3 else 'closed',
+                'category': f"cat-{index % 10}",
+                'priority': index % 5,
+                'archived': index % 11 == 0,
+                'owner': None if index % 13 == 0 else f"user-{index % 50}",
+            }
+            for index in range(options['items'])
+        ]
+        context = {'case_id': 1, 'allowed_categories': ['cat-1', 'cat-2', 'cat-3']}
+        parse_each_time = compile_expression.__wrapped__
+
+        def per_item_parse():
+            return [parse_each_time(expression)({**item, **context})
+                    for item in items for expression in EXPRESSIONS]
+
+        def compiled():
+            return [eval_expression(expression, context, item)
+                    for item in items for expression in EXPRESSIONS]
+
+        before, before_results = self._best_of(per_item_parse, options['repeat'])
+        after, after_results = self._best_of(compiled, options['repeat'])
+
+        if before_results != after_results:
+            self.stderr.write("[ERROR] Compiled expressions returned different results.")
+            return
+
+        evaluations = len(items) * len(EXPRESSIONS)
+        self.stdout.write(f"{evaluations} evaluations over {len(items)} items")
+        self.stdout.write(f"  parse + merge per item: {before * 1000:.1f} ms")
+        self.stdout.write(f"  cached compiled:        {after * 1000:.1f} ms")
+        self.stdout.write(f"✅ {before / after:.1f}x faster")
+
+    @staticmethod
+    def _best_of(run, repeat):
+        best, results = None, None
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            results = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, results
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from case.models import CaseSerialCounter
+from case.utils.serials import allocate_serial_numbers
+
+
+class Command(BaseCommand):
+    help = 'Allocate serial numbers from many threads on a scratch scope and verify they are unique'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--per-thread', type=int, default=50)
+        parser.add_argument('--scope', default='serial-check')
+
+    def handle(self, *args, **options):
+        scope = options['scope']
+        per_thread = options['per_thread']
+
+        def worker(_):
+            try:
+                return [allocate_serial_numbers(1, scope)[0] for _ in range(per_thread)]
+            finally:
+                connection.close()
+
+        CaseSerialCounter.objects.filter(scope=scope).delete()
+        try:
+            with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+                allocated = [value for chunk in executor.map(worker, range(options['threads']))
+                             for value in chunk]
+        finally:
+            CaseSerialCounter.objects.filter(scope=scope).delete()
+
+        expected = options['threads'] * per_thread
+        if len(set(allocated)) != expected or sorted(allocated) != list(range(1, expected + 1)):
+            raise CommandError(f"{expected} allocations produced {len(set(allocated))} unique, "
+                               f"non-contiguous serials.")
+        self.stdout.write(f"✅ {expected} serials allocated from {options['threads']} threads, "
+                          f"all unique and gap-free.")
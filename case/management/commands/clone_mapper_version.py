@@ -40,6 +40,7 @@ class Command(BaseCommand):
                 root_path=target.root_path,
                 filter_function_path=target.filter_function_path,
                 active_ind=target.active_ind,
+                bulk_mode=target.bulk_mode,
             )
 
             for rule in target.field_rules.all():
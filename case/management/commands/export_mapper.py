@@ -37,6 +37,7 @@ class Command(BaseCommand):
                 "root_path": target.root_path,
                 "filter_function_path": target.filter_function_path,
                 "active_ind": target.active_ind,
+                "bulk_mode": target.bulk_mode,
                 "field_rules": []
             }
 
@@ -38,7 +38,8 @@ class Command(BaseCommand):
                 post_processor_path=target_data.get("post_processor_path"),
                 root_path=target_data.get("root_path"),
                 filter_function_path=target_data.get("filter_function_path"),
-                active_ind=target_data.get("active_ind", True)
+                active_ind=target_data.get("active_ind", True),
+                bulk_mode=target_data.get("bulk_mode", False)
             )
 
             for rule_data in target_data.get("field_rules", []):
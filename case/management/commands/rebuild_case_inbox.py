@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from case.models import Case
+from case.utils.inbox import rebuild_case_inbox
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized employee inbox (CaseInboxEntry) from the current case state'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--case', type=int, action='append', dest='case_ids',
+                            help='Only rebuild the given case id (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Case.objects.all()
+        if options['case_ids']:
+            queryset = queryset.filter(id__in=options['case_ids'])
+
+        case_count, entry_count = rebuild_case_inbox(queryset, batch_size=options['batch_size'])
+        self.stdout.write(f"✅ Rebuilt {entry_count} inbox entries for {case_count} cases.")
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-16 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('case', '0023_apicalllog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseInboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('assigned_to_me', 'Assigned to me'), ('pending_my_approval', 'Pending my approval'), ('already_approved', 'Already approved'), ('available_cases', 'Available cases'), ('priority_approver', 'Priority approver')], max_length=30)),
+                ('can_act', models.BooleanField(default=True)),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to='case.case')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='case_inbox_entries', to='auth.group')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='case_inbox_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'category'], name='case_casein_user_id_74ccaa_idx'), models.Index(fields=['group', 'category'], name='case_casein_group_i_bc988b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+def seed_case_serial_counter(apps, schema_editor):
+    Case = apps.get_model('case', 'Case')
+    CaseSerialCounter = apps.get_model('case', 'CaseSerialCounter')
+    serials = Case.objects.filter(serial_number__isnull=False).values_list('serial_number', flat=True)
+    last_value = max((int(serial) for serial in serials if serial.isdigit()), default=0)
+    CaseSerialCounter.objects.update_or_create(scope='case', defaults={'last_value': last_value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('case', '0024_caseinboxentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseSerialCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50, unique=True)),
+                ('last_value', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(seed_case_serial_counter, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-16 11:20
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('case', '0025_caseserialcounter'),
+        ('lookup', '0003_lookup_is_category'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseDocument',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('storage_path', models.CharField(max_length=255)),
+                ('original_name', models.CharField(max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('case', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='case.case')),
+                ('document_type', models.ForeignKey(blank=True, limit_choices_to={'parent_lookup__name': 'Document Type'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='case_documents', to='lookup.lookup', verbose_name='Document Type')),
+                ('uploaded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploaded_case_documents', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-16 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('case', '0026_casedocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mappertarget',
+            name='bulk_mode',
+            field=models.BooleanField(default=False, help_text='Map with the built-in bulk processor: records are written with bulk_create/bulk_update (no per-instance save() or signals) and logged once per target.'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-16 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('case', '0027_mappertarget_bulk_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mapperexecutionlog',
+            name='run_id',
+            field=models.UUIDField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mapperexecutionlog',
+            name='status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], max_length=20),
+        ),
+        migrations.AddField(
+            model_name='mapperexecutionlog',
+            name='chunk_start',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mapperexecutionlog',
+            name='chunk_end',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='mapperexecutionlog',
+            constraint=models.UniqueConstraint(condition=models.Q(('chunk_start__isnull', False), ('run_id__isnull', False)), fields=('run_id', 'mapper_target', 'chunk_start'), name='unique_mapper_run_chunk'),
+        ),
+    ]
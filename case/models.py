@@ -7,7 +7,6 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Max
 
 
 class Case(models.Model):
@@ -128,22 +127,30 @@ class Case(models.Model):
         verbose_name=_("Additional Data")
     )
 
+    # Fields the employee inbox projection (CaseInboxEntry) is built from
+    INBOX_FIELDS = ('assigned_emp_id', 'assigned_group_id', 'current_approval_step_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        case = super().from_db(db, field_names, values)
+        # Remembered so saves that don't move the case skip the inbox rebuild
+        if all(attname in case.__dict__ for attname in cls.INBOX_FIELDS):
+            case._inbox_state = case.get_inbox_state()
+        return case
+
+    def get_inbox_state(self):
+        return tuple(getattr(self, attname) for attname in self.INBOX_FIELDS)
+
     def save(self, *args, **kwargs):
         if not self.pk:  # Generate serial number only for new instances
-            last_serial = Case.objects.filter(serial_number__isnull=False).aggregate(
-                Max('serial_number')
-            )['serial_number__max']
-            self.serial_number = self.generate_serial_number(last_serial)
+            from case.utils.serials import reserve_case_serial_number
 
-        super().save(*args, **kwargs)
+            with reserve_case_serial_number() as serial_number:
+                self.serial_number = serial_number
+                super().save(*args, **kwargs)
+            return
 
-    def generate_serial_number(self, last_serial):
-        """
-        Generate a new serial number based on the last serial number.
-        """
-        if last_serial:
-            return str(int(last_serial) + 1).zfill(6)
-        return "000001"
+        super().save(*args, **kwargs)
 
     def get_full_name(self):
         """
@@ -260,6 +267,123 @@ class ApprovalRecord(models.Model):
         unique_together = ['case', 'approval_step', 'approved_by']
 
 
+class CaseDocument(models.Model):
+    """
+    A file uploaded to a case. The content lives once in storage under its
+    SHA-256 (see ``case.utils.documents``), so identical uploads share it;
+    the id is what ``case_data['uploaded_files']`` refers to.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    case = models.ForeignKey(
+        Case,
+        on_delete=models.CASCADE,
+        related_name='documents',
+        null=True,
+        blank=True,
+    )
+    document_type = models.ForeignKey(
+        to="lookup.Lookup",
+        related_name="case_documents",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        limit_choices_to={"parent_lookup__name": "Document Type"},
+        verbose_name=_("Document Type"),
+    )
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    storage_path = models.CharField(max_length=255)
+    original_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    uploaded_by = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        related_name="uploaded_case_documents",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    uploaded_at = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def display_name(self):
+        """The serial-number based name files used to be stored under."""
+        timestamp = timezone.localtime(self.uploaded_at).strftime('%Y-%m-%d_%H-%M-%S')
+        if self.case_id and self.case.case_type:
+            return f"{self.case.case_type.code}_{self.case.serial_number}-{timestamp}_{self.original_name}"
+        return self.original_name
+
+    def __str__(self):
+        return f"{self.original_name} ({self.sha256[:12]})"
+
+
+class CaseSerialCounter(models.Model):
+    """
+    Last serial number handed out per scope. Rows are incremented with a
+    single locking UPDATE (see ``case.utils.serials``) instead of scanning
+    ``Case.serial_number`` for its maximum.
+    """
+    scope = models.CharField(max_length=50, unique=True)
+    last_value = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.scope}: {self.last_value}"
+
+
+class CaseInboxEntry(models.Model):
+    """
+    Denormalized projection of who can see a case in the employee inbox.
+    Rebuilt for a case whenever it moves (see ``case.signals``)
+    so listing an inbox category is an index lookup instead of a multi-join.
+    Existing cases are backfilled, or a drifted projection repaired, with
+    ``manage.py rebuild_case_inbox``.
+    """
+    ASSIGNED_TO_ME = 'assigned_to_me'
+    PENDING_MY_APPROVAL = 'pending_my_approval'
+    ALREADY_APPROVED = 'already_approved'
+    AVAILABLE_CASES = 'available_cases'
+    PRIORITY_APPROVER = 'priority_approver'
+
+    CATEGORY_CHOICES = (
+        (ASSIGNED_TO_ME, _('Assigned to me')),
+        (PENDING_MY_APPROVAL, _('Pending my approval')),
+        (ALREADY_APPROVED, _('Already approved')),
+        (AVAILABLE_CASES, _('Available cases')),
+        (PRIORITY_APPROVER, _('Priority approver')),
+    )
+
+    case = models.ForeignKey(
+        Case,
+        on_delete=models.CASCADE,
+        related_name='inbox_entries',
+    )
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='case_inbox_entries',
+        null=True,
+        blank=True,
+    )
+    group = models.ForeignKey(
+        to="auth.Group",
+        on_delete=models.CASCADE,
+        related_name='case_inbox_entries',
+        null=True,
+        blank=True,
+    )
+    category = models.CharField(max_length=30, choices=CATEGORY_CHOICES)
+    can_act = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'category']),
+            models.Index(fields=['group', 'category']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_category_display()} - {self.user or self.group} - {self.case}"
+
+
 class APICallLog(models.Model):
     case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name='api_call_logs')
     field = models.ForeignKey('dynamicflow.Field', on_delete=models.CASCADE)
@@ -366,6 +490,11 @@ class MapperTarget(models.Model):
     )
 
     active_ind = models.BooleanField(default=True, help_text="Whether this target is active.")
+    bulk_mode = models.BooleanField(
+        default=False,
+        help_text="Map with the built-in bulk processor: records are written with bulk_create/bulk_update "
+                  "(no per-instance save() or signals) and logged once per target."
+    )
 
     # You could store more info if needed, e.g. an 'operation' field, or
     # even a JSON of custom parameters.
@@ -513,6 +642,17 @@ class MapperFieldRuleLog(models.Model):
         return f"ChangeLog for Rule {self.rule_id} at {self.changed_at}"
 
 class MapperExecutionLog(models.Model):
+    RUN_PENDING = 'pending'
+    RUN_RUNNING = 'running'
+    RUN_COMPLETED = 'completed'
+    RUN_FAILED = 'failed'
+    RUN_STATUSES = [
+        (RUN_PENDING, 'Pending'),
+        (RUN_RUNNING, 'Running'),
+        (RUN_COMPLETED, 'Completed'),
+        (RUN_FAILED, 'Failed'),
+    ]
+
     case = models.ForeignKey("Case", on_delete=models.CASCADE, related_name="mapper_logs")
     mapper_target = models.ForeignKey("MapperTarget", on_delete=models.SET_NULL, null=True)
     executed_at = models.DateTimeField(default=timezone.now)
@@ -521,8 +661,22 @@ class MapperExecutionLog(models.Model):
     error_trace = models.TextField(null=True, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    # Asynchronous runs (see case.utils.mapper_runs): the run's header row has
+    # no chunk_start; each committed chunk of a target adds a row of its own.
+    run_id = models.UUIDField(null=True, blank=True, db_index=True)
+    status = models.CharField(max_length=20, choices=RUN_STATUSES, blank=True)
+    chunk_start = models.PositiveIntegerField(null=True, blank=True)
+    chunk_end = models.PositiveIntegerField(null=True, blank=True)
+
     class Meta:
         ordering = ['-executed_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['run_id', 'mapper_target', 'chunk_start'],
+                condition=models.Q(run_id__isnull=False, chunk_start__isnull=False),
+                name='unique_mapper_run_chunk',
+            ),
+        ]
 
     def __str__(self):
         return f"ExecutionLog: Case {self.case_id} → Target {self.mapper_target_id}"
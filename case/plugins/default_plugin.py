@@ -11,9 +11,11 @@ def find_records(case, mapper_target):
 
 # myapp/plugins/default_plugin.py
 
-def process_records(case, mapper_target, found_object=None, depth=0, depth_limit=10, visited_targets=None, context=None):
+def process_records(case, mapper_target, found_object=None, depth=0, depth_limit=10, visited_targets=None, context=None,
+                    item_slice=None):
     """
     Processes a MapperTarget and its children recursively with full context injection.
+    ``item_slice`` limits a list-based target to that slice of its items.
     """
     from case.models import MapperTarget, MapperExecutionLog
     from lookup.models import Lookup
@@ -45,7 +47,9 @@ def process_records(case, mapper_target, found_object=None, depth=0, depth_limit
             if mapper_target.filter_function_path:
                 filter_func = load_function_by_path(mapper_target.filter_function_path)
 
-            for index, item in enumerate(data_list):
+            first_index = (item_slice.start or 0) if item_slice else 0
+            items = data_list[item_slice] if item_slice else data_list
+            for index, item in enumerate(items, start=first_index):
                 if filter_func:
                     try:
                         if not filter_func(item, case):
@@ -149,10 +153,12 @@ def process_records(case, mapper_target, found_object=None, depth=0, depth_limit
     return results
 
 
-def apply_field_rules(instance, data_source, rules, context=None):
+def apply_field_rules(instance, data_source, rules, context=None, plan=None):
     """
     Applies rules with expression/legacy condition + lookup + transform support.
     Context is injected into all evaluators and transformers.
+    With a ``TargetPlan`` the lookup translations and transform functions
+    come from the plan instead of being queried/loaded for every rule.
     """
     from case.utils.expression_evaluator import eval_expression, UnsafeExpressionError
     from lookup.models import Lookup
@@ -167,7 +173,7 @@ def apply_field_rules(instance, data_source, rules, context=None):
         was_transformed = False
 
         # ✅ Multi-condition logic (grouped)
-        conditions = rule.conditions.all()
+        conditions = rule.rule_conditions.all()
         grouped = {}
         for cond in conditions:
             grouped.setdefault(cond.group, []).append(cond)
@@ -180,7 +186,7 @@ def apply_field_rules(instance, data_source, rules, context=None):
                 result = True
                 try:
                     if cond.condition_expression:
-                        result = eval_expression(cond.condition_expression, {**data_source, **context})
+                        result = eval_expression(cond.condition_expression, context, data_source)
                     elif cond.condition_path and cond.condition_operator:
                         val = extract_json_value(data_source, cond.condition_path)
                         expected = cond.condition_value
@@ -213,7 +219,9 @@ def apply_field_rules(instance, data_source, rules, context=None):
             value = rule.default_value
 
         # ✅ Lookup translation
-        if rule.source_lookup and rule.target_lookup:
+        if plan and rule.source_lookup_id and rule.target_lookup_id:
+            value = plan.translate(rule, value)
+        elif rule.source_lookup and rule.target_lookup:
             try:
                 matched_lookup = Lookup.objects.get(parent_lookup=rule.source_lookup, code=value)
                 translated = Lookup.objects.filter(
@@ -226,7 +234,7 @@ def apply_field_rules(instance, data_source, rules, context=None):
 
         # ✅ Transform function with context
         if rule.transform_function_path:
-            transformer = load_function_by_path(rule.transform_function_path)
+            transformer = plan.transformers[rule.id] if plan else load_function_by_path(rule.transform_function_path)
             try:
                 value = transformer(value, context=context)
             except TypeError:
@@ -251,6 +259,190 @@ def apply_field_rules(instance, data_source, rules, context=None):
 
 
 
+class TargetPlan:
+    """
+    Everything about a MapperTarget that does not depend on the row: its
+    field rules (with their conditions), child targets, filter and transform
+    functions, and lookup translation maps. Loaded once per target.
+    """
+    def __init__(self, mapper_target):
+        from case.models import MapperTarget
+
+        self.target = mapper_target
+        self.model_class = mapper_target.content_type.model_class()
+        self.rules = list(
+            mapper_target.field_rules.prefetch_related('rule_conditions').order_by('id')
+        )
+        self.children = list(
+            MapperTarget.objects.filter(parent_target=mapper_target).select_related('content_type', 'case_mapper')
+        )
+        self.filter_func = (
+            load_function_by_path(mapper_target.filter_function_path)
+            if mapper_target.filter_function_path else None
+        )
+        self.transformers = {
+            rule.id: load_function_by_path(rule.transform_function_path)
+            for rule in self.rules if rule.transform_function_path
+        }
+        self.translations = {}
+        for rule in self.rules:
+            key = (rule.source_lookup_id, rule.target_lookup_id)
+            if all(key) and key not in self.translations:
+                self.translations[key] = self._translation_map(*key)
+
+    @staticmethod
+    def _translation_map(source_lookup_id, target_lookup_id):
+        """{code: target Lookup} for codes present in both lookup categories."""
+        from lookup.models import Lookup
+
+        source_codes = Lookup.objects.filter(parent_lookup_id=source_lookup_id).values('code')
+        translated = Lookup.objects.filter(
+            parent_lookup_id=target_lookup_id, code__in=source_codes
+        ).order_by('-pk')
+        # Lowest pk wins, like the per-row ``.first()``
+        return {lookup.code: lookup for lookup in translated}
+
+    def translate(self, rule, value):
+        if value is None:
+            return value
+        translated = self.translations[(rule.source_lookup_id, rule.target_lookup_id)].get(str(value))
+        return translated if translated is not None else value
+
+    def concrete_fields(self):
+        """Rule target fields that ``bulk_update`` can write."""
+        names = {field.name for field in self.model_class._meta.concrete_fields if not field.primary_key}
+        names |= {field.attname for field in self.model_class._meta.concrete_fields if not field.primary_key}
+        return sorted({rule.target_field for rule in self.rules if rule.target_field in names})
+
+
+def process_records_bulk(case, mapper_target, found_object=None, depth=0, depth_limit=10,
+                         visited_targets=None, context=None, batch_size=None, item_slice=None):
+    """
+    Set-based variant of ``process_records``. Rules, child targets and lookup
+    translations are loaded once per target, the rows of a target are built
+    in memory and written with ``bulk_create``/``bulk_update``, and each
+    target gets one aggregated MapperExecutionLog. Instance ``save()`` and
+    model signals are not called.
+    """
+    from django.conf import settings
+
+    batch_size = batch_size or getattr(settings, 'CASE_MAPPER_BULK_BATCH_SIZE', 500)
+    return _process_target_bulk(
+        case, TargetPlan(mapper_target), [context or {}], found_object,
+        depth, depth_limit, visited_targets or set(), batch_size, item_slice
+    )
+
+
+def _process_target_bulk(case, plan, parent_contexts, found_object, depth, depth_limit, visited_targets, batch_size,
+                         item_slice=None):
+    from case.models import MapperExecutionLog
+
+    mapper_target = plan.target
+    if depth > depth_limit:
+        raise RecursionError(f"Maximum depth limit ({depth_limit}) reached at target {mapper_target}")
+    if mapper_target.id in visited_targets:
+        raise RecursionError(f"Circular reference detected in MapperTarget ID {mapper_target.id}")
+    visited_targets = visited_targets | {mapper_target.id}
+
+    rows = []
+    try:
+        for context in parent_contexts:
+            rows.extend(_build_rows(case, plan, context, found_object, item_slice))
+
+        created = [instance for instance, _, _ in rows if instance._state.adding]
+        updated = [instance for instance, _, _ in rows if not instance._state.adding]
+        if created:
+            plan.model_class.objects.bulk_create(created, batch_size=batch_size)
+        if updated and plan.concrete_fields():
+            plan.model_class.objects.bulk_update(updated, plan.concrete_fields(), batch_size=batch_size)
+
+        MapperExecutionLog.objects.create(
+            case=case,
+            mapper_target=mapper_target,
+            success=True,
+            result_data={
+                "target_model": plan.model_class.__name__,
+                "mode": "bulk",
+                "record_count": len(rows),
+                "created": len(created),
+                "updated": len(updated),
+                "records": [log for _, _, log in rows],
+            }
+        )
+    except Exception as e:
+        MapperExecutionLog.objects.create(
+            case=case,
+            mapper_target=mapper_target,
+            success=False,
+            error_trace=str(e)
+        )
+        raise e
+
+    # 🔁 Each child target runs once for all rows of this target
+    child_contexts = [{**runtime_context, "current_object": instance} for instance, runtime_context, _ in rows]
+    for child in plan.children:
+        if child_contexts:
+            _process_target_bulk(
+                case, TargetPlan(child), child_contexts, None,
+                depth + 1, depth_limit, visited_targets, batch_size
+            )
+
+    return [instance for instance, _, _ in rows]
+
+
+def _build_rows(case, plan, context, found_object, item_slice=None):
+    """(instance, runtime_context, log entry) for each record of ``plan`` under one parent context."""
+    mapper_target = plan.target
+    rows = []
+
+    # 🟢 List-based mapping
+    if mapper_target.root_path:
+        data_list = extract_json_value(case.case_data, mapper_target.root_path)
+        if not isinstance(data_list, list):
+            raise ValueError(f"Expected list at root_path '{mapper_target.root_path}', got: {type(data_list)}")
+
+        first_index = (item_slice.start or 0) if item_slice else 0
+        items = data_list[item_slice] if item_slice else data_list
+        for index, item in enumerate(items, start=first_index):
+            if plan.filter_func:
+                try:
+                    if not plan.filter_func(item, case):
+                        continue
+                except Exception as e:
+                    raise ValueError(f"Filter function failed on item #{index}: {e}")
+
+            instance = plan.model_class()
+            runtime_context = {
+                **context,
+                "case_id": case.id,
+                "record_index": index,
+                "parent_object": context.get("current_object"),
+                "current_data": item,
+            }
+            log = apply_field_rules(instance, item, plan.rules, context=runtime_context, plan=plan)
+            rows.append((instance, runtime_context, {"record_index": index, "fields": log}))
+
+    # 🟢 Flat mapping
+    else:
+        data_context = context.get("current_data") or case.case_data
+        instance = found_object or plan.model_class()
+        runtime_context = {
+            **context,
+            "case_id": case.id,
+            "current_data": data_context,
+            "current_object": instance
+        }
+        log = apply_field_rules(instance, data_context, plan.rules, context=runtime_context, plan=plan)
+        rows.append((instance, runtime_context, {"fields": log}))
+
+    return rows
+
+
+def default_processor(mapper_target):
+    """The built-in processor for a target without ``processor_function_path``."""
+    return process_records_bulk if mapper_target.bulk_mode else process_records
+
+
 def extract_json_value(data, path_str):
     """
     Dotted path extraction from dict, list, or object.
@@ -342,7 +534,7 @@ def dry_run(case, mapper_target, found_object=None, context=None):
 
                     if rule.condition_expression:
                         try:
-                            matched = eval_expression(rule.condition_expression, {**item, **context})
+                            matched = eval_expression(rule.condition_expression, context, item)
                             if not matched:
                                 value = rule.default_value
                         except UnsafeExpressionError:
@@ -425,7 +617,7 @@ def dry_run(case, mapper_target, found_object=None, context=None):
 
                 if rule.condition_expression:
                     try:
-                        matched = eval_expression(rule.condition_expression, {**source, **context})
+                        matched = eval_expression(rule.condition_expression, context, source)
                         if not matched:
                             value = rule.default_value
                     except UnsafeExpressionError:
@@ -543,3 +735,4 @@ def evaluate_conditions(conditions, data_source):
 
 # ✅ Attach dry_run to processor for external access
 process_records.dry_run = dry_run
+process_records_bulk.dry_run = dry_run
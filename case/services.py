@@ -3,7 +3,7 @@ import traceback
 from django.db import transaction
 
 from case.models import CaseMapper, MapperExecutionLog
-from case.plugins.default_plugin import load_function_by_path
+from case.plugins.default_plugin import default_processor, load_function_by_path
 
 
 def preview_mapping(case):
@@ -28,14 +28,12 @@ def preview_mapping(case):
         finder_func = load_function_by_path(
             target.finder_function_path
         ) if target.finder_function_path else load_function_by_path(
-            "myapp.plugins.default_plugin.find_records"
+            "case.plugins.default_plugin.find_records"
         )
 
         processor_func = load_function_by_path(
             target.processor_function_path
-        ) if target.processor_function_path else load_function_by_path(
-            "myapp.plugins.default_plugin.process_records"
-        )
+        ) if target.processor_function_path else default_processor(target)
 
         # Call finder
         found_objects = finder_func(case, target)
@@ -104,14 +102,12 @@ def execute_mappings(case):
                 finder_func = load_function_by_path(
                     target.finder_function_path
                 ) if target.finder_function_path else load_function_by_path(
-                    "myapp.plugins.default_plugin.find_records"
+                    "case.plugins.default_plugin.find_records"
                 )
 
                 processor_func = load_function_by_path(
                     target.processor_function_path
-                ) if target.processor_function_path else load_function_by_path(
-                    "myapp.plugins.default_plugin.process_records"
-                )
+                ) if target.processor_function_path else default_processor(target)
 
                 found_objects = finder_func(case, target)
 
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from case.models import ApprovalRecord, Case
+from case.utils.inbox import rebuild_case_inbox
+from conditional_approval.models import ApprovalStep, ParallelApprovalGroup
+
+
+def sync_inbox_after_commit(case_filter):
+    """
+    Rebuild the inbox entries of the cases matching ``case_filter`` once the
+    transaction commits, from the committed rows rather than the instance
+    that fired the signal. A case's own entries go away with it (CASCADE).
+    Robust, so a failed rebuild is logged instead of failing a write that
+    already committed; ``rebuild_case_inbox`` repairs it.
+    """
+    transaction.on_commit(lambda: rebuild_case_inbox(Case.objects.filter(**case_filter)), robust=True)
+
+
+def sync_case(sender, instance, created=False, raw=False, **kwargs):
+    # Saves that leave the inbox fields as they were loaded, e.g. ones that
+    # only change case_data or updated_by, don't move the case.
+    if raw:
+        return
+    state = instance.get_inbox_state()
+    if created or getattr(instance, '_inbox_state', None) != state:
+        instance._inbox_state = state
+        sync_inbox_after_commit({'pk': instance.pk})
+
+
+def sync_approval_record_case(sender, instance, raw=False, **kwargs):
+    # "Already approved" entries depend on who acted on the current step.
+    if not raw:
+        sync_inbox_after_commit({'pk': instance.case_id})
+
+
+def sync_step_cases(sender, instance, raw=False, **kwargs):
+    # Changing a step's parallel groups moves every case waiting on it.
+    if not raw:
+        sync_inbox_after_commit({'current_approval_step_id': instance.approval_step_id})
+
+
+def sync_priority_group_cases(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        sync_inbox_after_commit({'current_approval_step_id': instance.pk})
+    elif pk_set:
+        sync_inbox_after_commit({'current_approval_step_id__in': set(pk_set)})
+    else:
+        # post_clear from the group side doesn't say which steps it left.
+        sync_inbox_after_commit({'current_approval_step__isnull': False})
+
+
+post_save.connect(sync_case, sender=Case, dispatch_uid="case_inbox_case_save")
+post_save.connect(sync_approval_record_case, sender=ApprovalRecord,
+                  dispatch_uid="case_inbox_approval_record_save")
+post_delete.connect(sync_approval_record_case, sender=ApprovalRecord,
+                    dispatch_uid="case_inbox_approval_record_delete")
+post_save.connect(sync_step_cases, sender=ParallelApprovalGroup,
+                  dispatch_uid="case_inbox_parallel_group_save")
+post_delete.connect(sync_step_cases, sender=ParallelApprovalGroup,
+                    dispatch_uid="case_inbox_parallel_group_delete")
+m2m_changed.connect(sync_priority_group_cases, sender=ApprovalStep.priority_approver_groups.through,
+                    dispatch_uid="case_inbox_priority_groups")
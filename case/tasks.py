@@ -0,0 +1,22 @@
+# File: case/tasks.py
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from case.models import MapperExecutionLog
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def run_mapper_task(self, run_id: str):
+    """Run or resume a chunked mapper run; a retry continues after the last committed chunk."""
+    from case.utils.mapper_runs import run_mapper
+
+    try:
+        run_mapper(run_id)
+    except MapperExecutionLog.DoesNotExist:
+        logger.error(f"Mapper run {run_id} not found")
+    except Exception as e:
+        logger.error(f"Mapper run {run_id} failed: {e}")
+        raise self.retry(exc=e)
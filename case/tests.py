@@ -1 +1,327 @@
-# Create your tests here.
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from case.apis.serializers import CaseSerializer
+from case.apis.views import EmployeeCasesView
+from case.models import (
+    ApprovalRecord, Case, CaseInboxEntry, CaseMapper, MapperExecutionLog, MapperTarget,
+    Note
+)
+from case.utils import expression_evaluator
+from case.utils.documents import (
+    create_document, delete_document, delete_unreferenced_content
+)
+from case.utils.expression_evaluator import (
+    UnsafeExpressionError, compile_expression, eval_expression
+)
+from case.utils.mapper_runs import run_mapper, start_mapper_run
+from case.utils.serials import format_serial_number
+from conditional_approval.models import (
+    Action, ActionStep, ApprovalStep, ParallelApprovalGroup
+)
+from lookup.models import Lookup
+
+
+class EmployeeCasesViewQueryCountTests(TestCase):
+    """The employee inbox costs the same number of queries however many cases
+    it lists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.reviewers = Group.objects.create(name='Reviewers')
+        cls.auditors = Group.objects.create(name='Auditors')
+
+        cls.employee = User.objects.create_user(username='employee', password='secret')
+        cls.employee.groups.add(cls.reviewers)
+        cls.auditor = User.objects.create_user(username='auditor', password='secret')
+        cls.auditor.groups.add(cls.auditors)
+        cls.applicant = User.objects.create_user(
+            username='applicant', password='secret')
+
+        cls.approve = Action.objects.create(name='Approve')
+        cls.approve.groups.add(cls.reviewers)
+        cls.parallel_step = ApprovalStep.objects.create(
+            group=cls.reviewers, required_approvals=2)
+        for group in (cls.reviewers, cls.auditors):
+            ParallelApprovalGroup.objects.create(
+                approval_step=cls.parallel_step, group=group)
+        ActionStep.objects.create(approval_step=cls.parallel_step, action=cls.approve)
+
+    def create_cases(self, count):
+        """``count`` cases in each of the employee's inbox categories, each with
+        a note."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(count):
+                assigned = Case.objects.create(
+                    applicant=self.applicant, assigned_emp=self.employee,
+                    assigned_group=self.reviewers,
+                    current_approval_step=self.parallel_step)
+                pending = Case.objects.create(
+                    applicant=self.applicant, assigned_group=self.reviewers,
+                    current_approval_step=self.parallel_step)
+                approved = Case.objects.create(
+                    applicant=self.applicant, assigned_group=self.reviewers,
+                    current_approval_step=self.parallel_step)
+                available = Case.objects.create(
+                    applicant=self.applicant, assigned_group=self.reviewers)
+
+                for case, approvers in ((pending, [self.auditor]),
+                                        (approved, [self.auditor, self.employee])):
+                    for approver in approvers:
+                        ApprovalRecord.objects.create(
+                            case=case, approved_by=approver,
+                            approval_step=self.parallel_step, action_taken=self.approve)
+                for case in (assigned, pending, approved, available):
+                    Note.objects.create(
+                        case=case, author=self.applicant, content='Documents attached')
+
+    def get_inbox(self):
+        request = APIRequestFactory().get('/case/cases/employee/', {'page_size': 100})
+        force_authenticate(request, user=self.employee)
+        response = EmployeeCasesView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_is_independent_of_case_count(self):
+        self.create_cases(3)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_inbox()
+        self.assertEqual(response.data['my_cases']['total_count'], 9)
+
+        self.create_cases(6)
+        with self.assertNumQueries(len(queries)):
+            response = self.get_inbox()
+
+        categories = response.data['my_cases']['categories']
+        for category in ('assigned_to_me', 'pending_my_approval', 'already_approved'):
+            self.assertEqual(len(categories[category]['results']), 9)
+        self.assertEqual(len(response.data['available_cases']['results']), 9)
+
+
+class ConcurrentCaseSerialTests(TransactionTestCase):
+    """Cases created from many threads at once never share a serial number."""
+    threads = 8
+    per_thread = 10
+
+    def create_case(self, applicant):
+        while True:
+            try:
+                return Case.objects.create(applicant=applicant)
+            except OperationalError:
+                # SQLite reports a locked table instead of waiting for it;
+                # the whole creation rolled back, serial included.
+                if connection.vendor != 'sqlite':
+                    raise
+                time.sleep(0.01)
+
+    def test_serial_numbers_are_unique(self):
+        applicant = get_user_model().objects.create_user(
+            username='applicant', password='secret')
+
+        def worker(_):
+            try:
+                return [self.create_case(applicant).serial_number
+                        for _ in range(self.per_thread)]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            chunks = executor.map(worker, range(self.threads))
+            serials = [serial for chunk in chunks for serial in chunk]
+
+        expected = self.threads * self.per_thread
+        self.assertEqual(len(serials), expected)
+        self.assertEqual(len(set(serials)), expected)
+        self.assertEqual(
+            sorted(Case.objects.values_list('serial_number', flat=True)),
+            [format_serial_number(value) for value in range(1, expected + 1)])
+
+
+class CaseInboxSyncTests(TestCase):
+    """A case's inbox entries are rebuilt when it moves, and only then."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.applicant = User.objects.create_user(username='applicant')
+        cls.first = User.objects.create_user(username='first')
+        cls.second = User.objects.create_user(username='second')
+
+    def assigned_users(self, case):
+        entries = CaseInboxEntry.objects.filter(
+            case=case, category=CaseInboxEntry.ASSIGNED_TO_ME)
+        return list(entries.values_list('user', flat=True))
+
+    def test_reassigning_rebuilds_entries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            case = Case.objects.create(
+                applicant=self.applicant, assigned_emp=self.first)
+        self.assertEqual(self.assigned_users(case), [self.first.pk])
+
+        case = Case.objects.get(pk=case.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            case.assigned_emp = self.second
+            case.save()
+        self.assertEqual(self.assigned_users(case), [self.second.pk])
+
+    def test_data_only_save_skips_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            case = Case.objects.create(
+                applicant=self.applicant, assigned_emp=self.first)
+
+        case = Case.objects.get(pk=case.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            case.case_data = {'name': 'Updated'}
+            case.updated_by = self.applicant
+            case.save()
+        self.assertEqual(callbacks, [])
+
+
+class CaseDocumentStoreTests(TestCase):
+    """Stored content is deleted with the last document that uses it."""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, content=b'passport scan', name='passport.pdf'):
+        return create_document(ContentFile(content, name=name))
+
+    def test_shared_content_outlives_one_document(self):
+        first, second = self.upload(), self.upload()
+        self.assertEqual(first.storage_path, second.storage_path)
+
+        delete_document(first)
+        self.assertTrue(default_storage.exists(second.storage_path))
+        delete_document(second)
+        self.assertFalse(default_storage.exists(second.storage_path))
+
+    def test_rolled_back_document_content_is_deleted(self):
+        kept = self.upload(b'kept')
+        documents = []
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            documents.append(self.upload(b'rolled back'))
+            documents.append(self.upload(b'kept'))
+            raise RuntimeError
+
+        delete_unreferenced_content(document.sha256 for document in documents)
+        self.assertFalse(default_storage.exists(documents[0].storage_path))
+        self.assertTrue(default_storage.exists(kept.storage_path))
+
+    def test_replacing_legacy_upload_deletes_its_file(self):
+        document_types = Lookup.objects.create(
+            name='Document Type', type=Lookup.LookupTypeChoices.LOOKUP)
+        Lookup.objects.create(parent_lookup=document_types, name='Passport', code='01')
+        owner = get_user_model().objects.create_user('owner')
+        case = Case.objects.create(applicant=owner)
+        legacy_path = default_storage.save(
+            'uploads/01_000001-old.pdf', ContentFile(b'old'))
+        case_data = {'uploaded_files': [
+            {'file_url': default_storage.url(legacy_path), 'type': 'Passport'},
+        ]}
+
+        CaseSerializer().update_file_entries_handler(
+            [ContentFile(b'new', name='new.pdf')], ['01'], case, case_data)
+
+        self.assertFalse(default_storage.exists(legacy_path))
+        self.assertEqual(len(case_data['uploaded_files']), 1)
+        self.assertIn('document_id', case_data['uploaded_files'][0])
+
+
+class ExpressionEvaluatorTests(TestCase):
+    """Compiled expressions are parsed once and behave like the tree walker."""
+    item = {'amount': 1500, 'status': 'active', 'category': 'cat-2', 'owner': None}
+    context = {'allowed_categories': ['cat-1', 'cat-2'], 'status': 'closed'}
+
+    # Results of the per-call ast.parse evaluator, on {**item, **context}
+    expected = {
+        "amount > 1000 and status == 'closed'": True,
+        "category in allowed_categories or amount < 10": True,
+        "not owner and category not in allowed_categories": False,
+        "owner == None": True,
+        "100 < amount < 200": True,  # each step compares to the left-most value
+        "True and (False or amount != 1500)": False,
+    }
+
+    def setUp(self):
+        compile_expression.cache_clear()
+
+    def test_results_match_previous_evaluator(self):
+        merged = {**self.item, **self.context}
+        for expression, result in self.expected.items():
+            with self.subTest(expression=expression):
+                self.assertIs(eval_expression(expression, merged), result)
+                self.assertIs(
+                    eval_expression(expression, self.context, self.item), result)
+
+    def test_invalid_expressions_still_raise(self):
+        for expression in ("amount + 1", "__import__('os')", "missing > 1", "amount >"):
+            with self.subTest(expression=expression):
+                with self.assertRaises(UnsafeExpressionError):
+                    eval_expression(expression, self.item)
+
+    def test_expression_is_parsed_once(self):
+        parse = mock.patch.object(
+            expression_evaluator.ast, 'parse', wraps=expression_evaluator.ast.parse)
+        with parse as parse:
+            for amount in range(100):
+                eval_expression("amount > 50", {'amount': amount})
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(compile_expression.cache_info().hits, 99)
+
+
+@override_settings(CASE_MAPPER_CHUNK_SIZE=2)
+class MapperRunResumeTests(TestCase):
+    """A failed mapper run picks up after its last committed chunk."""
+
+    def setUp(self):
+        applicant = get_user_model().objects.create_user(username='applicant')
+        self.case = Case.objects.create(
+            applicant=applicant, case_data={'notes': [{'n': n} for n in range(5)]})
+        mapper = CaseMapper.objects.create(name='Notes', case_type='Permit')
+        self.target = MapperTarget.objects.create(
+            case_mapper=mapper, content_type=ContentType.objects.get_for_model(Note),
+            root_path='notes')
+        self.mapped = []
+
+    def processor(self, fail_at=None):
+        def process(case, target, found_object, item_slice):
+            if item_slice.start == fail_at:
+                raise RuntimeError('Upstream unavailable')
+            self.mapped.append((item_slice.start, item_slice.stop))
+            return []
+        return mock.patch('case.utils.mapper_runs.default_processor',
+                          return_value=process)
+
+    def test_resumed_run_skips_committed_chunks(self):
+        with self.captureOnCommitCallbacks():
+            header = start_mapper_run(self.case, self.target)
+
+        with self.processor(fail_at=2), self.assertRaises(RuntimeError):
+            run_mapper(header.run_id)
+        header.refresh_from_db()
+        self.assertEqual(header.status, MapperExecutionLog.RUN_FAILED)
+        self.assertEqual(header.result_data['completed_chunks'], 1)
+
+        with self.processor():
+            run_mapper(header.run_id)
+        header.refresh_from_db()
+        self.assertEqual(header.status, MapperExecutionLog.RUN_COMPLETED)
+        self.assertEqual(header.result_data['completed_chunks'], 3)
+        self.assertEqual(self.mapped, [(0, 2), (2, 4), (4, 5)])
@@ -5,7 +5,8 @@ from case.apis.views import (CaseViewSet, SubmitApplication,
                              ApprovalFlowActionCaseView, UserCaseActionsView, RunMapperAPIView, DryRunMapperAPIView,
                              MapperExecutionLogListAPIView, MapperExecutionLogDetailAPIView, CaseMapperViewSet,
                              MapperTargetViewSet, MapperFieldRuleViewSet, NoteViewSet, TriggerFieldAPIView,
-                             FieldIntegrationsListView, ApplicantActionView)
+                             FieldIntegrationsListView, ApplicantActionView, MapperRunAPIView,
+                             MapperRunStatusAPIView)
 from case.apps import CaseConfig
 
 app_name = CaseConfig.name
@@ -43,6 +44,8 @@ urlpatterns += router.urls
 urlpatterns += [
     path('api/mapper/run/', RunMapperAPIView.as_view(), name='run-mapper'),
     path('api/mapper/dry-run/', DryRunMapperAPIView.as_view(), name='dry-run-mapper'),
+    path('api/mapper/runs/', MapperRunAPIView.as_view(), name='mapper-run'),
+    path('api/mapper/runs/<uuid:run_id>/', MapperRunStatusAPIView.as_view(), name='mapper-run-status'),
     path('api/mapper/logs/', MapperExecutionLogListAPIView.as_view(), name='mapper-log-list'),
     path('api/mapper/logs/<int:pk>/', MapperExecutionLogDetailAPIView.as_view(), name='mapper-log-detail'),
 ]
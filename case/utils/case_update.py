@@ -0,0 +1,109 @@
+"""
+The stages of a case update after validation.
+
+``CaseSerializer.validate`` compiles the service flow and validates the
+merged data once; the update then only diffs ``case_data`` against what was
+stored, runs the integrations of the fields whose values changed, and saves.
+Each stage's duration is recorded in ``case_update_stage_duration_seconds``.
+"""
+import copy
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from prometheus_client import Histogram
+
+from dynamicflow.services.api_trigger_service import APITriggerService
+from integration.models import FieldIntegration
+
+logger = logging.getLogger(__name__)
+
+CASE_UPDATE_STAGE_DURATION = Histogram(
+    "case_update_stage_duration_seconds",
+    "Time spent in each stage of a case update.",
+    ["stage"],
+)
+
+INTEGRATION_EVENTS = ('pre_save', 'on_change', 'post_save')
+
+_MISSING = object()
+
+
+def changed_keys(old_data, new_data):
+    """Top-level keys whose value was added, removed or changed."""
+    return {
+        key for key in old_data.keys() | new_data.keys()
+        if old_data.get(key, _MISSING) != new_data.get(key, _MISSING)
+    }
+
+
+class CaseUpdatePipeline:
+    def __init__(self, instance):
+        self.instance = instance
+        self.old_case_data = copy.deepcopy(instance.case_data or {})
+        self.timings = {}
+        self._integrations = None
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = elapsed
+            CASE_UPDATE_STAGE_DURATION.labels(stage=name).observe(elapsed)
+
+    def load_integrations(self, case_data):
+        """
+        Fetch, in one query, the active integrations of the fields that
+        changed, grouped as {event: [(field, [field_integration, ...]), ...]}.
+        """
+        changed = changed_keys(self.old_case_data, case_data)
+        self._integrations = defaultdict(dict)
+        if not changed:
+            return self._integrations
+
+        field_integrations = FieldIntegration.objects.filter(
+            field___field_name__in=changed,
+            trigger_event__in=INTEGRATION_EVENTS,
+            active=True,
+        ).select_related('field', 'integration').order_by('order', 'id')
+
+        for field_integration in field_integrations:
+            by_field = self._integrations[field_integration.trigger_event]
+            by_field.setdefault(field_integration.field_id, (field_integration.field, []))[1].append(
+                field_integration)
+        return self._integrations
+
+    def _for_event(self, event):
+        return (self._integrations or {}).get(event, {}).values()
+
+    def run(self, event, case_data):
+        """Run the ``pre_save`` or ``on_change`` integrations of the changed fields."""
+        for field, integrations in self._for_event(event):
+            APITriggerService.trigger_api_calls(
+                field=field,
+                event=event,
+                case_data=case_data,
+                instance=self.instance,
+                old_case_data=self.old_case_data,
+                integrations=integrations,
+            )
+
+    def dispatch_post_save(self, case_data):
+        """Queue every ``post_save`` integration of the changed fields as one Celery task."""
+        calls = []
+        for field, integrations in self._for_event('post_save'):
+            field_value = case_data.get(field._field_name)
+            for field_integration in integrations:
+                if not field_integration.should_execute(field_value, case_data):
+                    logger.info(f"Skipping integration {field_integration} due to condition")
+                    continue
+                calls.append((field_integration, APITriggerService._build_request_data(
+                    *field_integration.prepare_request_data(case_data, field_value)
+                )))
+        if calls:
+            APITriggerService.schedule_integration_batch(calls, self.instance.id, case_data, event='post_save')
+        return len(calls)
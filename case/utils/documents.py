@@ -0,0 +1,170 @@
+"""
+Content-addressed storage for case documents.
+
+Each upload is written once, under ``documents/<aa>/<bb>/<sha256>``. On local
+filesystem storage the chunks are hashed while they are streamed to a temp
+file next to the final location, which is then renamed into place; other
+storages hash the upload first and save it once. Content that is already
+stored is not written again, whichever case it came from.
+
+Content is deleted with the last document that uses it. Creating and
+deleting documents of the same content lock that content's rows, so a
+delete never removes content a concurrent upload has just found in place.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from urllib.parse import unquote
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from case.models import CaseDocument
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS_ROOT = 'documents'
+# Where uploads were saved, one file per upload, before the document store
+LEGACY_UPLOADS_ROOT = 'uploads'
+
+
+def content_path(sha256):
+    return os.path.join(DOCUMENTS_ROOT, sha256[:2], sha256[2:4], sha256)
+
+
+def _local_root(storage):
+    try:
+        return storage.path(DOCUMENTS_ROOT)
+    except NotImplementedError:
+        return None
+
+
+def lock_content(sha256):
+    """
+    Lock the documents of ``sha256`` until the transaction ends; returns
+    their ids. Must be called inside ``transaction.atomic``.
+    """
+    return list(CaseDocument.objects.select_for_update().filter(
+        sha256=sha256).values_list('id', flat=True))
+
+
+def _store_local(file_obj, storage):
+    """Stream ``file_obj`` to disk while hashing it; rename into its content path."""
+    root = _local_root(storage)
+    os.makedirs(root, exist_ok=True)
+    hasher = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=root, prefix='.upload-', delete=False) as tmp:
+        try:
+            for chunk in file_obj.chunks():
+                hasher.update(chunk)
+                size += len(chunk)
+                tmp.write(chunk)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+
+    sha256 = hasher.hexdigest()
+    lock_content(sha256)
+    path = content_path(sha256)
+    final_path = storage.path(path)
+    if os.path.exists(final_path):
+        os.unlink(tmp.name)
+    else:
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, final_path)
+    return sha256, size, path
+
+
+def _store_remote(file_obj, storage):
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in file_obj.chunks():
+        hasher.update(chunk)
+        size += len(chunk)
+    file_obj.seek(0)
+
+    sha256 = hasher.hexdigest()
+    lock_content(sha256)
+    path = content_path(sha256)
+    if not storage.exists(path):
+        path = storage.save(path, file_obj)
+    return sha256, size, path
+
+
+def store_content(file_obj, storage=None):
+    """
+    Store the upload's bytes once; returns (sha256, size, storage path).
+    Must be called inside ``transaction.atomic``; the content stays locked
+    against deletion until the transaction ends.
+    """
+    storage = storage or default_storage
+    if _local_root(storage):
+        return _store_local(file_obj, storage)
+    return _store_remote(file_obj, storage)
+
+
+def create_document(file_obj, document_type=None, case=None, uploaded_by=None):
+    with transaction.atomic():
+        sha256, size, path = store_content(file_obj)
+        return CaseDocument.objects.create(
+            case=case,
+            document_type=document_type,
+            sha256=sha256,
+            size=size,
+            storage_path=path,
+            original_name=os.path.basename(file_obj.name),
+            content_type=getattr(file_obj, 'content_type', '') or '',
+            uploaded_by=uploaded_by,
+        )
+
+
+def document_entry(document):
+    """The ``case_data['uploaded_files']`` entry of a document."""
+    return {
+        'document_id': str(document.id),
+        'file_url': default_storage.url(document.storage_path),
+        'name': document.original_name,
+        'type': document.document_type.name if document.document_type else None,
+    }
+
+
+def delete_document(document):
+    """Delete the document, and its content once no other document uses it."""
+    with transaction.atomic():
+        # The content goes while its rows are locked: an upload of the same
+        # content waits for this transaction, then finds it gone and writes
+        # it again.
+        others = set(lock_content(document.sha256)) - {document.id}
+        document.delete()
+        if not others:
+            default_storage.delete(document.storage_path)
+
+
+def delete_unreferenced_content(sha256s):
+    """
+    Delete stored content that no document uses, e.g. left behind by
+    documents whose transaction rolled back.
+    """
+    for sha256 in set(sha256s):
+        with transaction.atomic():
+            if not lock_content(sha256):
+                default_storage.delete(content_path(sha256))
+
+
+def delete_legacy_upload(entry):
+    """
+    Delete the file of an ``uploaded_files`` entry saved before the document
+    store, which has a ``file_url`` under ``uploads/`` but no document id.
+    """
+    name = unquote(os.path.basename(entry.get('file_url') or ''))
+    if not name:
+        return
+    path = os.path.join(LEGACY_UPLOADS_ROOT, name)
+    try:
+        if default_storage.exists(path):
+            default_storage.delete(path)
+    except Exception as e:
+        logger.error(f"Error deleting file {path}: {e}")
@@ -2,6 +2,7 @@
 
 import ast
 import operator
+from functools import lru_cache
 
 SAFE_OPERATORS = {
     ast.Eq: operator.eq,
@@ -18,61 +19,99 @@ SAFE_OPERATORS = {
 
 ALLOWED_NAMES = {"True": True, "False": False, "None": None}
 
+# Distinct expressions kept compiled (mapper rules, integration conditions)
+EXPRESSION_CACHE_SIZE = 1024
+
+_MISSING = object()
+
+
 class UnsafeExpressionError(Exception):
     pass
 
-def eval_expression(expression: str, variables: dict) -> bool:
+
+def eval_expression(expression: str, *scopes: dict) -> bool:
     """
     Safely evaluates a logical expression using predefined variables.
 
+    Names are looked up in ``scopes`` in order, so
+    ``eval_expression(expr, context, item)`` sees the same values as
+    ``eval_expression(expr, {**item, **context})`` without building the dict.
+
     Example:
         expr = "income > 10000 and age < 30"
         vars = {"income": 15000, "age": 25}
         result = eval_expression(expr, vars)  # True
     """
+    return compile_expression(expression)(*scopes)
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expression: str):
+    """
+    Parse and validate ``expression`` once into a callable taking the
+    variable scopes. Compiled expressions are cached by their text.
+    """
     try:
-        tree = ast.parse(expression, mode='eval')
-        return _eval_ast(tree.body, variables)
+        evaluate = _compile(ast.parse(expression, mode='eval').body)
     except Exception as e:
         raise UnsafeExpressionError(f"Invalid expression: {expression}. Error: {e}")
 
-def _eval_ast(node, variables):
+    def compiled(*scopes):
+        try:
+            return evaluate(scopes)
+        except Exception as e:
+            raise UnsafeExpressionError(f"Invalid expression: {expression}. Error: {e}")
+
+    return compiled
+
+
+def _compile(node):
+    """Turn a whitelisted AST node into a closure evaluating it against a tuple of scopes."""
     if isinstance(node, ast.BoolOp):
-        values = [_eval_ast(value, variables) for value in node.values]
         op_func = SAFE_OPERATORS.get(type(node.op))
         if not op_func:
             raise UnsafeExpressionError(f"Unsupported boolean operator: {ast.dump(node.op)}")
-        return op_func(values)
+        values = [_compile(value) for value in node.values]
+        # Every operand is evaluated, as before, so unknown names always raise
+        return lambda scopes: op_func([value(scopes) for value in values])
 
     elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
-        return not _eval_ast(node.operand, variables)
+        operand = _compile(node.operand)
+        return lambda scopes: not operand(scopes)
 
     elif isinstance(node, ast.Compare):
-        left = _eval_ast(node.left, variables)
+        left = _compile(node.left)
+        comparisons = []
         for op, comparator in zip(node.ops, node.comparators):
-            right = _eval_ast(comparator, variables)
             op_func = SAFE_OPERATORS.get(type(op))
             if not op_func:
                 raise UnsafeExpressionError(f"Unsupported comparison: {ast.dump(op)}")
-            if not op_func(left, right):
-                return False
-        return True
+            comparisons.append((op_func, _compile(comparator)))
 
-    elif isinstance(node, ast.Name):
-        if node.id in variables:
-            return variables[node.id]
-        if node.id in ALLOWED_NAMES:
-            return ALLOWED_NAMES[node.id]
-        raise UnsafeExpressionError(f"Access to unknown variable '{node.id}'.")
+        def compare(scopes):
+            left_value = left(scopes)
+            for op_func, comparator in comparisons:
+                if not op_func(left_value, comparator(scopes)):
+                    return False
+            return True
+        return compare
 
-    elif isinstance(node, ast.Constant):  # Python 3.8+
-        return node.value
+    elif isinstance(node, ast.Name):
+        name = node.id
+        default = ALLOWED_NAMES.get(name, _MISSING)
 
-    elif isinstance(node, ast.Str):  # Python < 3.8
-        return node.s
+        def resolve(scopes):
+            for scope in scopes:
+                if name in scope:
+                    return scope[name]
+            if default is not _MISSING:
+                return default
+            raise UnsafeExpressionError(f"Access to unknown variable '{name}'.")
+        return resolve
 
-    elif isinstance(node, ast.Num):  # Python < 3.8
-        return node.n
+    elif isinstance(node, ast.Constant):
+        value = node.value
+        return lambda scopes: value
 
     else:
         raise UnsafeExpressionError(f"Unsupported node: {ast.dump(node)}")
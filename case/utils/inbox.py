@@ -0,0 +1,365 @@
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.pagination import CursorPagination
+
+from case.models import ApprovalRecord, Case, CaseInboxEntry, Note
+from conditional_approval.apis.serializers import ActionBasicSerializer
+from conditional_approval.models import ActionStep, ApprovalStep, ParallelApprovalGroup
+
+
+class InboxCursorPagination(CursorPagination):
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+class EmployeeInbox:
+    """
+    The cases an employee can see, split into inbox categories.
+
+    Each category is read from the ``CaseInboxEntry`` projection and every
+    relation used while serializing is prefetched, so building a page costs
+    a fixed number of queries regardless of how many cases it holds.
+    """
+    MY_CASE_CATEGORIES = ('assigned_to_me', 'pending_my_approval', 'already_approved')
+    CATEGORIES = MY_CASE_CATEGORIES + ('available_cases',)
+
+    def __init__(self, user):
+        self.user = user
+        self.group_ids = set(user.groups.values_list('id', flat=True))
+
+    # Querysets
+
+    def get_queryset(self, category):
+        def entries(entry_category, **lookup):
+            return CaseInboxEntry.objects.filter(
+                category=entry_category, **lookup).values('case_id')
+
+        groups = self.group_ids
+        pending = entries(CaseInboxEntry.PENDING_MY_APPROVAL, group_id__in=groups)
+        approved = entries(CaseInboxEntry.ALREADY_APPROVED, user=self.user)
+
+        if category == 'assigned_to_me':
+            queryset = Case.objects.filter(
+                id__in=entries(CaseInboxEntry.ASSIGNED_TO_ME, user=self.user))
+        elif category == 'pending_my_approval':
+            queryset = Case.objects.filter(id__in=pending).exclude(id__in=approved)
+        elif category == 'already_approved':
+            queryset = Case.objects.filter(id__in=pending).filter(id__in=approved)
+        elif category == 'available_cases':
+            queryset = Case.objects.filter(
+                id__in=entries(CaseInboxEntry.AVAILABLE_CASES, group_id__in=groups),
+            ).exclude(
+                id__in=entries(CaseInboxEntry.PRIORITY_APPROVER, group_id__in=groups),
+            )
+            return queryset.prefetch_related(self._notes_prefetch())
+        else:
+            raise ValueError(f"Unknown inbox category: {category}")
+
+        parallel_groups = ParallelApprovalGroup.objects.select_related(
+            'group').order_by('id')
+        return queryset.select_related(
+            'assigned_group', 'current_approval_step',
+        ).prefetch_related(
+            self._notes_prefetch(),
+            Prefetch(
+                'approval_records',
+                queryset=ApprovalRecord.objects.select_related(
+                    'approved_by', 'action_taken',
+                    'approval_step__status', 'approval_step__group',
+                ).prefetch_related(
+                    Prefetch('approval_step__parallel_approval_groups',
+                             queryset=parallel_groups),
+                ).order_by('-approved_at'),
+            ),
+            Prefetch('current_approval_step__parallel_approval_groups',
+                     queryset=parallel_groups),
+            Prefetch(
+                'current_approval_step__actions',
+                queryset=ActionStep.objects.filter(
+                    active_ind=True, action__active_ind=True,
+                ).select_related('action').prefetch_related('action__groups'),
+            ),
+        )
+
+    def _notes_prefetch(self):
+        return Prefetch('notes', queryset=Note.objects.select_related(
+            'author', 'created_by', 'updated_by', 'related_approval_record'))
+
+    # Serialization
+
+    def load_approver_groups(self, cases):
+        """Group ids of every approver on the given cases, in one query."""
+        approver_ids = {
+            record.approved_by_id
+            for case in cases for record in case.approval_records.all()
+        }
+        memberships = get_user_model().objects.filter(
+            id__in=approver_ids, groups__isnull=False
+        ).values_list('id', 'groups')
+
+        self.approver_groups = defaultdict(set)
+        for user_id, group_id in memberships:
+            self.approver_groups[user_id].add(group_id)
+
+    def serialize_cases(self, cases):
+        from case.apis.serializers import CaseSerializer
+
+        self.load_approver_groups(cases)
+        return [self.serialize_case(case, CaseSerializer(case).data) for case in cases]
+
+    def serialize_case(self, case, case_data):
+        """
+        Add available actions, approval info and approval history to the
+        serialized case, using only prefetched relations.
+        """
+        user = self.user
+        case_data["available_actions"] = []
+        case_data["approval_info"] = None
+        case_data["approval_history"] = []
+
+        # Group historical approvals by approval step
+        approval_history_by_step = {}
+        for record in case.approval_records.all():
+            step = record.approval_step
+            step_data = approval_history_by_step.get(step.id)
+            if step_data is None:
+                parallel_groups = step.parallel_approval_groups.all()
+                step_data = approval_history_by_step[step.id] = {
+                    'approval_step': {
+                        'id': step.id,
+                        'status': step.status.name if step.status else None,
+                        'group': step.group.name if step.group else None,
+                        'step_type': (step.get_step_type_display()
+                                      if step.step_type else None),
+                        'type': 'parallel' if parallel_groups else 'sequential',
+                    },
+                    'approvals': []
+                }
+                if parallel_groups:
+                    step_data['approval_step']['required_approvals'] = (
+                        step.required_approvals)
+
+            approver = record.approved_by
+            step_data['approvals'].append({
+                'approved_by': approver.get_full_name() or approver.username,
+                'approved_at': record.approved_at,
+                'action_taken': (record.action_taken.name
+                                 if record.action_taken else 'Unknown'),
+                'department': self._department(
+                    record, step.parallel_approval_groups.all()),
+            })
+        case_data["approval_history"] = list(approval_history_by_step.values())
+
+        approval_step = case.current_approval_step
+        if not approval_step:
+            return case_data
+
+        parallel_groups = approval_step.parallel_approval_groups.all()
+        if parallel_groups and approval_step.required_approvals:
+            approval_records = [
+                record for record in case.approval_records.all()
+                if record.approval_step_id == approval_step.id
+            ]
+            user_approved = any(
+                record.approved_by_id == user.id for record in approval_records)
+
+            approvers = []
+            approved_groups = set()
+            for record in approval_records:
+                approver_groups = self.approver_groups[record.approved_by_id]
+                approver = record.approved_by
+                approver_info = {
+                    'user': approver.get_full_name() or approver.username,
+                    'approved_at': record.approved_at,
+                    'department': None
+                }
+
+                # Find which group this approver represents
+                for pg in parallel_groups:
+                    if pg.group_id in approver_groups:
+                        approver_info['department'] = pg.group.name
+                        approved_groups.add(pg.group_id)
+                        break
+
+                if (not approver_info['department']
+                        and case.assigned_group_id in approver_groups):
+                    approver_info['department'] = case.assigned_group.name
+                    approved_groups.add(case.assigned_group_id)
+
+                approvers.append(approver_info)
+
+            remaining = max(0, approval_step.required_approvals - len(approved_groups))
+            case_data["approval_info"] = {
+                "type": "parallel",
+                "required_approvals": approval_step.required_approvals,
+                "current_approvals": len(approved_groups),
+                "remaining_approvals": remaining,
+                "user_has_approved": user_approved,
+                "can_approve": not user_approved,
+                "approvers": approvers,
+                "pending_groups": [
+                    {"id": pg.group_id, "name": pg.group.name}
+                    for pg in parallel_groups
+                    if pg.group_id not in approved_groups
+                ]
+            }
+        else:
+            # Regular sequential approval
+            case_data["approval_info"] = {
+                "type": "sequential",
+                "can_approve": (
+                    case.assigned_emp_id == user.id
+                    or (case.assigned_emp_id is None
+                        and case.assigned_group_id in self.group_ids)
+                ),
+            }
+
+        allowed_actions = []
+        if case_data["approval_info"]["can_approve"]:
+            for step in approval_step.actions.all():
+                action = step.action
+                if not action:
+                    continue
+                action_group_ids = {group.id for group in action.groups.all()}
+                if not action_group_ids or action_group_ids & self.group_ids:
+                    allowed_actions.append(action)
+
+        case_data["available_actions"] = ActionBasicSerializer(
+            allowed_actions, many=True).data
+
+        # Add UI hints for better UX
+        approval_info = case_data["approval_info"]
+        if approval_info["type"] == "parallel":
+            if approval_info["user_has_approved"]:
+                case_data["ui_status"] = "You have approved this case"
+                case_data["ui_status_color"] = "green"
+            elif approval_info["remaining_approvals"] > 0:
+                remaining = approval_info["remaining_approvals"]
+                case_data["ui_status"] = f"Awaiting {remaining} more approval(s)"
+                case_data["ui_status_color"] = "orange"
+            else:
+                case_data["ui_status"] = "All approvals received"
+                case_data["ui_status_color"] = "green"
+
+        return case_data
+
+    def _department(self, record, parallel_groups):
+        approver_groups = self.approver_groups[record.approved_by_id]
+        for pg in parallel_groups:
+            if pg.group_id in approver_groups:
+                return pg.group.name
+        return None
+
+
+# Inbox projection
+
+def build_inbox_entries(case, parallel_group_ids, priority_group_ids, approver_ids):
+    """
+    The ``CaseInboxEntry`` rows for ``case`` given the groups of its current
+    approval step and the users who already acted on that step.
+    """
+    if case.assigned_emp_id:
+        return [CaseInboxEntry(case=case, user_id=case.assigned_emp_id,
+                               category=CaseInboxEntry.ASSIGNED_TO_ME)]
+
+    entries = []
+    if parallel_group_ids:
+        for group_id in set(parallel_group_ids) | set(priority_group_ids):
+            entries.append(CaseInboxEntry(case=case, group_id=group_id,
+                                          category=CaseInboxEntry.PENDING_MY_APPROVAL))
+        for user_id in set(approver_ids):
+            entries.append(CaseInboxEntry(case=case, user_id=user_id, can_act=False,
+                                          category=CaseInboxEntry.ALREADY_APPROVED))
+    else:
+        if case.assigned_group_id:
+            entries.append(CaseInboxEntry(case=case, group_id=case.assigned_group_id,
+                                          category=CaseInboxEntry.AVAILABLE_CASES))
+        # Priority approvers act from their own queue, not "available cases".
+        for group_id in set(priority_group_ids):
+            entries.append(CaseInboxEntry(case=case, group_id=group_id,
+                                          category=CaseInboxEntry.PRIORITY_APPROVER))
+    return entries
+
+
+def _step_groups(step_ids):
+    """Parallel and priority group ids per approval step."""
+    parallel_groups = defaultdict(set)
+    priority_groups = defaultdict(set)
+    if step_ids:
+        parallel = ParallelApprovalGroup.objects.filter(
+            approval_step_id__in=step_ids).values_list('approval_step_id', 'group_id')
+        for step_id, group_id in parallel:
+            parallel_groups[step_id].add(group_id)
+        priority = ApprovalStep.priority_approver_groups.through.objects.filter(
+            approvalstep_id__in=step_ids).values_list('approvalstep_id', 'group_id')
+        for step_id, group_id in priority:
+            priority_groups[step_id].add(group_id)
+    return parallel_groups, priority_groups
+
+
+def _current_step_approvers(cases):
+    """Users who already acted on each case's current approval step."""
+    approvers = defaultdict(set)
+    step_by_case = {case.id: case.current_approval_step_id for case in cases
+                    if case.current_approval_step_id}
+    if step_by_case:
+        records = ApprovalRecord.objects.filter(
+            case_id__in=step_by_case.keys(),
+            approval_step_id__in=set(step_by_case.values()),
+        ).values_list('case_id', 'approval_step_id', 'approved_by_id')
+        for case_id, step_id, user_id in records:
+            if step_by_case[case_id] == step_id:
+                approvers[case_id].add(user_id)
+    return approvers
+
+
+def _replace_inbox_entries(cases):
+    cases = list(cases)
+    parallel_groups, priority_groups = _step_groups({
+        case.current_approval_step_id for case in cases if case.current_approval_step_id
+    })
+    approvers = _current_step_approvers(cases)
+
+    entries = []
+    for case in cases:
+        step_id = case.current_approval_step_id
+        entries.extend(build_inbox_entries(
+            case, parallel_groups[step_id], priority_groups[step_id],
+            approvers[case.id]))
+
+    with transaction.atomic():
+        CaseInboxEntry.objects.filter(case__in=cases).delete()
+        CaseInboxEntry.objects.bulk_create(entries)
+    return len(entries)
+
+
+def sync_case_inbox(case):
+    """Rebuild the inbox entries of a single case after it changed."""
+    return _replace_inbox_entries([case])
+
+
+def rebuild_case_inbox(queryset=None, batch_size=500):
+    """
+    Rebuild the inbox entries of every case in ``queryset`` (all cases by
+    default), ``batch_size`` cases at a time. Returns (cases, entries).
+    """
+    if queryset is None:
+        queryset = Case.objects.all()
+    queryset = queryset.order_by('id')
+    case_count = entry_count = 0
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id).only(
+            'id', 'assigned_emp', 'assigned_group', 'current_approval_step',
+        )[:batch_size])
+        if not batch:
+            break
+        entry_count += _replace_inbox_entries(batch)
+        case_count += len(batch)
+        last_id = batch[-1].id
+    return case_count, entry_count
@@ -3,6 +3,7 @@
 import importlib
 from django.db import transaction
 from case.models import CaseMapper, MapperTarget
+from case.plugins.default_plugin import default_processor
 
 def execute_mappings(case):
     """
@@ -25,13 +26,11 @@ def execute_mappings(case):
             finder_func = load_function_by_path(
                 target.finder_function_path
             ) if target.finder_function_path else load_function_by_path(
-                "myapp.plugins.default_plugin.find_records"
+                "case.plugins.default_plugin.find_records"
             )
             processor_func = load_function_by_path(
                 target.processor_function_path
-            ) if target.processor_function_path else load_function_by_path(
-                "myapp.plugins.default_plugin.process_records"
-            )
+            ) if target.processor_function_path else default_processor(target)
 
             found_objects = finder_func(case, target)
             # Note that the default_plugin expects None or a single object,
@@ -54,7 +53,7 @@ def execute_mappings(case):
 def load_function_by_path(path_str):
     """
     Utility to dynamically load a function by dotted path.
-    E.g. "myapp.plugins.default_plugin.find_records"
+    E.g. "case.plugins.default_plugin.find_records"
     """
     if not path_str:
         return None
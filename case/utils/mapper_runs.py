@@ -0,0 +1,204 @@
+"""
+Chunked, resumable mapper runs.
+
+A run is a MapperExecutionLog header row (``run_id`` set, no ``chunk_start``)
+holding the run status and progress. The work is split per top-level
+target and, for list-based targets of the built-in processors, per slice of
+``CASE_MAPPER_CHUNK_SIZE`` items. Each chunk commits in its own transaction
+together with its chunk log row, so a retried or resumed run skips every
+chunk that was already committed.
+"""
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from case.models import CaseMapper, MapperExecutionLog
+from case.plugins.default_plugin import (
+    default_processor, extract_json_value, load_function_by_path
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_chunk_size():
+    return getattr(settings, 'CASE_MAPPER_CHUNK_SIZE', 200)
+
+
+def start_mapper_run(case, mapper_target=None):
+    """
+    Create a run for ``case`` (all active top-level targets of its mapper,
+    or only ``mapper_target``) and queue it once the transaction commits.
+    """
+    header = MapperExecutionLog.objects.create(
+        case=case,
+        mapper_target=mapper_target,
+        run_id=uuid.uuid4(),
+        status=MapperExecutionLog.RUN_PENDING,
+        result_data={'total_chunks': None, 'completed_chunks': 0},
+    )
+    queue_mapper_run(header.run_id)
+    return header
+
+
+def queue_mapper_run(run_id):
+    from case.tasks import run_mapper_task
+
+    transaction.on_commit(lambda: run_mapper_task.delay(str(run_id)))
+
+
+def get_run_header(run_id):
+    return MapperExecutionLog.objects.select_related('case', 'mapper_target').get(
+        run_id=run_id, chunk_start__isnull=True)
+
+
+def _run_targets(header):
+    if header.mapper_target_id:
+        return [header.mapper_target]
+    mapper = CaseMapper.objects.get(case_type=header.case.case_type, active_ind=True)
+    return list(
+        mapper.targets.filter(active_ind=True, parent_target__isnull=True)
+        .select_related('content_type', 'case_mapper').order_by('id')
+    )
+
+
+def _target_chunks(case, target):
+    """
+    [(chunk_start, chunk_end)] for ``target``. Custom processors and flat
+    targets are a single chunk with no end.
+    """
+    if not target.root_path or target.processor_function_path:
+        return [(0, None)]
+    data_list = extract_json_value(case.case_data, target.root_path)
+    if not isinstance(data_list, list):
+        raise ValueError(
+            f"Expected list at root_path '{target.root_path}', got: {type(data_list)}")
+    size = get_chunk_size()
+    return [
+        (start, min(start + size, len(data_list)))
+        for start in range(0, len(data_list), size)
+    ] or [(0, 0)]
+
+
+def _run_chunk(header, target, start, end, is_last):
+    """Map one chunk and record it; returns False if it had already been committed."""
+    case = header.case
+    chunk = dict(run_id=header.run_id, mapper_target=target, chunk_start=start)
+    try:
+        with transaction.atomic():
+            if MapperExecutionLog.objects.filter(**chunk).exists():
+                return False
+
+            if target.processor_function_path:
+                processor_func = load_function_by_path(target.processor_function_path)
+                finder_func = load_function_by_path(
+                    target.finder_function_path
+                    or "case.plugins.default_plugin.find_records")
+                updated = processor_func(case, target, finder_func(case, target))
+            elif end is None:
+                updated = default_processor(target)(case, target, None)
+            else:
+                updated = default_processor(target)(
+                    case, target, None, item_slice=slice(start, end))
+
+            if is_last and target.post_processor_path:
+                post_func = load_function_by_path(target.post_processor_path)
+                post_func(case=case, target=target, result=updated)
+
+            if isinstance(updated, list):
+                records = updated
+            else:
+                records = [updated] if updated is not None else []
+            MapperExecutionLog.objects.create(
+                case=case,
+                success=True,
+                status=MapperExecutionLog.RUN_COMPLETED,
+                chunk_end=end,
+                result_data={
+                    "target_model": str(target.content_type),
+                    "record_count": len(records),
+                    "objects": [
+                        str(getattr(record, 'pk', record)) for record in records
+                    ],
+                },
+                **chunk
+            )
+    except IntegrityError:
+        # Committed concurrently by another attempt of the same run
+        if MapperExecutionLog.objects.filter(**chunk).exists():
+            return False
+        raise
+    return True
+
+
+def _update_header(header, **fields):
+    for name, value in fields.items():
+        setattr(header, name, value)
+    MapperExecutionLog.objects.filter(pk=header.pk).update(**fields)
+
+
+def run_mapper(run_id):
+    """
+    Execute (or resume) a run. Chunks already committed for the run are
+    skipped; progress is written to the header after every chunk.
+    """
+    header = get_run_header(run_id)
+    if header.status == MapperExecutionLog.RUN_COMPLETED:
+        return header
+
+    _update_header(header, status=MapperExecutionLog.RUN_RUNNING,
+                   executed_at=timezone.now(), error_trace=None)
+    progress = dict(header.result_data or {})
+    try:
+        plan = [(target, _target_chunks(header.case, target))
+                for target in _run_targets(header)]
+        progress['total_chunks'] = sum(len(chunks) for _, chunks in plan)
+        progress['completed_chunks'] = MapperExecutionLog.objects.filter(
+            run_id=run_id, chunk_start__isnull=False).count()
+        _update_header(header, result_data=progress)
+
+        for target, chunks in plan:
+            for position, (start, end) in enumerate(chunks):
+                is_last = position == len(chunks) - 1
+                if _run_chunk(header, target, start, end, is_last=is_last):
+                    progress['completed_chunks'] += 1
+                    progress['current_target'] = str(target.id)
+                    _update_header(header, result_data=progress)
+    except Exception as e:
+        logger.exception(f"Mapper run {run_id} failed")
+        _update_header(header, status=MapperExecutionLog.RUN_FAILED,
+                       success=False, error_trace=str(e))
+        raise
+
+    _update_header(header, status=MapperExecutionLog.RUN_COMPLETED, success=True)
+    return header
+
+
+def run_status(header):
+    """The status payload polled by the UI."""
+    chunks = MapperExecutionLog.objects.filter(
+        run_id=header.run_id, chunk_start__isnull=False
+    ).order_by('executed_at', 'chunk_start')
+    return {
+        "run_id": str(header.run_id),
+        "case_id": header.case_id,
+        "mapper_target_id": (
+            str(header.mapper_target_id) if header.mapper_target_id else None),
+        "status": header.status,
+        "total_chunks": header.result_data.get('total_chunks'),
+        "completed_chunks": header.result_data.get('completed_chunks', 0),
+        "error": header.error_trace,
+        "started_at": header.executed_at,
+        "chunks": [
+            {
+                "mapper_target_id": str(chunk.mapper_target_id),
+                "chunk_start": chunk.chunk_start,
+                "chunk_end": chunk.chunk_end,
+                "record_count": chunk.result_data.get('record_count'),
+                "executed_at": chunk.executed_at,
+            }
+            for chunk in chunks
+        ],
+    }
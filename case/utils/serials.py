@@ -0,0 +1,94 @@
+"""
+Case serial number allocation.
+
+Serials come from a ``CaseSerialCounter`` row per scope. Each allocation is a
+single ``UPDATE ... SET last_value = last_value + n`` which takes the row lock
+until the surrounding transaction ends, so concurrent creations are
+serialized on that one row instead of racing on ``Max(serial_number)``.
+
+By default every case takes its number inside the transaction that inserts
+it, so a failed insert rolls the counter back and the sequence has no gaps.
+Setting ``CASE_SERIAL_BLOCK_SIZE`` above 1 lets each worker reserve a block of
+numbers at once; that trades gap-freeness (unused numbers of a block are lost
+when the process exits) for fewer round trips to the counter row.
+"""
+from contextlib import contextmanager
+from threading import Lock
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from case.models import Case, CaseSerialCounter
+
+CASE_SERIAL_SCOPE = "case"
+SERIAL_WIDTH = 6
+
+_blocks = {}
+_blocks_lock = Lock()
+
+
+def get_block_size():
+    return max(1, int(getattr(settings, "CASE_SERIAL_BLOCK_SIZE", 1)))
+
+
+def format_serial_number(value):
+    return str(value).zfill(SERIAL_WIDTH)
+
+
+def _initial_value(scope):
+    """Highest serial already issued, for seeding a missing counter row."""
+    if scope != CASE_SERIAL_SCOPE:
+        return 0
+    values = Case.objects.filter(serial_number__isnull=False).values_list("serial_number", flat=True)
+    return max((int(value) for value in values if value.isdigit()), default=0)
+
+
+def allocate_serial_numbers(count=1, scope=CASE_SERIAL_SCOPE):
+    """
+    Reserve ``count`` consecutive numbers of ``scope`` and return them as a
+    ``range``. Must run inside a transaction for the reservation to be
+    rolled back together with the caller's work.
+    """
+    with transaction.atomic():
+        updated = CaseSerialCounter.objects.filter(scope=scope).update(
+            last_value=F("last_value") + count)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    CaseSerialCounter.objects.create(
+                        scope=scope, last_value=_initial_value(scope) + count)
+            except IntegrityError:
+                # Another worker created the row first; take the lock on it.
+                CaseSerialCounter.objects.filter(scope=scope).update(
+                    last_value=F("last_value") + count)
+        last_value = CaseSerialCounter.objects.values_list(
+            "last_value", flat=True).get(scope=scope)
+    return range(last_value - count + 1, last_value + 1)
+
+
+def _next_from_block(scope):
+    with _blocks_lock:
+        value = next(_blocks.get(scope, iter(())), None)
+        if value is None:
+            # Committed on its own so other workers never see the same block.
+            with transaction.atomic(durable=True):
+                block = iter(allocate_serial_numbers(get_block_size(), scope))
+            _blocks[scope] = block
+            value = next(block)
+        return value
+
+
+@contextmanager
+def reserve_case_serial_number(scope=CASE_SERIAL_SCOPE):
+    """
+    Yield the next case serial number. Without block pre-allocation the
+    counter update and everything done inside the ``with`` block share one
+    transaction.
+    """
+    if get_block_size() > 1 and not transaction.get_connection().in_atomic_block:
+        yield format_serial_number(_next_from_block(scope))
+        return
+
+    with transaction.atomic():
+        yield format_serial_number(allocate_serial_numbers(1, scope)[0])
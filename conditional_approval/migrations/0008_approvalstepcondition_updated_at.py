@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-16 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conditional_approval', '0007_action_integration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='approvalstepcondition',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
@@ -3,6 +3,8 @@ from django.db.models import JSONField
 from django_utils.choices import Choices, Choice
 from django.utils.translation import gettext_lazy as _
 
+from utils.condition_engine import get_compiled_condition
+
 
 class Action(models.Model):
     name = models.CharField(max_length=50, null=True, blank=True)
@@ -174,6 +176,12 @@ class ApprovalStepCondition(models.Model):
     )
     active_ind = models.BooleanField(
         verbose_name='ACTIVE', null=True, blank=True, default=True)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
+
+    def get_compiled(self):
+        """Return this condition's logic compiled by the shared condition engine."""
+        key = ("conditional_approval.approvalstepcondition", self.pk, self.updated_at) if self.pk else None
+        return get_compiled_condition(self.condition_logic, key=key)
 
 
 class APICallCondition(models.Model):
@@ -11,6 +11,8 @@ from dynamicflow.models import Page
 from utils.constant_lists_variables import UserTypes
 from rest_framework import viewsets, status, filters
 from dynamicflow.utils.dynamicflow_helper import DynamicFlowHelper
+from dynamicflow.utils.flow_cache import get_flow_version
+from utils.conditional_get import conditional_get, make_etag
 from dynamicflow.models import FieldType, Page, Category, Field, Condition
 from dynamicflow.apis.serializers import (
     FieldTypeSerializer, PageListSerializer, PageDetailSerializer,
@@ -19,12 +21,19 @@ from dynamicflow.apis.serializers import (
     FieldWithSubFieldsSerializer, PageWithFieldsSerializer, BulkFieldUpdateSerializer
 )
 
+def flow_etag(request, *args, **kwargs):
+    # The flow doesn't depend on the user; it changes only when the flow
+    # version is bumped (dynamicflow.signals).
+    return make_etag(request, get_flow_version())
+
+
 class FlowAPIView(GenericAPIView):
     permission_classes = [AllowAny]
 
     queryset = Page.objects.all()
     http_method_names = ['get']
 
+    @conditional_get(flow_etag)
     def get(self, request, *args, **kwargs):
 
         _query = {}
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DynamicflowConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dynamicflow'
+
+    def ready(self):
+        import dynamicflow.signals  # noqa
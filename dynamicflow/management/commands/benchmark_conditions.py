@@ -0,0 +1,101 @@
+import re
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from utils.condition_engine import clear_compiled_conditions, get_compiled_condition
+
+CASE_DATA = {
+    "applicant_name": "Ahmad Khalil",
+    "national_id": "9871234567",
+    "email": "ahmad.khalil@example.com",
+    "marital_status": "married",
+    "no_of_children": 3,
+    "monthly_income": 850.0,
+    "monthly_expenses": 430.0,
+    "governorate": "amman",
+    "has_disability": False,
+}
+
+CONDITIONS = [
+    [{"field": "marital_status", "operation": "=", "value": "married"}],
+    [{"field": "no_of_children", "operation": ">", "value": 0},
+     {"field": "monthly_income", "operation": "<", "value": 1000}],
+    [{"field": "email", "operation": "matches", "value": r"^[\w.+-]+@[\w-]+\.[\w.]+$"}],
+    [{"field": "governorate", "operation": "in", "value": ["amman", "zarqa", "irbid"]},
+     {"field": "national_id", "operation": "startswith", "value": "98"}],
+    [{"field": "monthly_expenses", "operation": "<=", "value": {"field": "monthly_income"}},
+     {"field": "has_disability", "operation": "!=", "value": True}],
+]
+
+
+def legacy_evaluate(condition_logic, merged_data):
+    """The per-call interpreter DynamicFlowValidator used before the condition engine."""
+    try:
+        result = True
+        for condition in condition_logic:
+            raw_value = condition["value"]
+            if isinstance(raw_value, dict) and "field" in raw_value:
+                value = merged_data.get(raw_value["field"])
+            else:
+                value = raw_value
+            field_value = merged_data.get(condition["field"])
+            operations = {
+                "=": lambda a, b: a == b,
+                "!=": lambda a, b: a != b,
+                ">": lambda a, b: a > b,
+                "<": lambda a, b: a < b,
+                ">=": lambda a, b: a >= b,
+                "<=": lambda a, b: a <= b,
+                "contains": lambda a, b: str(b) in str(a),
+                "startswith": lambda a, b: str(a).startswith(str(b)),
+                "endswith": lambda a, b: str(a).endswith(str(b)),
+                "matches": lambda a, b: bool(re.match(b, str(a))),
+                "in": lambda a, b: a in b,
+                "not in": lambda a, b: a not in b,
+            }
+            result = result and operations.get(condition["operation"], lambda a, b: False)(field_value, value)
+        return result
+    except Exception:
+        return False
+
+
+class Command(BaseCommand):
+    help = "Compare the compiled condition engine with the legacy per-call interpreter"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        clear_compiled_conditions()
+
+        for logic in CONDITIONS:
+            assert legacy_evaluate(logic, CASE_DATA) == get_compiled_condition(logic).evaluate(CASE_DATA)
+
+        start = perf_counter()
+        for _ in range(iterations):
+            for logic in CONDITIONS:
+                legacy_evaluate(logic, CASE_DATA)
+        legacy_time = perf_counter() - start
+
+        compiled = [get_compiled_condition(logic) for logic in CONDITIONS]
+        start = perf_counter()
+        for _ in range(iterations):
+            for condition in compiled:
+                condition.evaluate(CASE_DATA)
+        compiled_time = perf_counter() - start
+
+        start = perf_counter()
+        for _ in range(iterations):
+            for logic in CONDITIONS:
+                get_compiled_condition(logic).evaluate(CASE_DATA)
+        cached_lookup_time = perf_counter() - start
+
+        evaluations = iterations * len(CONDITIONS)
+        self.stdout.write(f"{evaluations} evaluations")
+        self.stdout.write(f"  legacy interpreter:        {legacy_time:.3f}s")
+        self.stdout.write(f"  compiled (held reference): {compiled_time:.3f}s "
+                          f"({legacy_time / compiled_time:.1f}x)")
+        self.stdout.write(f"  compiled (cache lookup):   {cached_lookup_time:.3f}s "
+                          f"({legacy_time / cached_lookup_time:.1f}x)")
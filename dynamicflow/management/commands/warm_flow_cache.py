@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from dynamicflow.utils.dynamicflow_helper import DynamicFlowHelper
+from dynamicflow.utils.flow_cache import bump_flow_version, get_flow_version, set_cached_flows
+
+
+class Command(BaseCommand):
+    help = 'Compile service flows and store them in the flow cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--service', action='append', dest='services',
+                            help='Service code to warm (repeatable). Defaults to all services.')
+        parser.add_argument('--invalidate', action='store_true',
+                            help='Bump the flow version before warming, dropping every cached flow')
+
+    def handle(self, *args, **options):
+        if options['invalidate']:
+            bump_flow_version()
+
+        helper = DynamicFlowHelper({"service__in": options['services']})
+        service_codes = [str(code) for code in helper.query["service__in"]]
+        if not service_codes:
+            self.stderr.write("[ERROR] No services found to warm")
+            return
+
+        version = get_flow_version()
+        flows = helper.compile_flows(service_codes)
+        set_cached_flows(version, flows)
+
+        for code, flow in flows.items():
+            self.stdout.write(f"  {code}: {len(flow['pages'])} page(s)")
+        self.stdout.write(f"✅ Warmed {len(flows)} service flow(s) at version {version}")
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dynamicflow', '0024_condition_condition_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='condition',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
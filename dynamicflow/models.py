@@ -2,8 +2,10 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 # Create your models here.
-import re
 from django.core.exceptions import ValidationError
+
+from utils.condition_engine import get_compiled_condition
+
 class Workflow(models.Model):
     """Container model for workflow definitions"""
     name = models.CharField(max_length=255)
@@ -439,119 +441,22 @@ class Condition(models.Model):
         default='visibility',
         help_text="Whether this condition controls visibility or calculates a value"
     )
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
-def calculate_value(self, field_data):
-    """
-    Calculate the actual value for calculation-type conditions
-    Returns the calculated value instead of boolean
-    """
-    try:
-        from datetime import datetime, date
-
-        for condition in self.condition_logic:
-            field_name = condition['field']
-            operation = condition['operation']
-            value = condition.get('value', 0)
-
-            field_value = field_data.get(field_name, 0)
-
-            # Handle field references
-            if isinstance(value, dict) and 'field' in value:
-                value = field_data.get(value['field'], 0)
-
-            # Convert to float for calculations (except for dates and conditionals)
-            if operation not in ['age_conditional', 'if', 'if_equals']:
-                try:
-                    field_value = float(field_value)
-                    if not isinstance(value, (list, dict)):
-                        value = float(value)
-                except (ValueError, TypeError):
-                    pass
-
-            # Perform calculations
-            if operation == "+":
-                return field_value + value
-            elif operation == "-":
-                return field_value - value
-            elif operation == "*":
-                return field_value * value
-            elif operation == "/":
-                return field_value / value if value != 0 else 0
-            elif operation == "**":
-                return field_value ** value
-            elif operation == "sum":
-                total = 0
-                for field in value:
-                    if field.startswith('-'):
-                        total -= float(field_data.get(field[1:], 0))
-                    else:
-                        total += float(field_data.get(field, 0))
-                return total
-            # For direct value copy
-            elif operation == "=" or operation == "copy":
-                return field_value
-
-            # NEW: Age-based conditional
-            elif operation == "age_conditional":
-                if field_value:
-                    # Calculate age from DOB
-                    if isinstance(field_value, str):
-                        dob = datetime.strptime(field_value, "%Y-%m-%d").date()
-                    else:
-                        dob = field_value
-
-                    today = date.today()
-                    age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-
-                    age_threshold = condition.get('age_threshold', 18)
-                    if age < age_threshold:
-                        under_field = condition.get('under_age_field')
-                        return field_data.get(under_field, 0)
-                    else:
-                        over_field = condition.get('over_age_field')
-                        return field_data.get(over_field, 0)
-                return 0
-
-            # NEW: Simple if-equals conditional
-            elif operation == "if_equals":
-                check_value = condition.get('check_value')
-                then_value = condition.get('then_value', 0)
-                else_value = condition.get('else_value', field_value)
-
-                # Handle field references in then/else values
-                if isinstance(then_value, dict) and 'field' in then_value:
-                    then_value = field_data.get(then_value['field'], 0)
-                if isinstance(else_value, dict) and 'field' in else_value:
-                    else_value = field_data.get(else_value['field'], 0)
-
-                if field_value == check_value:
-                    return then_value
-                else:
-                    return else_value
-
-            # NEW: General if conditional with any operator
-            elif operation == "if":
-                condition_op = condition.get('condition_operator', '=')
-                check_value = condition.get('check_value')
-                then_value = condition.get('then_value', 0)
-                else_value = condition.get('else_value', field_value)
-
-                # Handle field references
-                if isinstance(then_value, dict) and 'field' in then_value:
-                    then_value = field_data.get(then_value['field'], 0)
-                if isinstance(else_value, dict) and 'field' in else_value:
-                    else_value = field_data.get(else_value['field'], 0)
-
-                # Evaluate condition
-                if self._evaluate_single_condition(field_value, condition_op, check_value):
-                    return then_value
-                else:
-                    return else_value
-
-    except Exception as e:
-        raise ValidationError(f"Error calculating value: {e}")
-
-    return None
+    def get_compiled(self, missing=None):
+        """Return this condition's logic compiled by the shared condition engine."""
+        key = ("dynamicflow.condition", self.pk, self.updated_at) if self.pk else None
+        return get_compiled_condition(self.condition_logic, key=key, missing=missing)
+
+    def calculate_value(self, field_data):
+        """
+        Calculate the actual value for calculation-type conditions
+        Returns the calculated value instead of boolean
+        """
+        try:
+            return self.get_compiled(missing=0).calculate(field_data)
+        except Exception as e:
+            raise ValidationError(f"Error calculating value: {e}")
 
     def evaluate_condition(self, field_data):
         """
@@ -559,94 +464,14 @@ def calculate_value(self, field_data):
         field_data: Dictionary of field names and their corresponding values.
         """
         try:
-            result = True
-
-            # Evaluate the dynamic condition logic stored in the condition_logic field
-            for condition in self.condition_logic:
-                field_name = condition['field']
-                operation = condition['operation']
-                value = condition['value']
-
-                field_value = field_data.get(field_name, 0)
-
-                # Perform the dynamic operation (addition, subtraction, comparison, etc.)
-                if operation == "+":
-                    result = result and (field_value + value)
-                elif operation == "-":
-                    result = result and (field_value - value)
-                elif operation == "*":
-                    result = result and (field_value * value)
-                elif operation == "/":
-                    result = result and (field_value / value if value != 0 else 0)
-                elif operation == "**":
-                    result = result and (field_value ** value)
-                elif operation == "=":
-                    result = result and (field_value == value)
-                elif operation == "!=":
-                    result = result and (field_value != value)
-                elif operation == ">":
-                    result = result and (field_value > value)
-                elif operation == "<":
-                    result = result and (field_value < value)
-                elif operation == ">=":
-                    result = result and (field_value >= value)
-                elif operation == "<=":
-                    result = result and (field_value <= value)
-                elif operation == "in":
-                    result = result and (field_value in value)
-                elif operation == "not in":
-                    result = result and (field_value not in value)
-                elif operation == "startswith":
-                    result = result and str(field_value).startswith(str(value))
-                elif operation == "endswith":
-                    result = result and str(field_value).endswith(str(value))
-                elif operation == "contains":
-                    result = result and (str(value) in str(field_value))
-                elif operation == "matches":
-                    result = result and bool(re.match(value, str(field_value)))
-
-                # Additional logical operators
-                elif operation == "and":
-                    result = result and value  # value should be a boolean or another condition check
-                elif operation == "or":
-                    result = result or value
-                elif operation == "not":
-                    result = not value  # value should be a boolean or another condition check
-                elif operation == "sum":
-                    total = 0
-                    for item in value:  # Assuming value is a list of fields to sum
-                        total += field_data.get(item, 0)
-                    result = result and (field_value == total)
-            # Additional checks
-            if 'additional_checks' in self.condition_logic:
-                for check in self.condition_logic['additional_checks']:
-                    check_field = check['field']
-                    check_value = check['value']
-                    check_operator = check.get('operator', "=")
-
-                    check_field_value = field_data.get(check_field, "")
-                    if check_operator == "=":
-                        result = result and (check_field_value == check_value)
-                    elif check_operator == "startswith":
-                        result = result and check_field_value.startswith(check_value)
-                    elif check_operator == "endswith":
-                        result = result and check_field_value.endswith(check_value)
-                    elif check_operator == "contains":
-                        result = result and (check_value in check_field_value)
-                    elif check_operator == "matches":
-                        result = result and bool(re.match(check_value, check_field_value))
-                    elif check_operator == "before":
-                        result = result and (check_field_value < check_value)
-                    elif check_operator == "after":
-                        result = result and (check_field_value > check_value)
-
-            return result
+            return self.get_compiled(missing=0).evaluate(field_data)
         except Exception as e:
             raise ValidationError(f"Error evaluating condition: {e}")
 
     def __str__(self):
         return self.target_field._field_name
 
+
 class WorkflowConnection(models.Model):
     """Store connections between workflow elements"""
     workflow = models.ForeignKey(
@@ -1,16 +1,18 @@
 # dynamicflow/services/api_trigger_service.py - Updated version
 
+import asyncio
 import json
 import logging
 import time
 from typing import Dict, Any, Optional
 from django.db import models
-from django.core.cache import cache
 from django.conf import settings
 from celery import shared_task
 
 from case.models import APICallLog
 from integration.models import Integration
+from utils.http_client import run_async
+from utils.rate_limiter import SlidingWindowRateLimiter, acquire_all
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -84,116 +86,166 @@ class APITriggerService:
             event: str,
             case_data: Dict[str, Any],
             instance: Optional[models.Model] = None,
-            old_case_data: Optional[Dict[str, Any]] = None
+            old_case_data: Optional[Dict[str, Any]] = None,
+            integrations=None
     ):
         """
         Triggers all API calls configured for a field and event.
+        ``integrations`` may pass the field's integrations for the event when
+        they were already fetched.
         """
-        from integration.models import FieldIntegration
-        from case.models import APICallLog
-
         # Get the field value from case_data
         field_value = case_data.get(field._field_name)
 
-        # Get all integrations for this field and event
-        integrations = field.get_integrations_for_event(event)
+        # Get all integrations for this field and event, in configured order
+        if integrations is None:
+            integrations = field.get_integrations_for_event(event).select_related('integration')
 
+        sync_calls = []
         for field_integration in integrations:
             # Check if integration should execute
             if not field_integration.should_execute(field_value, case_data):
                 logger.info(f"Skipping integration {field_integration} due to condition")
                 continue
 
-            # Check rate limiting
-            if instance and not APITriggerService._check_rate_limit(
-                    field_integration.integration.id, instance.id
-            ):
+            request_data = APITriggerService._build_request_data(
+                *field_integration.prepare_request_data(case_data, field_value)
+            )
+            case_id = instance.id if instance else None
+
+            if field_integration.is_async:
+                # The task takes its rate limit slot when it runs.
+                APITriggerService.schedule_integration(field_integration, request_data, case_id, case_data)
+                logger.info(f"Integration {field_integration} scheduled asynchronously")
+                continue
+
+            # Over the rate limit: defer to a task instead of dropping the call
+            wait = APITriggerService._check_rate_limit(field_integration.integration, case_id)
+            if wait:
+                APITriggerService.schedule_integration(
+                    field_integration, request_data, case_id, case_data, countdown=wait)
                 logger.warning(
-                    f"Rate limit exceeded for integration {field_integration.integration.id}"
+                    f"Rate limit reached for integration {field_integration.integration.id}; "
+                    f"deferred by {wait}s"
                 )
                 continue
 
-            # UPDATED: Prepare request data - now returns 4 values
-            payload, query_params, headers, path_params = field_integration.prepare_request_data(
-                case_data, field_value
-            )
+            sync_calls.append((field_integration, request_data))
 
-            # Log the attempt
-            start_time = time.time()
+        # Fire the synchronous integrations concurrently, then apply their
+        # responses one by one in configured order.
+        results = APITriggerService.execute_concurrently(sync_calls)
+        APITriggerService._record_results(event, sync_calls, results, instance, case_data)
 
-            if field_integration.is_async:
-                # UPDATED: Async execution - pass path_params
-                APITriggerService._execute_integration_async.delay(
-                    field_integration.id,
-                    payload,
-                    query_params,
-                    headers,
-                    path_params,  # NEW parameter
-                    instance.id if instance else None,
-                    case_data
-                )
-                logger.info(f"Integration {field_integration} scheduled asynchronously")
-            else:
-                # Sync execution
-                try:
-                    # UPDATED: Pass path_params to make_api_request
-                    response = field_integration.integration.make_api_request(
-                        body=payload,
-                        query_params=query_params,
-                        headers=headers,
-                        path_params=path_params  # NEW parameter
+    @staticmethod
+    def _record_results(event, calls, results, instance, case_data):
+        """Log each call of ``execute_concurrently`` and apply its response updates."""
+        for (field_integration, request_data), (response, duration_ms) in zip(calls, results):
+            if isinstance(response, Exception):
+                if instance:
+                    APICallLog.objects.create(
+                        case_id=instance.id,
+                        field_id=field_integration.field_id,
+                        integration=field_integration.integration,
+                        event_type=event,
+                        request_data=request_data,
+                        success=False,
+                        error_message=str(response),
+                        duration_ms=duration_ms
                     )
-                    duration_ms = int((time.time() - start_time) * 1000)
-
-                    # UPDATED: Log successful call - include path_params
-                    if instance:
-                        APICallLog.objects.create(
-                            case_id=instance.id,
-                            field_id=field.id,
-                            integration=field_integration.integration,
-                            event_type=event,
-                            request_data={
-                                'body': payload,
-                                'query_params': query_params,
-                                'headers': headers,
-                                'path_params': path_params  # NEW
-                            },
-                            response_data=response,
-                            status_code=200,
-                            success=True,
-                            duration_ms=duration_ms
-                        )
-
-                    # Handle response updates if configured
-                    if field_integration.update_field_on_response and instance:
-                        APITriggerService._handle_response_updates(
-                            field_integration, response, instance, case_data
-                        )
-
-                    logger.info(f"Integration {field_integration} executed successfully")
-
-                except Exception as e:
-                    duration_ms = int((time.time() - start_time) * 1000)
-
-                    # Log failed call
-                    if instance:
-                        APICallLog.objects.create(
-                            case_id=instance.id,
-                            field_id=field.id,
-                            integration=field_integration.integration,
-                            event_type=event,
-                            request_data={
-                                'body': payload,
-                                'query_params': query_params,
-                                'headers': headers,
-                                'path_params': path_params  # NEW
-                            },
-                            success=False,
-                            error_message=str(e),
-                            duration_ms=duration_ms
-                        )
-
-                    logger.error(f"Integration {field_integration} failed: {e}")
+                logger.error(f"Integration {field_integration} failed: {response}")
+                continue
+
+            if instance:
+                APICallLog.objects.create(
+                    case_id=instance.id,
+                    field_id=field_integration.field_id,
+                    integration=field_integration.integration,
+                    event_type=event,
+                    request_data=request_data,
+                    response_data=response,
+                    status_code=200,
+                    success=True,
+                    duration_ms=duration_ms
+                )
+
+            # Handle response updates if configured
+            if field_integration.update_field_on_response and instance:
+                APITriggerService._handle_response_updates(
+                    field_integration, response, instance, case_data
+                )
+
+            logger.info(f"Integration {field_integration} executed successfully")
+
+    @staticmethod
+    def schedule_integration(field_integration, request_data, case_id=None, case_data=None, countdown=None):
+        """Run a field integration through the Celery task, optionally after ``countdown`` seconds."""
+        APITriggerService._execute_integration_async.apply_async(
+            args=(
+                field_integration.id,
+                request_data['body'],
+                request_data['query_params'],
+                request_data['headers'],
+                request_data['path_params'],
+                case_id,
+                case_data
+            ),
+            countdown=countdown
+        )
+
+    @staticmethod
+    def schedule_integration_batch(calls, case_id=None, case_data=None, event='post_save'):
+        """
+        Run several field integrations through a single Celery task.
+        ``calls`` is a list of (field_integration, request_data) pairs.
+        """
+        APITriggerService._execute_integration_batch_async.delay(
+            [[field_integration.id, request_data] for field_integration, request_data in calls],
+            case_id,
+            case_data,
+            event
+        )
+
+    @staticmethod
+    def _build_request_data(payload, query_params, headers, path_params):
+        return {
+            'body': payload,
+            'query_params': query_params,
+            'headers': headers,
+            'path_params': path_params
+        }
+
+    @staticmethod
+    def execute_concurrently(calls):
+        """
+        Send the requests of several field integrations at once.
+
+        ``calls`` is a list of (field_integration, request_data) pairs; the
+        result is a list of (response or exception, duration_ms) in the same
+        order.
+        """
+        async def timed(field_integration, request_data):
+            start_time = time.time()
+            try:
+                response = await field_integration.integration.amake_api_request(
+                    body=request_data['body'],
+                    query_params=request_data['query_params'],
+                    headers=request_data['headers'],
+                    path_params=request_data['path_params'],
+                    cache_ttl=field_integration.cache_ttl
+                )
+            except Exception as e:
+                response = e
+            return response, int((time.time() - start_time) * 1000)
+
+        async def gather():
+            return await asyncio.gather(*(
+                timed(field_integration, request_data)
+                for field_integration, request_data in calls
+            ))
+
+        return run_async(gather()) if calls else []
+
     @staticmethod
     def _extract_mapped_data(mapping_config: Dict[str, str], source_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -227,6 +279,18 @@ class APITriggerService:
         Triggers a specific Integration directly from an Action.
         Dynamically populates request data using mappings defined on the Integration model.
         """
+        wait = APITriggerService._check_rate_limit(integration, case_instance.id)
+        if wait:
+            APITriggerService._trigger_integration_from_action_async.apply_async(
+                args=(integration.id, case_instance.id, user.id if user else None, event_type),
+                countdown=wait
+            )
+            logger.warning(
+                f"Rate limit reached for integration '{integration.name}'; "
+                f"action call for Case {case_instance.id} deferred by {wait}s"
+            )
+            return
+
         start_time = time.time()
         case_data = case_instance.case_data or {}
 
@@ -315,18 +379,35 @@ class APITriggerService:
         )
 
     @staticmethod
-    def _check_rate_limit(integration_id: int, case_id: int) -> bool:
-        """Check if API call is within rate limits."""
-        cache_key = f"api_rate_limit:{integration_id}:{case_id}"
-        current_count = cache.get(cache_key, 0)
-
-        max_calls = getattr(settings, 'API_TRIGGER_RATE_LIMIT', 10)
-
-        if current_count >= max_calls:
-            return False
+    def _rate_limiters(integration, case_id=None):
+        """
+        Limits that apply to a call of ``integration``: per case
+        (``API_TRIGGER_RATE_LIMIT``), per integration (``Integration.rate_limit``)
+        and across all integrations (``API_TRIGGER_GLOBAL_RATE_LIMIT``), each
+        per ``API_TRIGGER_RATE_LIMIT_WINDOW`` seconds.
+        """
+        window = getattr(settings, 'API_TRIGGER_RATE_LIMIT_WINDOW', 60)
+        limiters = []
+
+        per_case = getattr(settings, 'API_TRIGGER_RATE_LIMIT', 10)
+        if per_case and case_id:
+            limiters.append(SlidingWindowRateLimiter(
+                f"api_trigger:{integration.id}:{case_id}", per_case, window))
+        if integration.rate_limit:
+            limiters.append(SlidingWindowRateLimiter(
+                f"api_trigger:{integration.id}", integration.rate_limit, window))
+        global_limit = getattr(settings, 'API_TRIGGER_GLOBAL_RATE_LIMIT', None)
+        if global_limit:
+            limiters.append(SlidingWindowRateLimiter("api_trigger:global", global_limit, window))
+        return limiters
 
-        cache.set(cache_key, current_count + 1, 60)
-        return True
+    @staticmethod
+    def _check_rate_limit(integration, case_id=None) -> int:
+        """
+        Take a slot for one call of ``integration``. Returns 0 when the call
+        may go ahead, otherwise the seconds to defer it by.
+        """
+        return acquire_all(APITriggerService._rate_limiters(integration, case_id))
 
     @staticmethod
     def _handle_response_updates(field_integration, response, instance, case_data):
@@ -375,19 +456,31 @@ class APITriggerService:
         from integration.models import FieldIntegration
         from case.models import APICallLog, Case
 
+        field_integration = FieldIntegration.objects.select_related(
+            'integration', 'field'
+        ).get(id=field_integration_id)
+
+        wait = APITriggerService._check_rate_limit(field_integration.integration, case_id)
+        if wait:
+            # Waiting for the rate limit is not a failure; requeue without using up retries.
+            APITriggerService._execute_integration_async.apply_async(
+                args=(field_integration_id, payload, query_params, headers, path_params, case_id, case_data),
+                countdown=wait
+            )
+            logger.warning(f"Rate limit reached for integration {field_integration.integration.id}; "
+                           f"deferred by {wait}s")
+            return None
+
         start_time = time.time()
 
         try:
-            field_integration = FieldIntegration.objects.select_related(
-                'integration', 'field'
-            ).get(id=field_integration_id)
-
             # UPDATED: Pass path_params
             response = field_integration.integration.make_api_request(
                 body=payload,
                 query_params=query_params,
                 headers=headers,
-                path_params=path_params  # NEW
+                path_params=path_params,  # NEW
+                cache_ttl=field_integration.cache_ttl
             )
 
             duration_ms = int((time.time() - start_time) * 1000)
@@ -444,4 +537,70 @@ class APITriggerService:
 
             # Retry with exponential backoff
             retry_delay = field_integration.integration.retry_delay * (self.request.retries + 1)
-            raise self.retry(exc=e, countdown=retry_delay)
\ No newline at end of file
+            raise self.retry(exc=e, countdown=retry_delay)
+
+    @staticmethod
+    @shared_task
+    def _trigger_integration_from_action_async(
+            integration_id: int,
+            case_id: int,
+            user_id: Optional[int] = None,
+            event_type: str = "action_triggered"
+    ):
+        """
+        Celery task running an action-triggered integration that was deferred
+        by the rate limiter.
+        """
+        from case.models import Case
+
+        APITriggerService.trigger_integration_from_action(
+            integration=Integration.objects.get(id=integration_id),
+            case_instance=Case.objects.get(id=case_id),
+            user=User.objects.filter(id=user_id).first() if user_id else None,
+            event_type=event_type
+        )
+
+    @staticmethod
+    @shared_task
+    def _execute_integration_batch_async(
+            calls: list,
+            case_id: Optional[int] = None,
+            case_data: Optional[Dict] = None,
+            event: str = 'post_save'
+    ):
+        """
+        Celery task sending a batch of field integrations concurrently. Calls
+        over the rate limit, and calls that fail, continue as single
+        integration tasks (deferred, or with the usual retries).
+        """
+        from integration.models import FieldIntegration
+        from case.models import Case
+
+        field_integrations = FieldIntegration.objects.select_related(
+            'integration', 'field'
+        ).in_bulk([field_integration_id for field_integration_id, _ in calls])
+        case = Case.objects.filter(id=case_id).first() if case_id else None
+        case_data = case_data if case_data is not None else (case.case_data if case else {})
+
+        ready = []
+        for field_integration_id, request_data in calls:
+            field_integration = field_integrations.get(field_integration_id)
+            if field_integration is None:
+                continue
+            wait = APITriggerService._check_rate_limit(field_integration.integration, case_id)
+            if wait:
+                APITriggerService.schedule_integration(
+                    field_integration, request_data, case_id, case_data, countdown=wait)
+                logger.warning(f"Rate limit reached for integration {field_integration.integration.id}; "
+                               f"deferred by {wait}s")
+                continue
+            ready.append((field_integration, request_data))
+
+        results = APITriggerService.execute_concurrently(ready)
+        APITriggerService._record_results(event, ready, results, case, case_data)
+
+        for (field_integration, request_data), (response, _) in zip(ready, results):
+            if isinstance(response, Exception) and field_integration.integration.max_retries:
+                APITriggerService.schedule_integration(
+                    field_integration, request_data, case_id, case_data,
+                    countdown=field_integration.integration.retry_delay)
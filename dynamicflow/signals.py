@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from dynamicflow.models import Category, Condition, Field, Page
+from dynamicflow.utils.flow_cache import bump_flow_version
+from integration.models import FieldIntegration, Integration
+from lookup.models import Lookup
+
+# Every model whose rows end up in a compiled service flow.
+FLOW_MODELS = (Page, Category, Field, Condition, FieldIntegration, Integration, Lookup)
+FLOW_M2M_MODELS = (Category.page.through, Field._category.through, Field.allowed_lookups.through)
+
+
+def invalidate_service_flows(sender, **kwargs):
+    # Bump after commit so no request can cache the pre-change tree under the
+    # new version while the transaction is still open.
+    transaction.on_commit(bump_flow_version)
+
+
+for model in FLOW_MODELS:
+    post_save.connect(invalidate_service_flows, sender=model,
+                      dispatch_uid=f"flow_cache_save_{model._meta.label_lower}")
+    post_delete.connect(invalidate_service_flows, sender=model,
+                        dispatch_uid=f"flow_cache_delete_{model._meta.label_lower}")
+
+for through in FLOW_M2M_MODELS:
+    m2m_changed.connect(invalidate_service_flows, sender=through,
+                        dispatch_uid=f"flow_cache_m2m_{through._meta.label_lower}")
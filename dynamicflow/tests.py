@@ -1 +1,156 @@
-# Create your tests here.
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from dynamicflow.models import Category, Condition, Field, FieldType, Page
+from dynamicflow.utils.dynamicflow_helper import DynamicFlowHelper
+from dynamicflow.utils.dynamicflow_validator_helper import DynamicFlowValidator
+from dynamicflow.utils.flow_cache import get_flow_version
+from lookup.models import Lookup
+from utils import condition_engine
+from utils.condition_engine import clear_compiled_conditions
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FlowCacheInvalidationTests(TestCase):
+    """Saving any part of a service flow makes the next read recompile it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        services = Lookup.objects.create(
+            name='Service', type=Lookup.LookupTypeChoices.LOOKUP)
+        cls.service = Lookup.objects.create(
+            parent_lookup=services, name='Permit', code='01')
+        cls.page = Page.objects.create(service=cls.service, name='Applicant')
+        cls.category = Category.objects.create(name='Details')
+        cls.category.page.add(cls.page)
+        cls.field = Field.objects.create(_field_name='full_name')
+        cls.field._category.add(cls.category)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_field_names(self):
+        flow = DynamicFlowHelper(self.service.code).get_flow()
+        return [field['name']
+                for page in flow['service_flow']
+                for category in page['categories']
+                for field in category['fields']]
+
+    def test_flow_is_served_from_cache(self):
+        self.assertEqual(self.get_field_names(), ['full_name'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_field_names(), ['full_name'])
+
+    def test_saving_a_field_invalidates_cached_flow(self):
+        self.assertEqual(self.get_field_names(), ['full_name'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.field._field_name = 'applicant_name'
+            self.field.save()
+        self.assertEqual(self.get_field_names(), ['applicant_name'])
+
+    def test_unlinking_a_category_invalidates_cached_flow(self):
+        self.assertEqual(self.get_field_names(), ['full_name'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.page.remove(self.page)
+        self.assertEqual(self.get_field_names(), [])
+
+
+@override_settings(CACHES=LOCMEM_CACHES, DYNAMICFLOW_LOCAL_VERSION_TIMEOUT=30)
+class LocalFlowVersionTests(TestCase):
+    """A per-process cache only trusts its flow version for a short while."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_reseeded_after_local_timeout(self):
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            version = get_flow_version()
+        with mock.patch('time.time', return_value=now + 29):
+            self.assertEqual(get_flow_version(), version)
+        with mock.patch('time.time', return_value=now + 31):
+            self.assertGreater(get_flow_version(), version)
+
+
+class CalculationCycleTests(TestCase):
+    """Calculated fields that depend on each other fail validation, not the request."""
+
+    @classmethod
+    def setUpTestData(cls):
+        services = Lookup.objects.create(
+            name='Service', type=Lookup.LookupTypeChoices.LOOKUP)
+        cls.service = Lookup.objects.create(
+            parent_lookup=services, name='Permit', code='01')
+        page = Page.objects.create(service=cls.service, name='Fees')
+        category = Category.objects.create(name='Fees')
+        category.page.add(page)
+        number = FieldType.objects.create(name='Number')
+        for name, source in (('fee', 'total'), ('total', 'fee')):
+            field = Field.objects.create(_field_name=name, _field_type=number)
+            field._category.add(category)
+            Condition.objects.create(
+                target_field=field, condition_type='calculation',
+                condition_logic=[{'field': source, 'operation': '+', 'value': 1}])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cycle_is_reported_as_field_errors(self):
+        helper = DynamicFlowHelper(self.service.code)
+        validator = DynamicFlowValidator(
+            helper.get_flow(), None, {'case_data': {'fee': 1}}, submit=True,
+            flow_version=helper.flow_version)
+
+        results = validator.validate()
+
+        self.assertFalse(results['is_valid'])
+        self.assertEqual(results['calculated_fields'], {})
+        for field_name in ('fee', 'total'):
+            self.assertIn('Circular dependency between calculated fields: fee, total',
+                          results['field_errors'][field_name])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class VisibilityConditionKeyTests(TestCase):
+    """Visibility conditions are compiled under their row's key, not their logic."""
+
+    @classmethod
+    def setUpTestData(cls):
+        services = Lookup.objects.create(
+            name='Service', type=Lookup.LookupTypeChoices.LOOKUP)
+        cls.service = Lookup.objects.create(
+            parent_lookup=services, name='Permit', code='01')
+        page = Page.objects.create(service=cls.service, name='Applicant')
+        category = Category.objects.create(name='Details')
+        category.page.add(page)
+        text = FieldType.objects.create(name='Text')
+        for name in ('has_spouse', 'spouse_name'):
+            field = Field.objects.create(_field_name=name, _field_type=text)
+            field._category.add(category)
+        cls.condition = Condition.objects.create(
+            target_field=Field.objects.get(_field_name='spouse_name'),
+            condition_logic=[{'field': 'has_spouse', 'operation': '=', 'value': True}])
+
+    def setUp(self):
+        cache.clear()
+        clear_compiled_conditions()
+
+    def test_condition_is_keyed_by_id_and_flow_version(self):
+        helper = DynamicFlowHelper(self.service.code)
+        validator = DynamicFlowValidator(
+            helper.get_flow(), None, {'case_data': {'has_spouse': True}},
+            flow_version=helper.flow_version)
+
+        with mock.patch('utils.condition_engine.repr', create=True) as logic_repr:
+            validator.validate()
+        logic_repr.assert_not_called()
+        self.assertIn(
+            (('dynamicflow.condition', self.condition.pk, helper.flow_version), None),
+            condition_engine._cache)
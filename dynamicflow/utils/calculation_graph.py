@@ -0,0 +1,155 @@
+import logging
+from collections import OrderedDict, defaultdict, deque
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from django.core.exceptions import ValidationError
+
+from dynamicflow.utils.flow_cache import get_flow_version
+from utils.condition_engine import get_compiled_condition
+
+logger = logging.getLogger(__name__)
+
+GRAPH_CACHE_SIZE = 128
+
+
+class CalculationCycleError(ValidationError):
+    """Raised when calculated fields depend on each other in a loop."""
+
+    def __init__(self, fields):
+        self.fields = sorted(fields)
+        super().__init__(
+            f"Circular dependency between calculated fields: {', '.join(self.fields)}"
+        )
+
+
+class CalculationGraph:
+    """
+    Calculated fields of a service flow in dependency order.
+
+    Built from the ``calculations`` already embedded in the compiled service
+    flow, so evaluating it never touches the database.
+    """
+
+    def __init__(self, calculations: List[Dict[str, Any]], version=None):
+        # Only the first calculation of a field is used, as before.
+        self.calculations = OrderedDict()
+        for calc in calculations:
+            self.calculations.setdefault(calc['field_name'], get_compiled_condition(
+                calc['condition_logic'] or [],
+                key=("dynamicflow.condition", calc['condition_id'], version),
+                missing=0,
+            ))
+
+        self.dependents = defaultdict(set)
+        for field_name, compiled in self.calculations.items():
+            for dependency in compiled.dependencies:
+                if dependency != field_name:
+                    self.dependents[dependency].add(field_name)
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        in_degree = {
+            field_name: sum(
+                1 for dependency in compiled.dependencies
+                if dependency in self.calculations and dependency != field_name
+            )
+            for field_name, compiled in self.calculations.items()
+        }
+        ready = deque(name for name, degree in in_degree.items() if degree == 0)
+        order = []
+        while ready:
+            field_name = ready.popleft()
+            order.append(field_name)
+            for dependent in self.dependents.get(field_name, ()):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.calculations):
+            raise CalculationCycleError(name for name, degree in in_degree.items() if degree > 0)
+        return order
+
+    def affected_by(self, changed_keys: Iterable[str]) -> Set[str]:
+        """Calculated fields that are, or are downstream of, ``changed_keys``."""
+        affected = set()
+        pending = deque(changed_keys)
+        while pending:
+            key = pending.popleft()
+            if key in self.calculations and key not in affected:
+                affected.add(key)
+            for dependent in self.dependents.get(key, ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        return affected
+
+    def calculate(self, data: Dict[str, Any], changed_keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Recalculate into ``data`` (in place, so calculations cascade) and return
+        the calculated values. With ``changed_keys`` only the affected fields
+        (plus ones never calculated before) are recomputed.
+        """
+        if changed_keys is None:
+            targets = None
+        else:
+            targets = self.affected_by(
+                list(changed_keys) + [name for name in self.calculations if name not in data]
+            )
+
+        calculated = {}
+        for field_name in self.order:
+            if targets is not None and field_name not in targets:
+                continue
+            try:
+                value = self.calculations[field_name].calculate(data)
+            except Exception as e:
+                # Log calculation errors but don't fail the entire validation
+                logger.warning("Error calculating field %s: %s", field_name, e)
+                continue
+            if value is not None:
+                calculated[field_name] = value
+                data[field_name] = value
+        return calculated
+
+
+_graphs = OrderedDict()
+_graphs_lock = Lock()
+
+
+def extract_calculations(service_flow: Dict[str, Any]) -> List[Dict[str, Any]]:
+    calculations = []
+    for page in service_flow.get("service_flow", []):
+        for category in page.get("categories", []):
+            for field in category.get("fields", []):
+                for calc in field.get("calculations") or []:
+                    calculations.append({
+                        'field_name': field['name'],
+                        'condition_id': calc.get('condition_id'),
+                        'condition_logic': calc.get('condition_logic'),
+                    })
+    return calculations
+
+
+def get_calculation_graph(service_flow: Dict[str, Any], version=None) -> CalculationGraph:
+    """
+    Return the calculation graph of ``service_flow``, built once per flow
+    version. Pass the version the flow was loaded with; the current one is
+    only a fallback and may already be newer than the flow.
+    """
+    calculations = extract_calculations(service_flow)
+    if version is None:
+        version = get_flow_version()
+    key = (version, tuple((calc['field_name'], calc['condition_id']) for calc in calculations))
+
+    graph = _graphs.get(key)
+    if graph is not None:
+        return graph
+
+    graph = CalculationGraph(calculations, version=version)
+    with _graphs_lock:
+        _graphs[key] = graph
+        while len(_graphs) > GRAPH_CACHE_SIZE:
+            _graphs.popitem(last=False)
+    return graph
@@ -4,6 +4,8 @@ from django.db.models import Prefetch
 
 from dynamicflow.apis.serializers import FieldWithIntegrationsSerializer
 from dynamicflow.models import Page, Category, Field, Condition
+from dynamicflow.utils.flow_cache import get_cached_flows, get_flow_version, set_cached_flows
+from integration.models import FieldIntegration
 
 
 class DynamicFlowHelper:
@@ -19,6 +21,8 @@ class DynamicFlowHelper:
             "service__in": [],
             "user": None,
         }
+        # Version of the flow cache the last get_flow() read from
+        self.flow_version = None
 
         if query is None:
             # If nothing is passed, fetch all services
@@ -56,61 +60,142 @@ class DynamicFlowHelper:
         """
         if not self.query["service__in"]:
             return self.error_handling()
-    
-        pages = self.get_pages()
-        categories = self.get_categories(pages)
-        fields = self.get_fields(categories)
+
+        service_codes = list(dict.fromkeys(str(code) for code in self.query["service__in"]))
+        flows = self.get_compiled_flows(service_codes)
 
         service_count = len(self.query["service__in"])
 
         if service_count == 1:
             # Original flat format
             return {
-                "service_flow": [self.format_page(page, fields) for page in pages]
+                "service_flow": flows[service_codes[0]]["pages"]
             }
 
-        # Grouped format
-        service_flows = defaultdict(list)
-        for page in pages:
-            if hasattr(page, 'service') and hasattr(page.service, 'code'):
-                service_code = page.service.code
-                service_flows[service_code].append(page)
-
-        response = []
-        for service_code, service_pages in service_flows.items():
-            formatted_pages = [self.format_page(p, fields) for p in service_pages]
-            response.append({
-                "service_code": service_code,
-                "pages": formatted_pages
-            })
+        # Grouped format, services ordered by their first page like the page query
+        compiled = [flows[code] for code in service_codes if flows[code]["pages"]]
+        compiled.sort(key=lambda flow: (flow["first_sequence"] is None, flow["first_sequence"] or ""))
 
+        response = [
+            {"service_code": flow["service_code"], "pages": flow["pages"]}
+            for flow in compiled
+        ]
         return {"service_flow": response}
 
-    def get_pages(self):
+    def get_compiled_flows(self, service_codes):
+        """
+        Returns {service_code: compiled_flow}, reading from the versioned flow
+        cache and compiling (then caching) only the services that are missing.
+        """
+        version = self.flow_version = get_flow_version()
+        flows = get_cached_flows(version, service_codes)
+
+        missing = [code for code in service_codes if code not in flows]
+        if missing:
+            compiled = self.compile_flows(missing)
+            set_cached_flows(version, compiled)
+            flows.update(compiled)
+        return flows
+
+    def compile_flows(self, service_codes):
+        """
+        Builds the formatted flow of each service using a fixed number of
+        bulk queries (plus one per level of sub-field nesting).
+        """
+        flows = {
+            str(code): {"service_code": str(code), "first_sequence": None, "pages": []}
+            for code in service_codes
+        }
+
+        pages = list(self.get_pages(service_codes))
+        categories = self.get_categories(pages)
+        self.load_fields(categories)
+
+        for page in pages:
+            flow = flows.setdefault(page.service.code, {
+                "service_code": page.service.code, "first_sequence": None, "pages": []
+            })
+            if not flow["pages"]:
+                flow["first_sequence"] = page.sequence_number.code if page.sequence_number else None
+            flow["pages"].append(self.format_page(page))
+        return flows
+
+    def get_pages(self, service_codes=None):
+        if service_codes is None:
+            service_codes = self.query["service__in"]
         return Page.objects.filter(
-            service__code__in=self.query["service__in"],
+            service__code__in=service_codes,
             active_ind=True
-        ).select_related("service").only(
-            "id", "name", "sequence_number", 'is_review_page', "applicant_type", "description", "service__code"
-        ).prefetch_related(
-            Prefetch('category_set', queryset=Category.objects.filter(active_ind=True))
+        ).select_related("service", "sequence_number").prefetch_related(
+            Prefetch('category_set', queryset=Category.objects.filter(active_ind=True).order_by('id'))
         )
 
-
     def get_categories(self, pages):
-        return Category.objects.filter(
-            page__in=pages,
-            active_ind=True
-        ).prefetch_related('field_set')
+        categories = {}
+        for page in pages:
+            for category in page.category_set.all():
+                categories[category.id] = category
+        return list(categories.values())
 
-    def get_fields(self, categories):
-        return Field.objects.filter(
-            _category__in=categories,
-            active_ind=True
-        ).select_related('_field_type')
+    def load_fields(self, categories):
+        """
+        Preloads every active field of the given categories together with
+        their sub-fields, allowed lookups, conditions and integrations.
+        """
+        category_fields = list(Field._category.through.objects.filter(
+            category_id__in=[c.id for c in categories],
+            field__active_ind=True
+        ).order_by('field_id').values_list('category_id', 'field_id'))
+
+        self._category_field_ids = defaultdict(list)
+        for category_id, field_id in category_fields:
+            self._category_field_ids[category_id].append(field_id)
+
+        field_ids = {field_id for _, field_id in category_fields}
+        self._fields = {
+            f.id: f for f in Field.objects.filter(id__in=field_ids).select_related('_field_type')
+        }
 
-    def format_response(self, pages, categories, fields):
-        return {"service_flow": [self.format_page(page, fields) for page in pages]}
+        # Sub-fields are loaded one nesting level per query.
+        self._sub_field_ids = defaultdict(list)
+        parent_ids = set(self._fields)
+        while parent_ids:
+            sub_fields = Field.objects.filter(
+                _parent_field_id__in=parent_ids
+            ).select_related('_field_type').order_by('id')
+            parent_ids = set()
+            for sub_field in sub_fields:
+                self._sub_field_ids[sub_field._parent_field_id].append(sub_field.id)
+                if sub_field.id not in self._fields:
+                    self._fields[sub_field.id] = sub_field
+                    parent_ids.add(sub_field.id)
+
+        all_field_ids = list(self._fields)
+
+        self._allowed_lookups = defaultdict(list)
+        allowed_lookups = Field.allowed_lookups.through.objects.filter(
+            field_id__in=all_field_ids
+        ).select_related('lookup').order_by('lookup_id')
+        for row in allowed_lookups:
+            self._allowed_lookups[row.field_id].append(row.lookup)
+
+        self._conditions = defaultdict(lambda: defaultdict(list))
+        conditions = Condition.objects.filter(
+            target_field_id__in=all_field_ids,
+            active_ind=True,
+            condition_type__in=['visibility', 'calculation']
+        ).order_by('id').values_list('id', 'target_field_id', 'condition_type', 'condition_logic')
+        for condition_id, field_id, condition_type, condition_logic in conditions:
+            self._conditions[field_id][condition_type].append((condition_id, condition_logic))
+
+        self._field_integrations = defaultdict(list)
+        field_integrations = FieldIntegration.objects.filter(
+            field_id__in=all_field_ids,
+            active=True,
+            integration__active_ind=True
+        ).select_related('integration').order_by('order', 'id')
+        for fi in field_integrations:
+            self._field_integrations[fi.field_id].append(fi)
 
     def format_field_data(self, field, format_sub_fields=None, get_visibility_conditions=None, get_calculations=None):
         if not format_sub_fields:
@@ -129,10 +214,10 @@ class DynamicFlowHelper:
             "field_type": field_type,
             "mandatory": field._mandatory,
             "sequence": field._sequence,
-            "lookup": field._lookup.id if field._lookup else None,
+            "lookup": field._lookup_id,
             "allowed_lookups": [
                 {"name": l.name, "id": l.id, "code": l.code, "icon": l.icon}
-                for l in field.allowed_lookups.all()
+                for l in self._allowed_lookups[field.id]
             ],
             "sub_fields": format_sub_fields(field),
             "is_hidden": field._is_hidden,
@@ -200,11 +285,11 @@ class DynamicFlowHelper:
 
         return field_data
 
-    def format_category(self, category, fields):
+    def format_category(self, category):
         category_fields = [
-            self.format_field_data(f, self.format_sub_fields, self.get_visibility_conditions,
-                                   self.get_calculations )
-            for f in fields if category in f._category.all()
+            self.format_field_data(self._fields[field_id], self.format_sub_fields,
+                                   self.get_visibility_conditions, self.get_calculations)
+            for field_id in self._category_field_ids[category.id]
         ]
         return {
             "id": category.id,
@@ -214,51 +299,45 @@ class DynamicFlowHelper:
             "fields": category_fields,
         }
 
-    def format_page(self, page, fields):
+    def format_page(self, page):
         return {
             "sequence_number": page.sequence_number.code if page.sequence_number else None,
             "name": page.name,
             "name_ara": page.name_ara,
-            "applicant_type": page.applicant_type.id,
+            "applicant_type": page.applicant_type_id,
             # "service": page.service.id,
             "description": page.description,
             "description_ara": page.description_ara,
             "is_review_page": page.is_review_page,
             "is_hidden_page": not page.active_ind,
             "page_id": page.id,
-            "categories": [self.format_category(c, fields) for c in page.category_set.all()],
+            "categories": [self.format_category(c) for c in page.category_set.all()],
         }
 
     def get_calculations(self, field):
         """Get only calculation type conditions"""
-        conditions = Condition.objects.filter(
-            target_field=field,
-            active_ind=True,
-            condition_type='calculation'  # Filter for calculations only
-        )
         return [{
-            "condition_logic": c.condition_logic,
-            "condition_id": c.id
-        } for c in conditions]
+            "condition_logic": condition_logic,
+            "condition_id": condition_id
+        } for condition_id, condition_logic in self._conditions[field.id]['calculation']]
 
     def format_sub_fields(self, parent_field):
-        sub_fields_data = []
-        sub_fields = Field.objects.filter(_parent_field=parent_field)
-        for sub_field in sub_fields:
-            sub_fields_data.append(
-                self.format_field_data(
-                    sub_field,
-                    self.format_sub_fields,
-                    self.get_visibility_conditions,
-                    self.get_calculations  # Add calculations here too
-                )
+        return [
+            self.format_field_data(
+                self._fields[sub_field_id],
+                self.format_sub_fields,
+                self.get_visibility_conditions,
+                self.get_calculations
             )
-        return sub_fields_data
+            for sub_field_id in self._sub_field_ids[parent_field.id]
+        ]
 
     def get_visibility_conditions(self, field):
-        conditions = Condition.objects.filter(target_field=field, active_ind=True,
-                                              condition_type='visibility')
-        return [{"condition_logic": c.condition_logic} for c in conditions]
+        return [
+            {"condition_logic": condition_logic, "condition_id": condition_id}
+            for condition_id, condition_logic
+            in self._conditions[field.id]['visibility']
+        ]
 
     def error_handling(self):
         return {"error": "Select at least one service before continuing."}
@@ -283,13 +362,7 @@ class DynamicFlowHelper:
         """
         integrations = []
 
-        # Get all active field integrations
-        field_integrations = field.field_integrations.filter(
-            active=True,
-            integration__active_ind=True
-        ).select_related('integration').order_by('order')
-
-        for fi in field_integrations:
+        for fi in self._field_integrations[field.id]:
             integration_data = {
                 "id": fi.id,
                 "integration_id": fi.integration.id,
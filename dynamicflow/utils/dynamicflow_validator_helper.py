@@ -7,14 +7,20 @@ import uuid
 from urllib.parse import urlparse
 from typing import Any, Dict, List
 
+from dynamicflow.utils.calculation_graph import CalculationCycleError, get_calculation_graph
+from utils.condition_engine import evaluate_operation, get_compiled_condition
+
 
 class DynamicFlowValidator:
-    def __init__(self, service_flow: Dict[str, Any], case_obj, received_data: Dict[str, Any], submit=False):
+    def __init__(self, service_flow: Dict[str, Any], case_obj, received_data: Dict[str, Any], submit=False,
+                 flow_version=None):
         """
         Initialize the validator with the expected service flow structure.
         :param service_flow: The dictionary structure returned by DynamicFlowHelper.
+        :param flow_version: The helper's flow_version the service flow was loaded with.
         """
         self.service_flow = service_flow
+        self.flow_version = flow_version
         self.received_data = received_data
         self.valid_fields = None
         self.submit = submit
@@ -112,7 +118,13 @@ class DynamicFlowValidator:
                         validation_results["field_errors"][field_path] = errors
 
         # Server-side recalculation of all calculated fields
-        calculated_fields = self.calculate_all_fields()
+        try:
+            calculated_fields = self.calculate_all_fields()
+        except CalculationCycleError as e:
+            # A misconfigured flow; report it instead of failing the request
+            calculated_fields = {}
+            for field_name in e.fields:
+                validation_results["field_errors"].setdefault(field_name, []).extend(e.messages)
         validation_results["calculated_fields"] = calculated_fields
 
         # Check for tampering by comparing client values with server calculations
@@ -146,117 +158,26 @@ class DynamicFlowValidator:
     ##
     def calculate_all_fields(self) -> Dict[str, Any]:
         """
-        Recalculate all calculated fields on the server side.
+        Recalculate calculated fields on the server side.
         This ensures we never trust client-provided calculated values.
+        Partial saves of an existing case only recalculate the fields
+        downstream of the keys that changed; submissions recalculate all.
         """
-        from dynamicflow.models import Condition
-
-        # Get all calculation conditions for fields in this service flow
-        calculated_fields = {}
-        calculation_conditions = []
-
-        # Extract all fields that have calculation conditions
-        for page in self.service_flow.get("service_flow", []):
-            for category in page.get("categories", []):
-                for field in category.get("fields", []):
-                    if field.get("calculations"):
-                        for calc in field["calculations"]:
-                            calculation_conditions.append({
-                                'field_name': field['name'],
-                                'condition_id': calc.get('condition_id'),
-                                'condition_logic': calc.get('condition_logic')
-                            })
-
-        # Sort conditions by dependency order
-        sorted_conditions = self._sort_conditions_by_dependency(calculation_conditions)
-
-        # Recalculate all fields
-        for condition_info in sorted_conditions:
-            try:
-                condition = Condition.objects.get(
-                    id=condition_info['condition_id'],
-                    condition_type='calculation',
-                    active_ind=True
-                )
-
-                # Calculate the value
-                calculated_value = condition.calculate_value(self.merged_data)
-
-                if calculated_value is not None:
-                    field_name = condition_info['field_name']
-                    calculated_fields[field_name] = calculated_value
-
-                    # Update merged_data for cascading calculations
-                    self.merged_data[field_name] = calculated_value
-
-            except Condition.DoesNotExist:
-                continue
-            except Exception as e:
-                # Log calculation errors but don't fail the entire validation
-                print(f"Error calculating field {condition_info['field_name']}: {str(e)}")
+        graph = get_calculation_graph(self.service_flow, version=self.flow_version)
+        return graph.calculate(self.merged_data, changed_keys=self.get_changed_keys())
 
-        return calculated_fields
-
-    def _sort_conditions_by_dependency(self, conditions: List[Dict]) -> List[Dict]:
+    def get_changed_keys(self):
         """
-        Sort conditions based on their dependencies to ensure proper calculation order.
+        Keys of received case_data whose values differ from the stored case,
+        or None when everything must be treated as changed.
         """
-        # Build dependency graph
-        dependencies = {}
-        for condition in conditions:
-            field_name = condition['field_name']
-            deps = set()
-
-            # Extract dependencies from condition logic
-            for logic in condition.get('condition_logic', []):
-                # Direct field reference
-                if 'field' in logic:
-                    deps.add(logic['field'])
-
-                # Field references in values
-                if isinstance(logic.get('value'), dict) and 'field' in logic['value']:
-                    deps.add(logic['value']['field'])
-
-                # For sum operations
-                if logic.get('operation') == 'sum' and isinstance(logic.get('value'), list):
-                    for field in logic['value']:
-                        if isinstance(field, str):
-                            deps.add(field.lstrip('-'))
-
-                # For age_conditional
-                if logic.get('operation') == 'age_conditional':
-                    if logic.get('under_age_field'):
-                        deps.add(logic['under_age_field'])
-                    if logic.get('over_age_field'):
-                        deps.add(logic['over_age_field'])
-
-            dependencies[field_name] = deps
-
-        # Topological sort
-        sorted_fields = []
-        visited = set()
-
-        def visit(field_name):
-            if field_name in visited:
-                return
-            visited.add(field_name)
-
-            # Visit dependencies first
-            for dep in dependencies.get(field_name, set()):
-                if dep in dependencies:  # Only visit if it's a calculated field
-                    visit(dep)
-
-            # Find the condition for this field
-            for condition in conditions:
-                if condition['field_name'] == field_name:
-                    sorted_fields.append(condition)
-                    break
-
-        # Visit all fields
-        for field_name in dependencies:
-            visit(field_name)
-
-        return sorted_fields
+        if self.submit or not self.case_obj or not self.case_obj.case_data:
+            return None
+        stored = self.case_obj.case_data
+        return [
+            key for key, value in self.received_data.get("case_data", {}).items()
+            if key not in stored or stored[key] != value
+        ]
 
     def validate_calculated_fields(self, calculated_fields: Dict[str, Any]) -> Dict[str, List[str]]:
         """
@@ -327,49 +248,26 @@ class DynamicFlowValidator:
         visibility_conditions = field_info.get("visibility_conditions", [])
         for condition in visibility_conditions:
             condition_logic = condition.get("condition_logic", [])
-            if not self._evaluate_condition_logic(condition_logic, merged_data):
+            if not self._evaluate_condition_logic(condition_logic, merged_data,
+                                                  condition.get("condition_id")):
                 return False
         return True
 
-    def _evaluate_condition_logic(self, condition_logic: List[Dict[str, Any]], merged_data: Dict[str, Any]) -> bool:
+    def _evaluate_condition_logic(self, condition_logic: List[Dict[str, Any]],
+                                  merged_data: Dict[str, Any], condition_id=None) -> bool:
+        # Keyed like the calculation graph, so a cache hit costs no repr() of the logic
+        key = None
+        if condition_id is not None and self.flow_version is not None:
+            key = ("dynamicflow.condition", condition_id, self.flow_version)
         try:
-            result = True
-            for condition in condition_logic:
-                field_name = condition["field"]
-                operation = condition["operation"]
-                raw_value = condition["value"]
-
-                # 👇 Check if value is a reference to another field
-                if isinstance(raw_value, dict) and "field" in raw_value:
-                    referenced_field = raw_value["field"]
-                    value = merged_data.get(referenced_field)
-                else:
-                    value = raw_value
-
-                field_value = merged_data.get(field_name)
-                result = result and self._evaluate_single_condition(field_value, operation, value)
-
-            return result
+            compiled = get_compiled_condition(condition_logic, key=key)
+            return compiled.evaluate(merged_data)
         except Exception as e:
             return False
 
     def _evaluate_single_condition(self, field_value: Any, operation: str, value: Any) -> bool:
         """Evaluate a single condition."""
-        operations = {
-            "=": lambda a, b: a == b,
-            "!=": lambda a, b: a != b,
-            ">": lambda a, b: a > b,
-            "<": lambda a, b: a < b,
-            ">=": lambda a, b: a >= b,
-            "<=": lambda a, b: a <= b,
-            "contains": lambda a, b: str(b) in str(a),
-            "startswith": lambda a, b: str(a).startswith(str(b)),
-            "endswith": lambda a, b: str(a).endswith(str(b)),
-            "matches": lambda a, b: bool(re.match(b, str(a))),
-            "in": lambda a, b: a in b,
-            "not in": lambda a, b: a not in b,
-        }
-        return operations.get(operation, lambda a, b: False)(field_value, value)
+        return evaluate_operation(field_value, operation, value)
 
     def fetch_lookup_choices(self, lookup_field: str) -> List[int]:
         """Fetch valid lookup choices for a given lookup field."""
@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.shared_cache import is_shared_cache
+
+FLOW_VERSION_KEY = "dynamicflow:flow_version"
+FLOW_CACHE_PREFIX = "dynamicflow:flow"
+
+
+def get_flow_cache_timeout():
+    timeout = getattr(settings, "DYNAMICFLOW_FLOW_CACHE_TIMEOUT", 60 * 60 * 24)
+    if not is_shared_cache():
+        # Nothing reads a flow after the version it is stored under expires.
+        timeout = min(timeout, get_local_version_timeout())
+    return timeout
+
+
+def get_local_version_timeout():
+    return getattr(settings, "DYNAMICFLOW_LOCAL_VERSION_TIMEOUT", 30)
+
+
+def get_flow_version():
+    """
+    Return the current service-flow version.
+    Compiled flows and ETags are keyed by it so a bump makes every
+    previously cached flow unreachable. On a shared cache the counter never
+    expires; on a per-process cache other workers never see a bump, so it
+    is re-seeded every ``DYNAMICFLOW_LOCAL_VERSION_TIMEOUT`` seconds, which
+    bounds how long they serve a changed flow.
+    """
+    version = cache.get(FLOW_VERSION_KEY)
+    if version is None:
+        version = _start_flow_version()
+    return version
+
+
+def bump_flow_version():
+    """Invalidate all compiled service flows."""
+    try:
+        return cache.incr(FLOW_VERSION_KEY)
+    except ValueError:
+        return _start_flow_version()
+
+
+def _start_flow_version():
+    # Seed from the clock so a counter that was evicted from the cache can
+    # never be restarted at a version that still has flows stored under it.
+    seed = int(time.time() * 1000)
+    timeout = None if is_shared_cache() else get_local_version_timeout()
+    cache.add(FLOW_VERSION_KEY, seed, timeout=timeout)
+    return cache.get(FLOW_VERSION_KEY, seed)
+
+
+def flow_cache_key(version, service_code):
+    return f"{FLOW_CACHE_PREFIX}:v{version}:{service_code}"
+
+
+def get_cached_flows(version, service_codes):
+    """Return {service_code: compiled_flow} for the codes present in cache."""
+    keys = {flow_cache_key(version, code): code for code in service_codes}
+    cached = cache.get_many(list(keys))
+    return {keys[key]: flow for key, flow in cached.items()}
+
+
+def set_cached_flows(version, flows):
+    cache.set_many(
+        {flow_cache_key(version, code): flow for code, flow in flows.items()},
+        timeout=get_flow_cache_timeout(),
+    )
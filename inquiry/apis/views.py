@@ -6,15 +6,19 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
-from django.http import HttpResponse, JsonResponse
-import csv
+from django.http import JsonResponse
 import json
-from openpyxl import Workbook
 from django.db import models as django_models
 
 from inquiry.models import InquiryConfiguration, InquiryExecution, InquiryTemplate
 from inquiry.services.query_builder import DynamicQueryBuilder
 from inquiry.apis.serializers.dynamic import DynamicModelSerializer
+from inquiry.services.exporter import EXPORT_FORMATS, export_chunks, export_filename, iter_export_rows
+from inquiry.services.result_cache import inquiry_cache_key
+from reporting_templates.models import ExportJob
+from reporting_templates.services.export_jobs import job_status, request_export_job
+from utils.result_cache import get_cached_result, record_lookup, set_cached_result, should_log_hit
+from utils.streaming_export import streaming_response
 from inquiry.apis.serializers.inquiry import (
     InquiryConfigurationSerializer,
     InquiryExecutionSerializer,
@@ -319,6 +323,33 @@ class InquiryExecutionViewSet(viewsets.ViewSet):
             search = request.data.get('search', '')
             sort = request.data.get('sort', [])
             export_format = request.data.get('export')
+            include_aggregations = request.data.get('include_aggregations', False)
+
+            # Serve repeated identical executions from the result cache
+            cache_key = None
+            if inquiry.cache_ttl and not export_format:
+                cache_key = inquiry_cache_key(
+                    inquiry,
+                    request.user,
+                    {'filters': filters, 'search': search, 'sort': sort,
+                     'include_aggregations': include_aggregations},
+                    {'page': request.GET.get('page', 1), 'page_size': request.GET.get('page_size')}
+                )
+                cached = get_cached_result(cache_key)
+                if cached is not None:
+                    record_lookup('inquiry', 'hit')
+                    if should_log_hit():
+                        self.log_execution(
+                            inquiry=inquiry,
+                            user=request.user,
+                            filters=filters,
+                            search=search,
+                            sort=sort,
+                            result_count=cached.get('count', 0),
+                            request=request
+                        )
+                    return Response({**cached, 'cached': True})
+                record_lookup('inquiry', 'miss')
 
             # Build queryset
             builder = DynamicQueryBuilder(inquiry)
@@ -330,7 +361,6 @@ class InquiryExecutionViewSet(viewsets.ViewSet):
             )
 
             # Get aggregations if requested
-            include_aggregations = request.data.get('include_aggregations', False)
             aggregations = {}
             if include_aggregations:
                 aggregations = builder.get_aggregations(queryset)
@@ -341,7 +371,10 @@ class InquiryExecutionViewSet(viewsets.ViewSet):
                     queryset,
                     inquiry,
                     export_format,
-                    request.user
+                    request.user,
+                    background=request.data.get('background', False),
+                    export_parameters={'filters': filters, 'search': search, 'sort': sort},
+                    request=request
                 )
 
             # Paginate results
@@ -386,6 +419,8 @@ class InquiryExecutionViewSet(viewsets.ViewSet):
                     'code': inquiry.code
                 }
 
+                if cache_key:
+                    set_cached_result(cache_key, response_data, inquiry.cache_ttl)
                 return Response(response_data)
 
             # No pagination
@@ -408,7 +443,7 @@ class InquiryExecutionViewSet(viewsets.ViewSet):
                 request=request
             )
 
-            return Response({
+            response_data = {
                 'results': serializer.data,
                 'count': queryset.count(),
                 'aggregations': aggregations,
@@ -418,7 +453,10 @@ class InquiryExecutionViewSet(viewsets.ViewSet):
                     'display_name': inquiry.display_name,
                     'code': inquiry.code
                 }
-            })
+            }
+            if cache_key:
+                set_cached_result(cache_key, response_data, inquiry.cache_ttl)
+            return Response(response_data)
 
         except InquiryConfiguration.DoesNotExist:
             return Response(
@@ -597,8 +635,13 @@ class InquiryExecutionViewSet(viewsets.ViewSet):
             ip = request.META.get('REMOTE_ADDR')
         return ip
 
-    def export_data(self, queryset, inquiry, export_format, user):
-        """Export data in requested format"""
+    def export_data(self, queryset, inquiry, export_format, user,
+                    background=False, export_parameters=None, request=None):
+        """
+        Export data in requested format. With ``background`` the export is
+        queued as a job rebuilt from ``export_parameters`` (filters, search
+        and sort) and the job status is returned for polling.
+        """
         # Check export permission
         user_groups = user.groups.all()
         permission = inquiry.permissions.filter(group__in=user_groups).first()
@@ -620,96 +663,32 @@ class InquiryExecutionViewSet(viewsets.ViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-        # Serialize data
-        serializer = DynamicModelSerializer(
-            queryset,
-            many=True,
-            context={'inquiry': inquiry, 'request': None}
-        )
-        data = serializer.data
-
-        # Get visible fields for export
-        export_fields = inquiry.fields.filter(is_visible=True).order_by('order')
-
-        if export_format == 'csv':
-            return self.export_csv(data, export_fields, inquiry)
-        elif export_format == 'excel':
-            return self.export_excel(data, export_fields, inquiry)
-        elif export_format == 'json':
-            return self.export_json(data, inquiry)
-        else:
+        if export_format not in EXPORT_FORMATS:
             return Response(
                 {'error': 'Invalid export format'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    def export_csv(self, data, fields, inquiry):
-        """Export as CSV"""
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{inquiry.code}_export.csv"'
-
-        writer = csv.writer(response)
-
-        # Write headers
-        headers = [field.display_name for field in fields]
-        writer.writerow(headers)
-
-        # Write data
-        for row in data:
-            row_data = []
-            for field in fields:
-                value = row.get(field.field_path, '')
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                row_data.append(value)
-            writer.writerow(row_data)
-
-        return response
+        # Large exports are written to storage by a worker
+        if background:
+            job, created = request_export_job(
+                ExportJob.SOURCE_INQUIRY,
+                inquiry.pk,
+                export_format,
+                export_parameters or {},
+                user
+            )
+            return Response(
+                job_status(job, request),
+                status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK
+            )
 
-    def export_excel(self, data, fields, inquiry):
-        """Export as Excel"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = inquiry.display_name[:31]  # Excel sheet name limit
-
-        # Write headers
-        headers = [field.display_name for field in fields]
-        for col, header in enumerate(headers, 1):
-            ws.cell(row=1, column=col, value=header)
-
-        # Write data
-        for row_idx, row in enumerate(data, 2):
-            for col_idx, field in enumerate(fields, 1):
-                value = row.get(field.field_path, '')
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                ws.cell(row=row_idx, column=col_idx, value=value)
-
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        # Serialize rows a chunk at a time while the response streams
+        return streaming_response(
+            export_chunks(iter_export_rows(queryset, inquiry), inquiry, export_format),
+            EXPORT_FORMATS[export_format][0],
+            export_filename(inquiry, export_format)
         )
-        response['Content-Disposition'] = f'attachment; filename="{inquiry.code}_export.xlsx"'
-        wb.save(response)
-
-        return response
-
-    def export_json(self, data, inquiry):
-        """Export as JSON"""
-        response = HttpResponse(content_type='application/json')
-        response['Content-Disposition'] = f'attachment; filename="{inquiry.code}_export.json"'
-
-        export_data = {
-            'inquiry': {
-                'name': inquiry.name,
-                'code': inquiry.code,
-                'exported_at': time.strftime('%Y-%m-%d %H:%M:%S')
-            },
-            'data': data,
-            'count': len(data)
-        }
-
-        json.dump(export_data, response, indent=2)
-        return response
 
 
 class InquiryTemplateViewSet(viewsets.ModelViewSet):
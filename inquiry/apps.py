@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InquiryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'inquiry'
+
+    def ready(self):
+        import inquiry.signals  # noqa
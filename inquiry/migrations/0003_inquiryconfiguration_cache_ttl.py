@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-16 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inquiry', '0002_alter_inquiryfield_aggregation_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inquiryconfiguration',
+            name='cache_ttl',
+            field=models.PositiveIntegerField(blank=True, help_text='Cache execution results for this many seconds. Leave empty to disable caching.', null=True),
+        ),
+    ]
@@ -31,6 +31,13 @@ class InquiryConfiguration(models.Model):
     enable_search = models.BooleanField(default=True)
     search_fields = models.JSONField(default=list, blank=True)  # Global search fields
 
+    # Result caching
+    cache_ttl = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Cache execution results for this many seconds. Leave empty to disable caching."
+    )
+
     # Status
     active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,99 @@
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator
+
+from inquiry.apis.serializers.dynamic import DynamicModelSerializer
+from inquiry.models import InquiryConfiguration
+from utils.streaming_export import (
+    CSV_CONTENT_TYPE, JSON_CONTENT_TYPE, XLSX_CONTENT_TYPE, CountingIterator,
+    csv_chunks, get_chunk_size, json_chunks, xlsx_chunks,
+)
+
+# export format -> (content type, file extension)
+EXPORT_FORMATS = {
+    'csv': (CSV_CONTENT_TYPE, 'csv'),
+    'excel': (XLSX_CONTENT_TYPE, 'xlsx'),
+    'json': (JSON_CONTENT_TYPE, 'json'),
+}
+
+
+def iter_export_rows(queryset, inquiry, chunk_size=None) -> Iterator[Dict[str, Any]]:
+    """
+    Rows of ``queryset`` serialized by DynamicModelSerializer, fetched
+    with ``iterator(chunk_size=...)`` and serialized one chunk at a time.
+    """
+    chunk_size = chunk_size or get_chunk_size()
+    context = {'inquiry': inquiry, 'request': None}
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield from DynamicModelSerializer(chunk, many=True, context=context).data
+            chunk = []
+    if chunk:
+        yield from DynamicModelSerializer(chunk, many=True, context=context).data
+
+
+def export_value(row, field):
+    value = row.get(field.field_path, '')
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return value
+
+
+def export_filename(inquiry, export_format):
+    return f"{inquiry.code}_export.{EXPORT_FORMATS[export_format][1]}"
+
+
+def export_chunks(rows: Iterable[Dict[str, Any]], inquiry, export_format) -> Iterator[bytes]:
+    """Bytes of ``rows`` exported as ``export_format``, produced while the rows are consumed."""
+    # Visible fields for export
+    fields = list(inquiry.fields.filter(is_visible=True).order_by('order'))
+
+    if export_format == 'csv':
+        return csv_chunks(
+            [field.display_name for field in fields],
+            ([export_value(row, field) for field in fields] for row in rows)
+        )
+
+    if export_format == 'excel':
+        def write(wb):
+            ws = wb.create_sheet(inquiry.display_name[:31])  # Excel sheet name limit
+            ws.append([field.display_name for field in fields])
+            for row in rows:
+                ws.append([export_value(row, field) for field in fields])
+        return xlsx_chunks(write)
+
+    if export_format == 'json':
+        rows = CountingIterator(rows)
+        head = {
+            'inquiry': {
+                'name': inquiry.name,
+                'code': inquiry.code,
+                'exported_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            },
+        }
+        return json_chunks(rows, head=head, tail=lambda: {'count': rows.count})
+
+    raise ValueError(f"Invalid export format '{export_format}'")
+
+
+def export_job_chunks(job, progress):
+    """Writer for background inquiry export jobs (see reporting_templates.services.export_jobs)."""
+    from inquiry.services.query_builder import DynamicQueryBuilder
+
+    inquiry = InquiryConfiguration.objects.get(pk=job.source_id, active=True)
+    options = job.parameters
+    queryset = DynamicQueryBuilder(inquiry).build_queryset(
+        filters=options.get('filters'),
+        search=options.get('search'),
+        sort=options.get('sort'),
+        user=job.requested_by
+    )
+    rows = CountingIterator(iter_export_rows(queryset, inquiry), on_progress=progress)
+
+    def chunks():
+        yield from export_chunks(rows, inquiry, job.export_format)
+        progress(rows.count)
+
+    return chunks(), export_filename(inquiry, job.export_format), EXPORT_FORMATS[job.export_format][0]
@@ -0,0 +1,40 @@
+"""
+Result cache for inquiry executions (see utils.result_cache).
+
+The definition version is bumped when the inquiry or any of its fields,
+filters, relations, sorts or permissions changes (inquiry.signals).
+"""
+from utils.result_cache import get_version, result_cache_key
+
+
+def definition_version_name(inquiry_id):
+    return f"inquiry:{inquiry_id}"
+
+
+def permission_scope(inquiry, user):
+    """
+    What, besides the request, decides which rows ``user`` sees: nothing for
+    public inquiries, otherwise the user's groups - plus the user when the
+    group permission restricts rows to their own.
+    """
+    if inquiry.is_public:
+        return 'public'
+
+    group_ids = sorted(user.groups.values_list('id', flat=True))
+    scope = {'groups': group_ids, 'superuser': user.is_superuser}
+    permission = inquiry.permissions.filter(group__in=group_ids).first()
+    if permission and not permission.can_view_all:
+        scope['user'] = user.pk
+    return scope
+
+
+def inquiry_cache_key(inquiry, user, parameters, page):
+    return result_cache_key(
+        'inquiry',
+        inquiry.pk,
+        get_version(definition_version_name(inquiry.pk)),
+        [inquiry.content_type.model_class()._meta.label_lower],
+        parameters,
+        permission_scope(inquiry, user),
+        page
+    )
@@ -0,0 +1,51 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from inquiry.models import (
+    InquiryConfiguration, InquiryField, InquiryFilter,
+    InquiryPermission, InquiryRelation, InquirySort
+)
+from inquiry.services.result_cache import definition_version_name
+from utils.result_cache import (
+    bump_version, connect_dependency_signals, register_tracked_models, reset_tracked_models
+)
+
+# Every model whose rows shape an inquiry's results.
+DEFINITION_MODELS = (InquiryField, InquiryFilter, InquiryRelation, InquirySort, InquiryPermission)
+
+
+def invalidate_inquiry_results(sender, instance, **kwargs):
+    inquiry_id = instance.pk if isinstance(instance, InquiryConfiguration) else instance.inquiry_id
+    transaction.on_commit(lambda: bump_version(definition_version_name(inquiry_id)))
+    if sender is InquiryConfiguration:
+        reset_tracked_models()
+
+
+def invalidate_inquiry_groups(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    inquiry_ids = (pk_set or ()) if reverse else (instance.pk,)
+    for inquiry_id in inquiry_ids:
+        transaction.on_commit(lambda inquiry_id=inquiry_id: bump_version(definition_version_name(inquiry_id)))
+
+
+def cached_inquiry_models():
+    """Models read by inquiries with result caching enabled."""
+    content_types = ContentType.objects.filter(
+        id__in=InquiryConfiguration.objects.filter(cache_ttl__isnull=False).values('content_type_id')
+    )
+    return {f"{content_type.app_label}.{content_type.model}" for content_type in content_types}
+
+
+for model in (InquiryConfiguration,) + DEFINITION_MODELS:
+    post_save.connect(invalidate_inquiry_results, sender=model,
+                      dispatch_uid=f"inquiry_results_save_{model._meta.label_lower}")
+    post_delete.connect(invalidate_inquiry_results, sender=model,
+                        dispatch_uid=f"inquiry_results_delete_{model._meta.label_lower}")
+
+m2m_changed.connect(invalidate_inquiry_groups, sender=InquiryConfiguration.allowed_groups.through,
+                    dispatch_uid="inquiry_results_m2m_allowed_groups")
+
+register_tracked_models(cached_inquiry_models)
+connect_dependency_signals()
@@ -41,7 +41,8 @@ class FieldIntegrationAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Response Handling', {
-            'fields': ('update_field_on_response', 'response_field_path', 'response_field_mapping'),
+            'fields': ('update_field_on_response', 'response_field_path', 'response_field_mapping',
+                       'cache_ttl'),
             'classes': ('collapse',)
         })
     )
@@ -89,7 +90,8 @@ class IntegrationAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Response & Retry Configuration', {
-            'fields': ('response_mapping', 'max_retries', 'retry_delay'),
+            'fields': ('response_mapping', 'max_retries', 'retry_delay', 'http_retries',
+                       'timeout', 'rate_limit', 'cache_ttl', 'cache_stale_ttl'),
             'classes': ('collapse',)
         })
     )
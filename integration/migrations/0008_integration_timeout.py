@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-16 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integration', '0007_integration_auth_credentials'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='integration',
+            name='timeout',
+            field=models.PositiveIntegerField(blank=True, help_text='Request timeout in seconds. Defaults to the INTEGRATION_HTTP_TIMEOUT setting.', null=True),
+        ),
+    ]
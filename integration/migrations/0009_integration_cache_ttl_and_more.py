@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-16 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integration', '0008_integration_timeout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='integration',
+            name='cache_ttl',
+            field=models.PositiveIntegerField(blank=True, help_text='Cache successful responses for this many seconds. Leave empty to disable caching.', null=True),
+        ),
+        migrations.AddField(
+            model_name='integration',
+            name='cache_stale_ttl',
+            field=models.PositiveIntegerField(blank=True, help_text='GET only: keep serving an expired cached response for this many seconds while it is refreshed.', null=True),
+        ),
+        migrations.AddField(
+            model_name='fieldintegration',
+            name='cache_ttl',
+            field=models.PositiveIntegerField(blank=True, help_text="Cache responses for this many seconds (0 disables). Empty uses the integration's setting.", null=True),
+        ),
+    ]
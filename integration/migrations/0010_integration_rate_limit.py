@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-16 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integration', '0009_integration_cache_ttl_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='integration',
+            name='rate_limit',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum calls per API_TRIGGER_RATE_LIMIT_WINDOW across all cases. Leave empty for no limit.', null=True),
+        ),
+    ]
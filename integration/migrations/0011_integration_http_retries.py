@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integration', '0010_integration_rate_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='integration',
+            name='http_retries',
+            field=models.PositiveIntegerField(default=0, help_text='Immediate retries of a request on connection errors and 502/503/504 responses. Separate from max_retries, which re-queues the background task.'),
+        ),
+    ]
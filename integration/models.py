@@ -66,6 +66,31 @@ class Integration(models.Model):
     response_mapping = models.JSONField(default=dict, blank=True)
     max_retries = models.IntegerField(default=3)
     retry_delay = models.IntegerField(default=60)
+    http_retries = models.PositiveIntegerField(
+        default=0,
+        help_text="Immediate retries of a request on connection errors and 502/503/504 responses. "
+                  "Separate from max_retries, which re-queues the background task."
+    )
+    timeout = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Request timeout in seconds. Defaults to the INTEGRATION_HTTP_TIMEOUT setting."
+    )
+    rate_limit = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Maximum calls per API_TRIGGER_RATE_LIMIT_WINDOW across all cases. Leave empty for no limit."
+    )
+    cache_ttl = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Cache successful responses for this many seconds. Leave empty to disable caching."
+    )
+    cache_stale_ttl = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="GET only: keep serving an expired cached response for this many seconds while it is refreshed."
+    )
 
     def __str__(self):
         return self.name
@@ -93,24 +118,33 @@ class Integration(models.Model):
 
         return url
 
-    def make_api_request(self, body=None, query_params=None, headers=None, path_params=None):
+    def resolve_url(self, path_params=None):
+        return self.build_url(path_params) if path_params else self.endpoint
+
+    def make_api_request(self, body=None, query_params=None, headers=None, path_params=None,
+                         cache_ttl=None):
         """
         Enhanced method that handles URL path parameters.
         """
-        # Build the final URL with path parameters
-        if path_params:
-            url = self.build_url(path_params)
-        else:
-            url = self.endpoint
-
-        # Use the existing helper with the built URL
-        helper = APIRequestHelper(self)
-        # We need to modify the helper to accept a custom URL
-        return helper.call_api(
+        return APIRequestHelper(self).call_api(
+            body=body,
+            query_params=query_params,
+            headers=headers,
+            custom_url=self.resolve_url(path_params),
+            cache_ttl=cache_ttl
+        )
+
+    async def amake_api_request(self, body=None, query_params=None, headers=None, path_params=None,
+                                cache_ttl=None):
+        """
+        Awaitable ``make_api_request``, for firing several integrations concurrently.
+        """
+        return await APIRequestHelper(self).acall_api(
             body=body,
             query_params=query_params,
             headers=headers,
-            custom_url=url  # Pass the built URL
+            custom_url=self.resolve_url(path_params),
+            cache_ttl=cache_ttl
         )
 
 
@@ -151,6 +185,13 @@ class FieldIntegration(models.Model):
         help_text="Override integration's path parameters. Example: {'number': 'national_id'}"
     )
 
+    # Overrides the integration's cache_ttl for calls made through this field
+    cache_ttl = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Cache responses for this many seconds (0 disables). Empty uses the integration's setting."
+    )
+
     # Response handling
     update_field_on_response = models.BooleanField(default=False)
     response_field_path = models.CharField(max_length=255, blank=True)
@@ -166,6 +207,16 @@ class FieldIntegration(models.Model):
     def __str__(self):
         return f"{self.field._field_name} -> {self.integration.name} ({self.trigger_event})"
 
+    def should_execute(self, field_value, case_data):
+        """
+        Whether ``condition_expression`` (if any) holds for the current data.
+        """
+        if not self.condition_expression:
+            return True
+        from case.utils.expression_evaluator import eval_expression
+
+        return bool(eval_expression(
+            self.condition_expression, {'field_value': field_value}, case_data or {}))
 
     def prepare_request_data(self, case_data, field_value):
         """
@@ -216,68 +267,3 @@ class FieldIntegration(models.Model):
 
         return payload, query_params, headers, path_params  # Now returns 4 values
 
-
-# utils/integration_helper.py - Updated helper to handle custom URLs
-
-import requests
-from base64 import b64encode
-
-
-class APIRequestHelper:
-    def __init__(self, integration):
-        self.integration = integration
-
-    def call_api(self, body=None, query_params=None, headers=None, custom_url=None):
-        """
-        Make API request with support for custom URLs (with replaced path parameters).
-        """
-        # Use custom URL if provided, otherwise use the integration's endpoint
-        url = custom_url or self.integration.endpoint
-
-        method = self.integration.method
-
-        # Build headers
-        request_headers = {
-            'Content-Type': 'application/json',
-            **(self.integration.headers or {}),
-            **(headers or {})
-        }
-
-        # Add authentication
-        if self.integration.authentication_type == 'Basic':
-            credentials = f"{self.integration.auth_credentials.get('username')}:{self.integration.auth_credentials.get('password')}"
-            request_headers['Authorization'] = f'Basic {b64encode(credentials.encode()).decode()}'
-        elif self.integration.authentication_type == 'Bearer':
-            request_headers['Authorization'] = f"Bearer {self.integration.auth_credentials.get('token')}"
-
-        # Merge query parameters
-        final_query_params = {
-            **(self.integration.query_params or {}),
-            **(query_params or {})
-        }
-
-        # Merge request body
-        if method in ['POST', 'PUT', 'PATCH']:
-            final_body = {
-                **(self.integration.request_body or {}),
-                **(body or {})
-            }
-        else:
-            final_body = None
-
-        # Make the request
-        response = requests.request(
-            method=method,
-            url=url,
-            headers=request_headers,
-            json=final_body,
-            params=final_query_params
-        )
-
-        response.raise_for_status()
-
-        # Return JSON response if available
-        try:
-            return response.json()
-        except:
-            return {'status_code': response.status_code, 'text': response.text}
\ No newline at end of file
@@ -1 +1,222 @@
-# Create your tests here.
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import LiveServerTestCase, TestCase, override_settings
+from urllib3.connectionpool import HTTPConnectionPool
+
+from dynamicflow.models import Field
+from dynamicflow.services.api_trigger_service import APITriggerService
+from integration.models import FieldIntegration, Integration
+from utils import http_client, integration_cache
+from utils.integration_helper import APIRequestHelper
+from utils.rate_limiter import SlidingWindowRateLimiter, acquire_all
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+
+NATIONAL_NUMBERS = {
+    '1231231230': 'Adam',
+    '1231231231': 'Yousef',
+    '1231231232': 'Mariam',
+}
+
+
+class MockApiIntegrationTests(LiveServerTestCase):
+    """Integrations calling the mock API through the pooled HTTP client."""
+
+    def setUp(self):
+        # Before the live server stops, so no request thread outlives it
+        self.addCleanup(http_client.close_sessions)
+        self.integration = Integration.objects.create(
+            name='Beneficiary info', integration_type='API', method='GET',
+            endpoint=f'{self.live_server_url}/mock_api/user_info/{{number}}/')
+
+    def test_session_reuses_connections(self):
+        new_conn = mock.patch.object(HTTPConnectionPool, '_new_conn', autospec=True,
+                                     side_effect=HTTPConnectionPool._new_conn)
+        with new_conn as new_conn:
+            for number, first_name in NATIONAL_NUMBERS.items():
+                response = self.integration.make_api_request(
+                    path_params={'number': number})
+                self.assertEqual(response['first_name_enu'], first_name)
+        self.assertEqual(new_conn.call_count, 1)
+
+    def test_field_integrations_run_concurrently(self):
+        calls = []
+        for number in NATIONAL_NUMBERS:
+            field = Field.objects.create(_field_name=f'national_number_{number}')
+            field_integration = FieldIntegration.objects.create(
+                field=field, integration=self.integration, trigger_event='on_change')
+            request_data = {'body': None, 'query_params': None, 'headers': None,
+                            'path_params': {'number': number}}
+            calls.append((field_integration, request_data))
+        # Every request waits until all of them have started; sent one after
+        # another, the first would time out here.
+        started = threading.Barrier(len(calls), timeout=5)
+
+        def send_request(*args, **kwargs):
+            started.wait()
+            return http_client.send_request(*args, **kwargs)
+
+        with mock.patch('utils.integration_helper.send_request',
+                        side_effect=send_request):
+            results = APITriggerService.execute_concurrently(calls)
+
+        first_names = [response['first_name_enu'] for response, _ in results]
+        self.assertEqual(first_names, list(NATIONAL_NUMBERS.values()))
+
+    def test_task_retries_are_not_http_retries(self):
+        helper = APIRequestHelper(self.integration)
+        self.integration.max_retries = 3
+        self.assertEqual(helper.build_request()['retries'], 0)
+
+        self.integration.http_retries = 2
+        self.assertEqual(helper.build_request()['retries'], 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class IntegrationResponseCacheTests(TestCase):
+    """Responses of integrations with a cache TTL are reused until they expire."""
+
+    def setUp(self):
+        cache.clear()
+        self.integration = Integration.objects.create(
+            name='Beneficiary info', integration_type='API', method='GET',
+            endpoint='https://registry.example.com/user_info/{number}/', cache_ttl=60)
+        patcher = mock.patch('utils.integration_helper.send_request')
+        self.send_request = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.respond('Adam')
+
+    def respond(self, first_name):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {'first_name_enu': first_name}
+        self.send_request.return_value = response
+
+    def lookup(self, integration=None, **kwargs):
+        response = (integration or self.integration).make_api_request(
+            path_params={'number': '1231231230'}, **kwargs)
+        return response['first_name_enu']
+
+    def test_concurrent_identical_calls_share_one_request(self):
+        release = threading.Event()
+        response = self.send_request.return_value
+
+        def send_request(**request):
+            release.wait(5)
+            return response
+
+        self.send_request.side_effect = send_request
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            lookups = [executor.submit(self.lookup) for _ in range(4)]
+            time.sleep(0.1)
+            release.set()
+            first_names = [lookup.result() for lookup in lookups]
+
+        self.assertEqual(first_names, ['Adam'] * 4)
+        self.assertEqual(self.send_request.call_count, 1)
+
+    def test_expired_get_response_is_served_while_refreshing(self):
+        self.integration.cache_stale_ttl = 30
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            self.assertEqual(self.lookup(), 'Adam')
+
+        self.respond('Adam Jr')
+        # Run the background refresh inline
+        executor = mock.Mock(submit=lambda fn: fn())
+        get_executor = mock.patch.object(
+            integration_cache, 'get_executor', return_value=executor)
+        with mock.patch('time.time', return_value=now + 61), get_executor:
+            self.assertEqual(self.lookup(), 'Adam')
+            self.assertEqual(self.lookup(), 'Adam Jr')
+        self.assertEqual(self.send_request.call_count, 2)
+
+    def test_post_is_cached_only_when_opted_in(self):
+        search = Integration.objects.create(
+            name='Beneficiary search', integration_type='API', method='POST',
+            endpoint='https://registry.example.com/search/{number}/',
+            cache_stale_ttl=30)
+        self.lookup(search)
+        self.lookup(search)
+        self.assertEqual(self.send_request.call_count, 2)
+
+        search.cache_ttl = 60
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            self.lookup(search)
+            self.lookup(search)
+        self.assertEqual(self.send_request.call_count, 3)
+
+        # Never served stale, whatever its cache_stale_ttl
+        with mock.patch('time.time', return_value=now + 61):
+            self.lookup(search)
+        self.assertEqual(self.send_request.call_count, 4)
+
+    def test_field_override_applies_to_queued_calls(self):
+        self.integration.cache_ttl = None
+        self.integration.save()
+        field = Field.objects.create(_field_name='national_number')
+        field_integration = FieldIntegration.objects.create(
+            field=field, integration=self.integration, trigger_event='on_change',
+            cache_ttl=60)
+
+        for _ in range(2):
+            APITriggerService._execute_integration_async.apply(
+                args=(field_integration.id, None, None, None, {'number': '1231231230'}))
+        self.assertEqual(self.send_request.call_count, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RateLimitTests(TestCase):
+    """Calls over a sliding-window limit are deferred, not dropped."""
+    window_start = 60 * 1000
+
+    def setUp(self):
+        cache.clear()
+
+    def test_previous_window_counts_towards_the_limit(self):
+        limiter = SlidingWindowRateLimiter('lookup', limit=2)
+        self.assertEqual(limiter.acquire(self.window_start), 0)
+        self.assertEqual(limiter.acquire(self.window_start + 1), 0)
+        self.assertEqual(limiter.acquire(self.window_start + 15), 45)
+
+        # Half way into the next window half of the previous calls still count
+        self.assertEqual(limiter.acquire(self.window_start + 90), 0)
+        self.assertEqual(limiter.acquire(self.window_start + 90), 30)
+        self.assertEqual(limiter.acquire(self.window_start + 120), 0)
+
+    def test_refused_call_takes_no_slot_from_other_limits(self):
+        per_case = SlidingWindowRateLimiter('lookup:case', limit=1)
+        per_integration = SlidingWindowRateLimiter('lookup', limit=1)
+        self.assertEqual(per_integration.acquire(self.window_start), 0)
+
+        self.assertTrue(acquire_all([per_case, per_integration], self.window_start))
+        self.assertEqual(per_case.acquire(self.window_start), 0)
+
+    def test_over_limit_call_is_requeued(self):
+        integration = Integration.objects.create(
+            name='Beneficiary info', integration_type='API', method='GET',
+            endpoint='https://registry.example.com/user_info/{number}/', rate_limit=1)
+        field_integration = FieldIntegration.objects.create(
+            field=Field.objects.create(_field_name='national_number'),
+            integration=integration, trigger_event='on_change')
+        task = APITriggerService._execute_integration_async
+        args = (field_integration.id, None, None, None, {'number': '1231231230'})
+
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {'first_name_enu': 'Adam'}
+        with mock.patch('utils.integration_helper.send_request',
+                        return_value=response) as send_request, \
+                mock.patch.object(task, 'apply_async') as requeue:
+            task.apply(args=args)
+            task.apply(args=args)
+
+        send_request.assert_called_once()
+        requeue.assert_called_once()
+        self.assertEqual(requeue.call_args.kwargs['args'], args + (None, None))
+        self.assertGreater(requeue.call_args.kwargs['countdown'], 0)
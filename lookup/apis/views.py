@@ -5,8 +5,15 @@ from rest_framework.generics import ListAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
+from dynamicflow.utils.flow_cache import get_flow_version
 from lookup.apis.serializers import GenericLookupsSerializer
 from lookup.models import Lookup
+from utils.conditional_get import conditional_get, make_etag
+
+
+def lookups_etag(request, *args, **kwargs):
+    # Saving or deleting a Lookup bumps the flow version (dynamicflow.signals)
+    return make_etag(request, get_flow_version())
 
 
 class LookupFilter(filters.FilterSet):
@@ -28,6 +35,10 @@ class RetrieveLookupsListAPIView(ListAPIView):
     filter_backends = (filters.DjangoFilterBackend,)  # Enable filtering
     filterset_class = LookupFilter  # Use the LookupFilter for this view
 
+    @conditional_get(lookups_etag)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 class LookupViewSet(viewsets.ModelViewSet):
     """
@@ -55,7 +66,12 @@ class LookupViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @conditional_get(lookups_etag)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"], url_path="parents")
+    @conditional_get(lookups_etag)
     def get_parent_lookups(self, request):
         """
         Extra endpoint to return only parent lookups (type == 1).
@@ -475,7 +475,7 @@ class ReportScheduleAdmin(admin.ModelAdmin):
 class SavedReportResultAdmin(admin.ModelAdmin):
     list_display = ['name', 'report', 'saved_by', 'saved_at', 'row_count',
                     'expires_at', 'is_public']
-    list_filter = ['is_public', 'saved_at', 'expires_at']
+    list_filter = ['is_public', 'is_cache_entry', 'saved_at', 'expires_at']
     search_fields = ['name', 'description', 'report__name', 'saved_by__username']
     list_select_related = ['report', 'saved_by', 'execution']
     filter_horizontal = ['shared_with_users', 'shared_with_groups']
@@ -339,8 +339,8 @@ class ReportSerializer(serializers.ModelSerializer):
             'id', 'name', 'description', 'report_type', 'is_active',
             'is_public', 'tags', 'category', 'created_by', 'created_by_username',
             'shared_with_users', 'shared_with_groups', 'created_at',
-            'updated_at', 'config', 'data_sources', 'fields', 'filters',
-            'joins', 'parameters', 'can_edit', 'can_execute'
+            'updated_at', 'config', 'cache_ttl', 'cache_durable', 'data_sources',
+            'fields', 'filters', 'joins', 'parameters', 'can_edit', 'can_execute'
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
 
@@ -584,6 +584,7 @@ class ReportExecutionRequestSerializer(serializers.Serializer):
         default='json'
     )
     save_result = serializers.BooleanField(default=False)
+    background = serializers.BooleanField(default=False)
     result_name = serializers.CharField(required=False, max_length=255)
     result_description = serializers.CharField(required=False)
 
@@ -95,9 +95,39 @@ class ReportViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         data = serializer.validated_data
+        export_format = data.get('export_format', 'json')
 
-        # Build and execute query
+        # Build query
         builder = ReportQueryBuilder(report, user=request.user)
+
+        # Background exports are written to storage by a worker
+        if data.get('background'):
+            result = builder.execute(
+                parameters=data['parameters'],
+                limit=data.get('limit'),
+                offset=data.get('offset'),
+                export_format=export_format,
+                background=True
+            )
+            return Response(
+                result['job'],
+                status=status.HTTP_202_ACCEPTED if result['created'] else status.HTTP_200_OK
+            )
+
+        # File exports stream rows straight from the database
+        if export_format in ('csv', 'excel'):
+            try:
+                rows = builder.stream_rows(
+                    parameters=data['parameters'],
+                    limit=data.get('limit'),
+                    offset=data.get('offset'),
+                    export_format=export_format
+                )
+            except Exception as e:
+                return Response({'success': False, 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return ReportExporter().stream(report, rows, export_format)
+
+        # Execute query
         result = builder.execute(
             parameters=data['parameters'],
             limit=data.get('limit'),
@@ -109,16 +139,8 @@ class ReportViewSet(viewsets.ModelViewSet):
             return Response(result, status=status.HTTP_400_BAD_REQUEST)
 
         # Handle export formats
-        export_format = data.get('export_format', 'json')
-        if export_format != 'json':
-            exporter = ReportExporter()
-
-            if export_format == 'csv':
-                return exporter.export_csv(report, result['data'])
-            elif export_format == 'excel':
-                return exporter.export_excel(report, result['data'])
-            elif export_format == 'pdf':
-                return exporter.export_pdf(report, result['data'])
+        if export_format == 'pdf':
+            return ReportExporter().export_pdf(report, result['data'])
 
         # Save result if requested
         if data.get('save_result'):
@@ -518,7 +540,8 @@ class ReportScheduleViewSet(viewsets.ModelViewSet):
 
 class SavedReportResultViewSet(viewsets.ModelViewSet):
     """ViewSet for managing saved report results."""
-    queryset = SavedReportResult.objects.all()
+    # Durable cache rows belong to the report cache, not to the user's saved results
+    queryset = SavedReportResult.objects.filter(is_cache_entry=False)
     serializer_class = SavedReportResultSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -9,7 +9,7 @@ class ReportingConfig(AppConfig):
     def ready(self):
         """Initialize the app when Django starts."""
         # Import signal handlers
-        # from . import signals  # noqa
+        from . import signals  # noqa
 
         # Register any startup tasks
         self._register_permissions()
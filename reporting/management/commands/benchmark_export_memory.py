@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import multiprocessing
+import resource
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from utils.streaming_export import csv_chunks, json_chunks, xlsx_chunks
+
+HEADER = ['id', 'reference', 'applicant', 'amount', 'status', 'submitted_on', 'notes']
+
+
+def _rows(count):
+    for index in range(count):
+        yield [
+            index,
+            f"REF-{index:08d}",
+            f"Applicant {index % 997}",
+            Decimal(index * 13 % 100000) / 100,
+            'approved' if index % 3 else 'pending',
+            date(2026, 1 + index % 12, 1 + index % 28),
+            'x' * (index % 40),
+        ]
+
+
+def _in_memory(export_format, count):
+    """The previous exporters: materialize every row, then build the whole file."""
+    rows = list(_rows(count))
+    if export_format == 'csv':
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+        return len(output.getvalue().encode('utf-8'))
+    if export_format == 'json':
+        data = [dict(zip(HEADER, row)) for row in rows]
+        return len(json.dumps({'data': data, 'count': len(data)}, default=str).encode('utf-8'))
+
+    from openpyxl import Workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.append(HEADER)
+    for row in rows:
+        ws.append(row)
+    output = io.BytesIO()
+    wb.save(output)
+    return len(output.getvalue())
+
+
+def _streamed(export_format, count):
+    if export_format == 'csv':
+        chunks = csv_chunks(HEADER, _rows(count))
+    elif export_format == 'json':
+        chunks = json_chunks(dict(zip(HEADER, row)) for row in _rows(count))
+    else:
+        def write(wb):
+            ws = wb.create_sheet('Data')
+            ws.append(HEADER)
+            for row in _rows(count):
+                ws.append(row)
+        chunks = xlsx_chunks(write)
+    return sum(len(chunk) for chunk in chunks)
+
+
+def _measure(queue, mode, export_format, count):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    size = (_in_memory if mode == 'in-memory' else _streamed)(export_format, count)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux
+    queue.put((max(peak - baseline, 0) / 1024, elapsed, size))
+
+
+class Command(BaseCommand):
+    help = ('Export synthetic rows as CSV, JSON and XLSX, building the whole file in memory '
+            'versus the streaming writers, and report the peak RSS growth of each run')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--formats', nargs='+', default=['csv', 'json', 'xlsx'],
+                            choices=['csv', 'json', 'xlsx'])
+
+    def handle(self, *args, **options):
+        count = options['rows']
+        self.stdout.write(f"{count} rows, peak RSS growth per 100k rows")
+
+        # Each run gets a fresh process so the peaks are independent
+        context = multiprocessing.get_context('fork')
+        for export_format in options['formats']:
+            results = {}
+            for mode in ('in-memory', 'streamed'):
+                queue = context.Queue()
+                process = context.Process(target=_measure, args=(queue, mode, export_format, count))
+                process.start()
+                result = queue.get()
+                process.join()
+                if process.exitcode:
+                    self.stderr.write(f"[ERROR] {export_format} {mode} run exited with {process.exitcode}.")
+                    return
+                results[mode] = result
+
+            for mode, (peak_mb, elapsed, size) in results.items():
+                per_100k = peak_mb * 100000 / max(count, 1)
+                self.stdout.write(
+                    f"  {export_format:<5} {mode:<10} {per_100k:8.1f} MB  "
+                    f"{elapsed:6.2f} s  {size / 1024 / 1024:7.1f} MB output"
+                )
+            before, after = results['in-memory'][0], results['streamed'][0]
+            if after:
+                self.stdout.write(f"✅ {export_format}: {before / after:.1f}x less peak memory")
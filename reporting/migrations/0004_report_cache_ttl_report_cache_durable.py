@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-16 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reporting', '0003_alter_report_created_by_alter_report_updated_by_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='cache_ttl',
+            field=models.PositiveIntegerField(blank=True, help_text='Cache execution results for this many seconds. Leave empty to disable caching.', null=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='cache_durable',
+            field=models.BooleanField(default=False, help_text='Also keep cached results as saved results, reused after the cache is cleared.'),
+        ),
+    ]
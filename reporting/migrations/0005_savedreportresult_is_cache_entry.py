@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-16 20:40
+
+from django.db import migrations, models
+
+
+def mark_cache_entries(apps, schema_editor):
+    # Rows written by the durable report cache before the flag existed
+    SavedReportResult = apps.get_model('reporting', 'SavedReportResult')
+    SavedReportResult.objects.filter(
+        name__endswith=' - Cached result', report__cache_durable=True,
+    ).update(is_cache_entry=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reporting', '0004_report_cache_ttl_report_cache_durable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='savedreportresult',
+            name='is_cache_entry',
+            field=models.BooleanField(default=False, editable=False, help_text='Durable copy of a cached execution (Report.cache_durable), not saved by a user.'),
+        ),
+        migrations.RunPython(mark_cache_entries, migrations.RunPython.noop),
+    ]
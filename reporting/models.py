@@ -40,6 +40,17 @@ class Report(ModelCommonMixin):
     # Configuration
     config = models.JSONField(default=dict, blank=True)  # Additional configuration
 
+    # Result caching
+    cache_ttl = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Cache execution results for this many seconds. Leave empty to disable caching."
+    )
+    cache_durable = models.BooleanField(
+        default=False,
+        help_text="Also keep cached results as saved results, reused after the cache is cleared."
+    )
+
     class Meta:
         ordering = ['-created_at']
         permissions = [
@@ -495,6 +506,10 @@ class SavedReportResult(ModelCommonMixin):
     saved_by = models.ForeignKey(User, on_delete=models.CASCADE)
     saved_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(null=True, blank=True)
+    is_cache_entry = models.BooleanField(
+        default=False, editable=False,
+        help_text="Durable copy of a cached execution (Report.cache_durable), not saved by a user."
+    )
 
     # Sharing
     is_public = models.BooleanField(default=False)
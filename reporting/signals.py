@@ -0,0 +1,37 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from reporting.models import Report, ReportDataSource, ReportField, ReportFilter, ReportJoin
+from reporting.utils.report_plan import bump_plan_version
+from utils.result_cache import connect_dependency_signals, register_tracked_models, reset_tracked_models
+
+# Every model whose rows end up in a compiled report plan.
+PLAN_MODELS = (ReportDataSource, ReportField, ReportFilter, ReportJoin)
+
+
+def invalidate_report_plan(sender, instance, **kwargs):
+    report_id = instance.pk if sender is Report else instance.report_id
+    # Bump after commit so no request can compile the pre-change definition
+    # under the new version while the transaction is still open.
+    transaction.on_commit(lambda: bump_plan_version(report_id))
+    if sender in (Report, ReportDataSource):
+        reset_tracked_models()
+
+
+def cached_report_models():
+    """Models read by reports with result caching enabled."""
+    content_types = ContentType.objects.filter(
+        id__in=ReportDataSource.objects.filter(report__cache_ttl__isnull=False).values('content_type_id')
+    )
+    return {f"{content_type.app_label}.{content_type.model}" for content_type in content_types}
+
+
+for model in (Report,) + PLAN_MODELS:
+    post_save.connect(invalidate_report_plan, sender=model,
+                      dispatch_uid=f"report_plan_save_{model._meta.label_lower}")
+    post_delete.connect(invalidate_report_plan, sender=model,
+                        dispatch_uid=f"report_plan_delete_{model._meta.label_lower}")
+
+register_tracked_models(cached_report_models)
+connect_dependency_signals()
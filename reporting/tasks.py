@@ -0,0 +1,14 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def purge_expired_cached_results_task():
+    """Delete durable report cache rows past their expiry (schedule with celery beat)."""
+    from reporting.utils.query_builder import purge_expired_cached_results
+
+    count = purge_expired_cached_results()
+    logger.info(f"Purged {count} expired cached report results")
+    return count
@@ -1,3 +1,85 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from reporting.models import Report, ReportDataSource, ReportField, ReportFilter
+from reporting.utils.query_builder import ReportQueryBuilder
+from utils import result_cache
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReportResultCacheTests(TestCase):
+    """Cached report results last until they expire or their rows change."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.alice = User.objects.create_user(
+            username='alice', email='alice@example.com', password='secret')
+        cls.bob = User.objects.create_user(
+            username='bob', email='bob@example.com', password='secret')
+        Group.objects.create(name='Reviewers')
+
+        cls.report = Report.objects.create(name='Groups', cache_ttl=60)
+        source = ReportDataSource.objects.create(
+            report=cls.report, content_type=ContentType.objects.get_for_model(Group),
+            alias='group', is_primary=True)
+        ReportField.objects.create(
+            report=cls.report, data_source=source, field_name='name',
+            field_path='name', display_name='Name', field_type='CharField')
+        # Bound to the caller, so every user gets their own cache entry
+        ReportFilter.objects.create(
+            report=cls.report, data_source=source, field_name='name',
+            field_path='name', operator='ne', value='current_user_email',
+            value_type='dynamic')
+
+    def setUp(self):
+        cache.clear()
+        result_cache.reset_tracked_models()
+        result_cache.refresh_tracked_models()
+
+    def execute(self, user):
+        result = ReportQueryBuilder(self.report, user).execute()
+        self.assertTrue(result['success'], result)
+        return result
+
+    def test_result_is_cached_until_ttl_expires(self):
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            self.assertNotIn('cached', self.execute(self.alice))
+            self.assertTrue(self.execute(self.alice)['cached'])
+        with mock.patch('time.time', return_value=now + 61):
+            self.assertNotIn('cached', self.execute(self.alice))
+
+    def test_saving_a_source_model_invalidates_results(self):
+        self.assertEqual(self.execute(self.alice)['row_count'], 1)
+        self.assertIn('auth.group', result_cache.tracked_model_labels())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Group.objects.create(name='Auditors')
+
+        result = self.execute(self.alice)
+        self.assertNotIn('cached', result)
+        self.assertEqual(result['row_count'], 2)
+
+    def test_results_are_keyed_by_user_scope(self):
+        self.execute(self.alice)
+        self.assertNotIn('cached', self.execute(self.bob))
+        self.assertTrue(self.execute(self.alice)['cached'])
+        self.assertTrue(self.execute(self.bob)['cached'])
+
+    def test_untracked_models_have_no_receivers(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            get_user_model().objects.create_user(username='carol', password='secret')
+        self.assertNotIn(
+            'invalidate_model_results.<locals>.<lambda>',
+            [getattr(callback, '__qualname__', '') for callback in callbacks])
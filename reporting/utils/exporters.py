@@ -3,9 +3,9 @@ import json
 import io
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Iterable, Iterator
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.template.loader import render_to_string
 from reportlab.lib import colors
@@ -15,10 +15,15 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
 
 from reporting.models import Report, ReportField
+from utils.streaming_export import (
+    CSV_CONTENT_TYPE, JSON_CONTENT_TYPE, XLSX_CONTENT_TYPE, CountingIterator,
+    csv_chunks, json_chunks, streaming_response, xlsx_chunks,
+)
 
 
 class ReportExporter:
@@ -438,6 +443,172 @@ class ReportExporter:
 
         return response
 
+    # Streaming exports
+
+    STREAM_FORMATS = {
+        'csv': (CSV_CONTENT_TYPE, 'csv'),
+        'excel': (XLSX_CONTENT_TYPE, 'xlsx'),
+        'json': (JSON_CONTENT_TYPE, 'json'),
+    }
+
+    def export_chunks(self, report: Report, rows: Iterable[Dict[str, Any]], export_format: str) -> Iterator[bytes]:
+        """
+        Bytes of ``report`` exported as ``export_format`` (one of
+        ``STREAM_FORMATS``), produced while ``rows`` is consumed.
+        """
+        if export_format == 'csv':
+            return self.csv_chunks(report, rows)
+        elif export_format == 'excel':
+            return self.excel_chunks(report, rows)
+        elif export_format == 'json':
+            return self.json_chunks(report, rows)
+        raise ValueError(f"Format '{export_format}' can't be streamed")
+
+    def stream(self, report: Report, rows: Iterable[Dict[str, Any]], export_format: str) -> StreamingHttpResponse:
+        """StreamingHttpResponse exporting ``rows`` without holding them in memory."""
+        content_type, extension = self.STREAM_FORMATS[export_format]
+        filename = f"{self._sanitize_filename(report.name)}.{extension}"
+        return streaming_response(self.export_chunks(report, rows, export_format), content_type, filename)
+
+    def csv_chunks(self, report: Report, rows: Iterable[Dict[str, Any]],
+                   include_headers: bool = True,
+                   delimiter: str = ',') -> Iterator[bytes]:
+        fields = list(report.fields.filter(is_visible=True).order_by('order'))
+        header = [field.display_name for field in fields] if include_headers else None
+        return csv_chunks(
+            header,
+            ([self._format_csv_value(self._get_field_value(row, field)) for field in fields] for row in rows),
+            delimiter=delimiter
+        )
+
+    def json_chunks(self, report: Report, rows: Iterable[Dict[str, Any]],
+                    include_metadata: bool = True) -> Iterator[bytes]:
+        rows = CountingIterator(rows)
+        if not include_metadata:
+            return json_chunks(rows)
+
+        fields = list(report.fields.filter(is_visible=True).order_by('order'))
+
+        def metadata():
+            return {
+                'metadata': {
+                    'report_name': report.name,
+                    'report_description': report.description,
+                    'generated_at': timezone.now().isoformat(),
+                    'total_records': rows.count,
+                    'fields': [
+                        {
+                            'name': field.field_path,
+                            'display_name': field.display_name,
+                            'type': field.field_type,
+                            'aggregation': field.aggregation,
+                        }
+                        for field in fields
+                    ],
+                }
+            }
+
+        return json_chunks(rows, tail=metadata)
+
+    def excel_chunks(self, report: Report, rows: Iterable[Dict[str, Any]],
+                     include_formatting: bool = True,
+                     include_summary: bool = True) -> Iterator[bytes]:
+        """
+        Same layout as ``export_excel`` through a write-only workbook. The
+        record count is only known at the end, so it goes on the summary sheet.
+        """
+        fields = list(report.fields.filter(is_visible=True).order_by('order'))
+        rows = CountingIterator(rows)
+
+        def write(wb):
+            ws = wb.create_sheet(self._sanitize_sheet_name(report.name))
+            header_row = 5
+
+            if include_formatting:
+                for col_idx, field in enumerate(fields, 1):
+                    ws.column_dimensions[get_column_letter(col_idx)].width = field.width / 7 if field.width else 15
+            ws.freeze_panes = f'A{header_row + 1}'
+
+            title = WriteOnlyCell(ws, value=report.name)
+            title.font = Font(size=16, bold=True)
+            ws.append([title])
+            ws.append([f"Generated: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+            ws.append([])
+            ws.append([])
+
+            border = Border(
+                left=Side(style='thin'),
+                right=Side(style='thin'),
+                top=Side(style='thin'),
+                bottom=Side(style='thin')
+            ) if include_formatting else None
+
+            header = []
+            for field in fields:
+                cell = WriteOnlyCell(ws, value=field.display_name)
+                if include_formatting:
+                    cell.font = Font(bold=True, color="FFFFFF")
+                    cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+                    cell.alignment = Alignment(horizontal='center', vertical='center')
+                    cell.border = border
+                header.append(cell)
+            ws.append(header)
+
+            styles = [self._excel_cell_style(field) for field in fields] if include_formatting else None
+            for row_data in rows:
+                values = [self._format_excel_value(self._get_field_value(row_data, field)) for field in fields]
+                if not include_formatting:
+                    ws.append(values)
+                    continue
+                cells = []
+                for value, (number_format, alignment) in zip(values, styles):
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.border = border
+                    if number_format:
+                        cell.number_format = number_format
+                    if alignment:
+                        cell.alignment = alignment
+                    cells.append(cell)
+                ws.append(cells)
+
+            if fields:
+                ws.auto_filter.ref = f"A{header_row}:{get_column_letter(len(fields))}{header_row + rows.count}"
+
+            if include_summary and rows.count > 0:
+                self._write_summary_sheet(wb.create_sheet("Summary"), report, rows.count, fields)
+
+        return xlsx_chunks(write)
+
+    def _excel_cell_style(self, field: ReportField):
+        """(number_format, alignment) of a data cell, as applied by ``export_excel``."""
+        number_format = None
+        if field.field_type in ['IntegerField', 'BigIntegerField']:
+            number_format = '#,##0'
+        elif field.field_type in ['DecimalField', 'FloatField']:
+            decimals = field.formatting.get('decimals', 2) if field.formatting else 2
+            number_format = f'#,##0.{"0" * decimals}'
+        elif field.field_type in ['DateField']:
+            number_format = 'YYYY-MM-DD'
+        elif field.field_type in ['DateTimeField']:
+            number_format = 'YYYY-MM-DD HH:MM:SS'
+
+        if field.formatting:
+            format_type = field.formatting.get('type')
+            if format_type == 'currency':
+                prefix = field.formatting.get('prefix', '$')
+                decimals = field.formatting.get('decimals', 2)
+                number_format = f'{prefix}#,##0.{"0" * decimals}'
+            elif format_type == 'percentage':
+                decimals = field.formatting.get('decimals', 1)
+                number_format = f'0.{"0" * decimals}%'
+
+        alignment = None
+        if field.field_type in ['IntegerField', 'DecimalField', 'FloatField']:
+            alignment = Alignment(horizontal='right')
+        elif field.field_type in ['BooleanField']:
+            alignment = Alignment(horizontal='center')
+        return number_format, alignment
+
     # Helper methods
 
     def _get_field_value(self, row_data: Dict[str, Any], field: ReportField) -> Any:
@@ -568,45 +739,74 @@ class ReportExporter:
     def _add_summary_sheet(self, wb: openpyxl.Workbook, report: Report,
                            data: List[Dict[str, Any]], fields: List[ReportField]):
         """Add a summary sheet to Excel workbook."""
-        ws = wb.create_sheet(title="Summary")
+        self._write_summary_sheet(wb.create_sheet(title="Summary"), report, len(data), fields)
 
-        # Title
-        ws['A1'] = "Report Summary"
-        ws['A1'].font = Font(size=16, bold=True)
+    def _write_summary_sheet(self, ws, report: Report, total_records: int, fields: List[ReportField]):
+        """Fill a summary sheet row by row (works for write-only sheets too)."""
+        def styled(value, font, fill=None):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = font
+            if fill:
+                cell.fill = fill
+            return cell
 
-        # Basic info
-        row = 3
-        ws[f'A{row}'] = "Report Name:"
-        ws[f'B{row}'] = report.name
+        bold = Font(bold=True)
+        header_fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
 
-        row += 1
-        ws[f'A{row}'] = "Generated:"
-        ws[f'B{row}'] = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Title
+        ws.append([styled("Report Summary", Font(size=16, bold=True))])
+        ws.append([])
 
-        row += 1
-        ws[f'A{row}'] = "Total Records:"
-        ws[f'B{row}'] = len(data)
+        # Basic info
+        ws.append(["Report Name:", report.name])
+        ws.append(["Generated:", timezone.now().strftime('%Y-%m-%d %H:%M:%S')])
+        ws.append(["Total Records:", total_records])
+        ws.append([])
 
         # Field summary
-        row += 2
-        ws[f'A{row}'] = "Field Summary"
-        ws[f'A{row}'].font = Font(bold=True)
-
-        row += 1
-        ws[f'A{row}'] = "Field Name"
-        ws[f'B{row}'] = "Type"
-        ws[f'C{row}'] = "Aggregation"
-
-        for cell in [ws[f'A{row}'], ws[f'B{row}'], ws[f'C{row}']]:
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-
+        ws.append([styled("Field Summary", bold)])
+        ws.append([styled(title, bold, header_fill) for title in ("Field Name", "Type", "Aggregation")])
         for field in fields:
-            row += 1
-            ws[f'A{row}'] = field.display_name
-            ws[f'B{row}'] = field.field_type
-            ws[f'C{row}'] = field.aggregation or 'None'
+            ws.append([field.display_name, field.field_type, field.aggregation or 'None'])
 
         # Adjust column widths
         for column in ['A', 'B', 'C']:
-            ws.column_dimensions[column].width = 20
\ No newline at end of file
+            ws.column_dimensions[column].width = 20
+
+
+def export_job_chunks(job, progress):
+    """Writer for background report export jobs (see reporting_templates.services.export_jobs)."""
+    from reporting.utils.query_builder import ReportQueryBuilder
+
+    report = Report.objects.get(pk=job.source_id)
+    options = job.parameters
+    builder = ReportQueryBuilder(report, user=job.requested_by)
+    exporter = ReportExporter()
+    filename = exporter._sanitize_filename(report.name)
+
+    if job.export_format == 'pdf':
+        result = builder.execute(
+            parameters=options.get('parameters'),
+            limit=options.get('limit'),
+            offset=options.get('offset'),
+            export_format='pdf'
+        )
+        if not result['success']:
+            raise ValueError(result['error'])
+        progress(result['row_count'])
+        return [exporter.export_pdf(report, result['data']).content], f"{filename}.pdf", 'application/pdf'
+
+    content_type, extension = ReportExporter.STREAM_FORMATS[job.export_format]
+    rows = builder.stream_rows(
+        parameters=options.get('parameters'),
+        limit=options.get('limit'),
+        offset=options.get('offset'),
+        export_format=job.export_format
+    )
+    rows = CountingIterator(rows, on_progress=progress)
+
+    def chunks():
+        yield from exporter.export_chunks(report, rows, job.export_format)
+        progress(rows.count)
+
+    return chunks(), f"{filename}.{extension}", content_type
@@ -1,9 +1,9 @@
 from django.db import models
-from django.db.models import Q, F, Count, Sum, Avg, Min, Max, Value, Case, When
+from django.db.models import Q, F, Value, Case, When
 from django.db.models.functions import Coalesce, Cast, Concat
 from django.core.exceptions import FieldError
 from django.utils import timezone
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple
 import logging
 import time
 import json
@@ -12,13 +12,26 @@ from decimal import Decimal
 
 from reporting.models import (
     Report, ReportDataSource, ReportField, ReportFilter,
-    ReportJoin, ReportParameter, ReportExecution
+    ReportJoin, ReportParameter, ReportExecution, SavedReportResult
 )
 from reporting.utils.model_inspector import DynamicModelInspector
+from reporting.utils.report_plan import FilterTemplate, PlanField, get_plan_version, get_report_plan
+from utils.result_cache import (
+    get_cached_result, record_lookup, result_cache_key, set_cached_result, should_log_hit,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def purge_expired_cached_results():
+    """Delete durable cache rows past their expiry; returns the number removed."""
+    _, deleted = SavedReportResult.objects.filter(
+        is_cache_entry=True,
+        expires_at__lte=timezone.now(),
+    ).delete()
+    return deleted.get(SavedReportResult._meta.label, 0)
+
+
 class ReportQueryBuilder:
     """
     Builds and executes queries based on report definition.
@@ -29,6 +42,7 @@ class ReportQueryBuilder:
         self.report = report
         self.user = user
         self.inspector = DynamicModelInspector()
+        self.plan = None
         self.query = None
         self.base_queryset = None
         self.annotations = {}
@@ -48,6 +62,7 @@ class ReportQueryBuilder:
             Configured QuerySet ready for execution
         """
         self.parameters = parameters or {}
+        self.plan = get_report_plan(self.report)
 
         # Step 1: Get primary data source and base queryset
         self._setup_base_queryset()
@@ -72,7 +87,8 @@ class ReportQueryBuilder:
     def execute(self, parameters: Dict[str, Any] = None,
                 limit: int = None,
                 offset: int = None,
-                export_format: str = None) -> Dict[str, Any]:
+                export_format: str = None,
+                background: bool = False) -> Dict[str, Any]:
         """
         Execute the query and return results with metadata.
         
@@ -81,10 +97,22 @@ class ReportQueryBuilder:
             limit: Maximum number of rows
             offset: Number of rows to skip
             export_format: If specified, format for export
+            background: Queue an export job for ``export_format`` instead
+                of running the query; the result carries the job status
             
         Returns:
             Dictionary containing results and execution metadata
         """
+        if background and export_format:
+            return self._queue_export(parameters, limit, offset, export_format)
+
+        cache_key = None
+        if self.report.cache_ttl:
+            cache_key = self._result_cache_key(parameters, limit, offset)
+            cached = self._cached_result(cache_key, export_format)
+            if cached is not None:
+                return cached
+
         start_time = time.time()
         execution = None
 
@@ -121,9 +149,11 @@ class ReportQueryBuilder:
                 row_count=row_count,
                 status='success',
                 export_format=export_format or '',
+                result_cache_key=cache_key or '',
+                cached_until=timezone.now() + timedelta(seconds=self.report.cache_ttl) if cache_key else None,
             )
 
-            return {
+            result = {
                 'success': True,
                 'data': data,
                 'row_count': row_count,
@@ -132,6 +162,9 @@ class ReportQueryBuilder:
                 'columns': self._get_column_info(),
                 'parameters_used': self.parameters,
             }
+            if cache_key:
+                self._store_result(cache_key, result, execution)
+            return result
 
         except Exception as e:
             execution_time = time.time() - start_time
@@ -156,59 +189,190 @@ class ReportQueryBuilder:
                 'execution_time': execution_time,
             }
 
-    def _setup_base_queryset(self):
-        """Setup the base queryset from primary data source."""
-        primary_source = self.report.data_sources.filter(is_primary=True).first()
-        if not primary_source:
-            raise ValueError("No primary data source defined for report")
+    def _result_cache_key(self, parameters, limit, offset) -> str:
+        """
+        Results depend on the report definition, its models' rows and the
+        values bound to its filters. The bound values stand in for both the
+        parameters and the user's scope: user attributes and dynamic values
+        ("today", "current_user_id") are resolved into them.
+        """
+        self.parameters = parameters or {}
+        plan = get_report_plan(self.report)
+        bound_filters = [
+            [self._resolve_filter_value(filter_obj) for filter_obj in group_filters]
+            for _, group_filters in plan.filter_groups
+        ]
+        return result_cache_key(
+            'report',
+            self.report.pk,
+            get_plan_version(self.report.pk),
+            plan.dependencies,
+            bound_filters,
+            None,
+            {'limit': limit, 'offset': offset}
+        )
+
+    def _cached_result(self, cache_key, export_format) -> Optional[Dict[str, Any]]:
+        """The cached result for ``cache_key``, falling back to a saved result for durable reports."""
+        result = get_cached_result(cache_key)
+        lookup = 'hit'
+        if result is None and self.report.cache_durable:
+            saved = SavedReportResult.objects.filter(
+                report=self.report,
+                is_cache_entry=True,
+                execution__result_cache_key=cache_key,
+                execution__cached_until__gt=timezone.now(),
+            ).select_related('execution').order_by('-saved_at').first()
+            if saved:
+                result = {
+                    'success': True,
+                    'data': saved.result_data,
+                    'row_count': saved.row_count,
+                    'execution_time': saved.execution.execution_time,
+                    'execution_id': saved.execution_id,
+                    'columns': self._get_column_info(),
+                    'parameters_used': saved.parameters_used,
+                }
+                remaining = (saved.execution.cached_until - timezone.now()).total_seconds()
+                set_cached_result(cache_key, result, max(int(remaining), 1))
+                lookup = 'durable_hit'
+
+        if result is None:
+            record_lookup('report', 'miss')
+            return None
 
-        model_class = primary_source.get_model_class()
-        if not model_class:
-            raise ValueError(f"Model {primary_source.app_name}.{primary_source.model_name} not found")
+        record_lookup('report', lookup)
+        if self.user and should_log_hit():
+            ReportExecution.objects.create(
+                report=self.report,
+                executed_by=self.user,
+                parameters_used=self.parameters,
+                execution_time=0,
+                row_count=result['row_count'],
+                status='success',
+                export_format=export_format or '',
+                result_cache_key=cache_key,
+            )
+        return {**result, 'cached': True}
+
+    def _store_result(self, cache_key, result, execution):
+        set_cached_result(cache_key, result, self.report.cache_ttl)
+        if self.report.cache_durable and self.user:
+            # One durable row per cache key; the newest replaces the last.
+            SavedReportResult.objects.filter(
+                report=self.report,
+                is_cache_entry=True,
+                execution__result_cache_key=cache_key,
+            ).delete()
+            SavedReportResult.objects.create(
+                report=self.report,
+                is_cache_entry=True,
+                name=f"{self.report.name} - Cached result",
+                execution=execution,
+                parameters_used=self.parameters,
+                result_data=result['data'],
+                row_count=result['row_count'],
+                saved_by=self.user,
+                expires_at=execution.cached_until,
+            )
+
+    def _queue_export(self, parameters, limit, offset, export_format) -> Dict[str, Any]:
+        """Request a background export job; identical requests share one job."""
+        from reporting_templates.models import ExportJob
+        from reporting_templates.services.export_jobs import job_status, request_export_job
+
+        job, created = request_export_job(
+            ExportJob.SOURCE_REPORT,
+            self.report.pk,
+            export_format,
+            {'parameters': parameters or {}, 'limit': limit, 'offset': offset},
+            self.user
+        )
+        return {
+            'success': True,
+            'created': created,
+            'job': job_status(job),
+        }
+
+    def stream_rows(self, parameters: Dict[str, Any] = None,
+                    limit: int = None,
+                    offset: int = None,
+                    export_format: str = None,
+                    chunk_size: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Serialized rows, one at a time, instead of a materialized result.
+        The query is built (and fails) up front; rows are then fetched with
+        ``QuerySet.iterator(chunk_size=...)`` and the execution is logged
+        once they are exhausted.
+        """
+        from utils.streaming_export import get_chunk_size
 
-        self.base_queryset = model_class.objects.all()
+        start_time = time.time()
+        query = self.build_query(parameters)
+        if not isinstance(query, dict):
+            if offset:
+                query = query[offset:]
+            if limit:
+                query = query[:limit]
+        return self._iter_rows(query, start_time, export_format, chunk_size or get_chunk_size())
+
+    def _iter_rows(self, query, start_time, export_format, chunk_size):
+        row_count = 0
+        try:
+            if isinstance(query, dict):
+                # Aggregation without grouping - a single row
+                row_count = 1
+                yield query
+            else:
+                fields = self._visible_fields()
+                for row in query.iterator(chunk_size=chunk_size):
+                    row_count += 1
+                    yield self._serialize_row(row, fields)
+        except Exception as e:
+            logger.error(f"Report export error: {e}", exc_info=True)
+            if self.user:
+                ReportExecution.objects.create(
+                    report=self.report,
+                    executed_by=self.user,
+                    parameters_used=self.parameters,
+                    execution_time=time.time() - start_time,
+                    row_count=row_count,
+                    status='error',
+                    error_message=str(e),
+                )
+            raise
+
+        ReportExecution.objects.create(
+            report=self.report,
+            executed_by=self.user,
+            parameters_used=self.parameters,
+            execution_time=time.time() - start_time,
+            row_count=row_count,
+            status='success',
+            export_format=export_format or '',
+        )
+
+    def _setup_base_queryset(self):
+        """Setup the base queryset from primary data source."""
+        self.base_queryset = self.plan.model_class.objects.all()
         self.query = self.base_queryset
 
         # Apply select_related from data source config
-        if primary_source.select_related:
-            self.query = self.query.select_related(*primary_source.select_related)
+        if self.plan.select_related:
+            self.query = self.query.select_related(*self.plan.select_related)
 
         # Apply prefetch_related from data source config
-        if primary_source.prefetch_related:
-            self.query = self.query.prefetch_related(*primary_source.prefetch_related)
+        if self.plan.prefetch_related:
+            self.query = self.query.prefetch_related(*self.plan.prefetch_related)
 
     def _apply_joins(self):
-        """Apply joins defined in the report."""
-        # Note: Django doesn't support explicit SQL joins, but we can use
-        # select_related and prefetch_related for optimization
-
-        joins = self.report.joins.all().order_by('id')
-        for join in joins:
-            # For now, we'll add select_related for foreign keys
-            # This is a simplified implementation
-            if join.join_type in ['inner', 'left']:
-                # Assuming the join is on a ForeignKey field
-                field_path = join.left_field
-                if '__' not in field_path and hasattr(self.query.model, field_path):
-                    field = getattr(self.query.model, field_path)
-                    if hasattr(field, 'field') and isinstance(field.field, models.ForeignKey):
-                        self.query = self.query.select_related(field_path)
+        """Apply joins defined in the report (as select_related, see ReportPlan)."""
+        if self.plan.join_select_related:
+            self.query = self.query.select_related(*self.plan.join_select_related)
 
     def _apply_filters(self):
-        """Apply all active filters to the query."""
-        filters = self.report.filters.filter(is_active=True).order_by('group_order', 'id')
-
-        # Group filters by logic group
-        filter_groups = {}
-        for filter_obj in filters:
-            group_key = (filter_obj.logic_group, filter_obj.group_order)
-            if group_key not in filter_groups:
-                filter_groups[group_key] = []
-            filter_groups[group_key].append(filter_obj)
-
-        # Build Q objects for each group
-        q_objects = []
-        for (logic_op, _), group_filters in filter_groups.items():
+        """Bind the current parameters to the plan's filter templates and apply them."""
+        for logic_op, group_filters in self.plan.filter_groups:
             group_q = Q()
 
             for filter_obj in group_filters:
@@ -220,13 +384,9 @@ class ReportQueryBuilder:
                         group_q &= filter_q
 
             if group_q:
-                q_objects.append(group_q)
-
-        # Apply all Q objects to the query
-        for q_obj in q_objects:
-            self.query = self.query.filter(q_obj)
+                self.query = self.query.filter(group_q)
 
-    def _build_filter_q(self, filter_obj: ReportFilter) -> Q:
+    def _build_filter_q(self, filter_obj: Union[ReportFilter, FilterTemplate]) -> Q:
         """Build a Q object for a single filter."""
         field_path = filter_obj.field_path
         operator = filter_obj.operator
@@ -279,7 +439,7 @@ class ReportQueryBuilder:
 
         return Q()
 
-    def _resolve_filter_value(self, filter_obj: ReportFilter) -> Any:
+    def _resolve_filter_value(self, filter_obj: Union[ReportFilter, FilterTemplate]) -> Any:
         """Resolve the actual value for a filter based on its type."""
         value_type = filter_obj.value_type
         value = filter_obj.value
@@ -322,36 +482,10 @@ class ReportQueryBuilder:
 
     def _setup_fields(self):
         """Setup field selection and annotations."""
-        visible_fields = self.report.fields.filter(is_visible=True).order_by('order')
-
-        for field in visible_fields:
-            field_path = field.field_path
-
-            if field.aggregation and field.aggregation != 'group_by':
-                # This is an aggregation field
-                annotation_name = f"{field_path.replace('__', '_')}_{field.aggregation}"
-
-                if field.aggregation == 'count':
-                    self.annotations[annotation_name] = Count(field_path)
-                elif field.aggregation == 'count_distinct':
-                    self.annotations[annotation_name] = Count(field_path, distinct=True)
-                elif field.aggregation == 'sum':
-                    self.annotations[annotation_name] = Sum(field_path)
-                elif field.aggregation == 'avg':
-                    self.annotations[annotation_name] = Avg(field_path)
-                elif field.aggregation == 'min':
-                    self.annotations[annotation_name] = Min(field_path)
-                elif field.aggregation == 'max':
-                    self.annotations[annotation_name] = Max(field_path)
-
-                self.aggregations[annotation_name] = field
-            elif field.aggregation == 'group_by':
-                # This is a grouping field
-                self.group_by_fields.append(field_path)
-                self.select_fields.append(field_path)
-            else:
-                # Regular field
-                self.select_fields.append(field_path)
+        self.annotations = self.plan.annotations()
+        self.aggregations = self.plan.aggregations
+        self.group_by_fields = list(self.plan.group_by_fields)
+        self.select_fields = list(self.plan.select_fields)
 
     def _apply_aggregations(self):
         """Apply aggregations and grouping to the query."""
@@ -375,54 +509,29 @@ class ReportQueryBuilder:
 
     def _apply_ordering(self):
         """Apply ordering to the query."""
-        # For now, we'll order by the display order of fields
-        # In the future, this could be configurable
-        if not self.aggregations:  # Don't order aggregation results
-            ordering = []
-            for field in self.report.fields.filter(is_visible=True).order_by('order'):
-                if field.aggregation != 'group_by':
-                    continue
-                ordering.append(field.field_path)
-
-            if ordering:
-                self.query = self.query.order_by(*ordering)
+        # Ordered by the grouping fields, in display order; aggregation
+        # results are not ordered
+        if self.plan.ordering:
+            self.query = self.query.order_by(*self.plan.ordering)
 
     def _serialize_results(self, results: List[Any]) -> List[Dict[str, Any]]:
         """Serialize query results to JSON-compatible format."""
-        serialized = []
-
-        for row in results:
-            if isinstance(row, dict):
-                # Already a dictionary (from values() query)
-                serialized_row = {}
-                for key, value in row.items():
-                    serialized_row[key] = self._serialize_value(value)
-                serialized.append(serialized_row)
-            else:
-                # Model instance
-                serialized_row = {}
-
-                # Get values for selected fields
-                for field in self.report.fields.filter(is_visible=True).order_by('order'):
-                    field_path = field.field_path
-                    value = row
-
-                    # Navigate through relationships
-                    for part in field_path.split('__'):
-                        if value is None:
-                            break
-                        if hasattr(value, part):
-                            value = getattr(value, part)
-                        else:
-                            value = None
+        fields = self._visible_fields()
+        return [self._serialize_row(row, fields) for row in results]
 
-                    # Apply formatting
-                    formatted_value = self._format_value(value, field)
-                    serialized_row[field.display_name] = formatted_value
+    def _visible_fields(self) -> Tuple[PlanField, ...]:
+        return (self.plan or get_report_plan(self.report)).fields
 
-                serialized.append(serialized_row)
+    def _serialize_row(self, row: Any, fields: Tuple[PlanField, ...]) -> Dict[str, Any]:
+        if isinstance(row, dict):
+            # Already a dictionary (from values() query)
+            return {key: self._serialize_value(value) for key, value in row.items()}
 
-        return serialized
+        # Model instance: follow each field's precomputed path and format it
+        return {
+            field.display_name: self._format_value(field.get_value(row), field)
+            for field in fields
+        }
 
     def _serialize_value(self, value: Any) -> Any:
         """Convert a value to JSON-serializable format."""
@@ -440,7 +549,7 @@ class ReportQueryBuilder:
         else:
             return value
 
-    def _format_value(self, value: Any, field: ReportField) -> Any:
+    def _format_value(self, value: Any, field: Union[ReportField, PlanField]) -> Any:
         """Apply formatting rules to a value."""
         if value is None:
             return None
@@ -478,20 +587,7 @@ class ReportQueryBuilder:
 
     def _get_column_info(self) -> List[Dict[str, Any]]:
         """Get information about report columns."""
-        columns = []
-
-        for field in self.report.fields.filter(is_visible=True).order_by('order'):
-            column = {
-                'name': field.field_path,
-                'display_name': field.display_name,
-                'type': field.field_type,
-                'aggregation': field.aggregation,
-                'width': field.width,
-                'formatting': field.formatting,
-            }
-            columns.append(column)
-
-        return columns
+        return [dict(column) for column in (self.plan or get_report_plan(self.report)).columns]
 
     def get_sql(self) -> str:
         """Get the SQL that would be executed (for debugging)."""
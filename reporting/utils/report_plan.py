@@ -0,0 +1,219 @@
+"""
+Compiled report plans.
+
+Everything ``ReportQueryBuilder`` derives from a report's definition rows -
+the model and its related-object loading, the visible fields with their
+select paths, annotations and row accessors, the joins and the filter
+templates - is compiled once into a ``ReportPlan``. Executing a report then
+only binds parameters to the filter templates and runs the query.
+
+Plans are kept per process, keyed by the report id and a per-report
+version counter stored in the shared cache. Saving or deleting a Report or
+any of its data sources, fields, filters or joins bumps the counter (see
+``reporting.signals``), so every process recompiles on its next use.
+"""
+import time
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.db.models import Avg, Count, Max, Min, Sum
+
+PLAN_VERSION_PREFIX = "reporting:plan_version"
+
+AGGREGATE_FUNCTIONS = {
+    'count': (Count, {}),
+    'count_distinct': (Count, {'distinct': True}),
+    'sum': (Sum, {}),
+    'avg': (Avg, {}),
+    'min': (Min, {}),
+    'max': (Max, {}),
+}
+
+# A filter row reduced to what binding a value to it needs;
+# ReportQueryBuilder._build_filter_q() accepts it in place of a ReportFilter.
+FilterTemplate = namedtuple(
+    'FilterTemplate', ['field_path', 'operator', 'value', 'value_type'])
+
+
+class PlanField:
+    """A visible report field with its precomputed row accessor."""
+    __slots__ = ('field_path', 'display_name', 'field_type', 'aggregation',
+                 'width', 'formatting', 'parts')
+
+    def __init__(self, field):
+        self.field_path = field.field_path
+        self.display_name = field.display_name
+        self.field_type = field.field_type
+        self.aggregation = field.aggregation
+        self.width = field.width
+        self.formatting = field.formatting
+        self.parts = tuple(field.field_path.split('__'))
+
+    def get_value(self, row):
+        """Follow the field path from a model instance; None if a step is missing."""
+        value = row
+        for part in self.parts:
+            if value is None:
+                break
+            value = getattr(value, part, None)
+        return value
+
+    def column(self):
+        return {
+            'name': self.field_path,
+            'display_name': self.display_name,
+            'type': self.field_type,
+            'aggregation': self.aggregation,
+            'width': self.width,
+            'formatting': self.formatting,
+        }
+
+
+class ReportPlan:
+    def __init__(self, report):
+        primary_source = report.data_sources.filter(
+            is_primary=True).select_related('content_type').first()
+        if not primary_source:
+            raise ValueError("No primary data source defined for report")
+
+        self.model_class = primary_source.get_model_class()
+        if not self.model_class:
+            model_label = f"{primary_source.app_name}.{primary_source.model_name}"
+            raise ValueError(f"Model {model_label} not found")
+
+        # Models whose rows the results read, for result cache invalidation
+        self.dependencies = tuple(sorted({
+            model._meta.label_lower
+            for model in (
+                source.get_model_class()
+                for source in report.data_sources.select_related('content_type')
+            )
+            if model is not None
+        }))
+
+        self.select_related = list(primary_source.select_related or [])
+        self.prefetch_related = list(primary_source.prefetch_related or [])
+        self.join_select_related = self._compile_joins(report)
+        self.filter_groups = self._compile_filters(report)
+
+        self.fields = tuple(
+            PlanField(field)
+            for field in report.fields.filter(is_visible=True).order_by('order')
+        )
+        self.columns = [field.column() for field in self.fields]
+
+        # Field selection and annotations
+        self.annotation_specs = {}
+        self.aggregations = {}
+        self.group_by_fields = []
+        self.select_fields = []
+        for field in self.fields:
+            if field.aggregation and field.aggregation != 'group_by':
+                path_name = field.field_path.replace('__', '_')
+                annotation_name = f"{path_name}_{field.aggregation}"
+                if field.aggregation in AGGREGATE_FUNCTIONS:
+                    self.annotation_specs[annotation_name] = field
+                self.aggregations[annotation_name] = field
+            elif field.aggregation == 'group_by':
+                self.group_by_fields.append(field.field_path)
+                self.select_fields.append(field.field_path)
+            else:
+                self.select_fields.append(field.field_path)
+
+        # Results are ordered by their grouping fields, except aggregations
+        self.ordering = [] if self.aggregations else list(self.group_by_fields)
+
+    def _compile_joins(self, report):
+        # Django doesn't support explicit SQL joins; inner and left joins on a
+        # direct foreign key of the primary model become select_related.
+        paths = []
+        for join in report.joins.all().order_by('id'):
+            if join.join_type not in ['inner', 'left']:
+                continue
+            field_path = join.left_field
+            if '__' not in field_path and hasattr(self.model_class, field_path):
+                field = getattr(self.model_class, field_path)
+                if (hasattr(field, 'field')
+                        and isinstance(field.field, models.ForeignKey)):
+                    paths.append(field_path)
+        return paths
+
+    def _compile_filters(self, report):
+        """[(logic_op, [FilterTemplate, ...]), ...] in group order."""
+        filter_groups = OrderedDict()
+        active_filters = report.filters.filter(is_active=True)
+        for filter_obj in active_filters.order_by('group_order', 'id'):
+            group_key = (filter_obj.logic_group, filter_obj.group_order)
+            filter_groups.setdefault(group_key, []).append(FilterTemplate(
+                filter_obj.field_path, filter_obj.operator,
+                filter_obj.value, filter_obj.value_type
+            ))
+        return [(logic_op, templates)
+                for (logic_op, _), templates in filter_groups.items()]
+
+    def annotations(self):
+        """Fresh aggregate expressions for one query."""
+        annotations = {}
+        for name, field in self.annotation_specs.items():
+            function, options = AGGREGATE_FUNCTIONS[field.aggregation]
+            annotations[name] = function(field.field_path, **options)
+        return annotations
+
+
+_plans = OrderedDict()
+_plans_lock = Lock()
+
+
+def get_plan_cache_size():
+    return getattr(settings, "REPORT_PLAN_CACHE_SIZE", 256)
+
+
+def plan_version_key(report_id):
+    return f"{PLAN_VERSION_PREFIX}:{report_id}"
+
+
+def get_plan_version(report_id):
+    key = plan_version_key(report_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never restarts at a
+        # version that processes still hold plans for.
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_plan_version(report_id):
+    """Invalidate the compiled plan of ``report_id`` in every process."""
+    try:
+        return cache.incr(plan_version_key(report_id))
+    except ValueError:
+        return get_plan_version(report_id)
+
+
+def get_report_plan(report):
+    """The compiled plan of ``report``, compiling it when missing or stale."""
+    key = (report.pk, get_plan_version(report.pk))
+    plan = _plans.get(key)
+    if plan is not None:
+        try:
+            _plans.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread in the meantime; still valid to use.
+            pass
+        return plan
+
+    plan = ReportPlan(report)
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > get_plan_cache_size():
+            _plans.popitem(last=False)
+    return plan
+
+
+def clear_report_plans():
+    with _plans_lock:
+        _plans.clear()
@@ -10,7 +10,7 @@ import json
 
 from .models import (
     PDFTemplate, PDFTemplateElement, PDFTemplateVariable,
-    PDFTemplateParameter, PDFTemplateDataSource, PDFGenerationLog
+    PDFTemplateParameter, PDFTemplateDataSource, PDFGenerationLog, ExportJob
 )
 
 
@@ -412,4 +412,27 @@ class PDFGenerationLogAdmin(admin.ModelAdmin):
         if request.user.is_superuser:
             return qs
         # Non-superusers only see their own logs
-        return qs.filter(generated_by=request.user)
\ No newline at end of file
+        return qs.filter(generated_by=request.user)
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'job_id', 'source', 'source_id', 'export_format', 'requested_by',
+        'status', 'rows_written', 'created_at', 'expires_at'
+    ]
+    list_filter = ['source', 'export_format', 'status', 'created_at']
+    search_fields = ['job_id', 'source_id', 'file_name', 'requested_by__username']
+    readonly_fields = [
+        'job_id', 'source', 'source_id', 'export_format', 'parameters',
+        'params_hash', 'requested_by', 'status', 'rows_written',
+        'error_message', 'file', 'file_name', 'content_type', 'file_size',
+        'created_at', 'started_at', 'completed_at', 'expires_at'
+    ]
+    ordering = ['-created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -437,6 +437,7 @@ class PDFGenerateSerializer(serializers.Serializer):
     )
     filename = serializers.CharField(required=False, max_length=255)
     generate_for_user_id = serializers.IntegerField(required=False)
+    background = serializers.BooleanField(required=False, default=False)
 
     def validate(self, attrs):
         """Validate the generation request"""
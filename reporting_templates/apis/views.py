@@ -6,6 +6,7 @@ from django.shortcuts import get_object_or_404
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
 from django.db.models import Q, Prefetch
+from django.utils import timezone
 from reportlab.lib.colors import HexColor
 from reportlab.lib.utils import ImageReader
 from rest_framework import viewsets, status, views
@@ -20,9 +21,10 @@ from datetime import datetime
 from authentication.crud.managers import user_can
 from reporting_templates.models import (
     PDFTemplate, PDFTemplateElement, PDFTemplateVariable,
-    PDFTemplateParameter, PDFTemplateDataSource, PDFGenerationLog
+    PDFTemplateParameter, PDFTemplateDataSource, PDFGenerationLog, ExportJob
 )
 from reporting_templates.services.data_service import DataFetchingService
+from reporting_templates.services.export_jobs import job_status, request_export_job
 from reporting_templates.services.pdf_generator import PDFGenerator, PDFTemplateService
 from .serializers import (
     PDFTemplateSerializer, PDFTemplateCreateSerializer,
@@ -466,11 +468,58 @@ class GeneratePDFView(APIView):
         else:
             target_user = request.user
 
+        # Render in a worker; identical requests share one job
+        if serializer.validated_data.get('background'):
+            job, created = request_export_job(
+                ExportJob.SOURCE_PDF_TEMPLATE,
+                template.pk,
+                'pdf',
+                {
+                    'parameters': parameters,
+                    'language': language,
+                    'filename': filename,
+                    'generate_for_user_id': generate_for_user_id,
+                },
+                request.user
+            )
+            return Response(
+                job_status(job, request),
+                status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK
+            )
+
+        try:
+            log_entry, pdf_buffer = self.render_pdf(
+                template, request.user, target_user, parameters, language
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        # Prepare filename
+        if not filename:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"{template.code}_{timestamp}.pdf"
+
+        # Return PDF
+        response = HttpResponse(
+            pdf_buffer.getvalue(),
+            content_type='application/pdf'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def render_pdf(self, template, generated_by, target_user, parameters, language):
+        """
+        Fetch the data and generate the PDF, logging the generation.
+        Returns (log_entry, pdf_buffer); failures are logged and re-raised.
+        """
         # Create log entry
         log_entry = PDFGenerationLog.objects.create(
             template=template,
-            generated_by=request.user,
-            generated_for=target_user if target_user != request.user else None,
+            generated_by=generated_by,
+            generated_for=target_user if target_user != generated_by else None,
             parameters=parameters,
             status='processing'
         )
@@ -498,18 +547,7 @@ class GeneratePDFView(APIView):
             log_entry.file_size = pdf_buffer.tell()
             log_entry.save()
 
-            # Prepare filename
-            if not filename:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{template.code}_{timestamp}.pdf"
-
-            # Return PDF
-            response = HttpResponse(
-                pdf_buffer.getvalue(),
-                content_type='application/pdf'
-            )
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
+            return log_entry, pdf_buffer
 
         except Exception as e:
             # Update log with error
@@ -517,11 +555,7 @@ class GeneratePDFView(APIView):
             log_entry.error_message = str(e)
             log_entry.completed_at = datetime.now()
             log_entry.save()
-
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            raise
 
     def _sanitize_context_data(self, context_data):
         """Remove sensitive data from context before storing"""
@@ -591,6 +625,43 @@ class GeneratePDFView(APIView):
             }
         return value
 
+class ExportJobView(APIView):
+    """Poll a background export job"""
+    permission_classes = [IsAuthenticated]
+
+    @staticmethod
+    def get_job(request, job_id):
+        jobs = ExportJob.objects.all()
+        if not request.user.is_superuser:
+            jobs = jobs.filter(requested_by=request.user)
+        return get_object_or_404(jobs, job_id=job_id)
+
+    def get(self, request, job_id):
+        return Response(job_status(self.get_job(request, job_id), request))
+
+
+class ExportJobDownloadView(APIView):
+    """Download the artifact of a completed export job"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = ExportJobView.get_job(request, job_id)
+        if job.status != ExportJob.STATUS_COMPLETED or not job.file:
+            return Response(
+                {'error': 'Export is not ready', 'status': job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+        if job.expires_at and job.expires_at <= timezone.now():
+            return Response({'error': 'Export has expired'}, status=status.HTTP_410_GONE)
+
+        return FileResponse(
+            job.file.open('rb'),
+            as_attachment=True,
+            filename=job.file_name,
+            content_type=job.content_type
+        )
+
+
 class MyTemplatesView(APIView):
     """Get templates available to current user"""
     permission_classes = [IsAuthenticated]
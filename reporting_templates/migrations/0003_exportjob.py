@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-16 11:20
+
+import django.db.models.deletion
+import reporting_templates.models
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reporting_templates', '0002_pdftemplatedatasource_pdftemplateparameter_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('source', models.CharField(choices=[('report', 'Report'), ('inquiry', 'Inquiry'), ('pdf_template', 'PDF Template')], max_length=20)),
+                ('source_id', models.CharField(max_length=100)),
+                ('export_format', models.CharField(max_length=20)),
+                ('parameters', models.JSONField(default=dict)),
+                ('params_hash', models.CharField(help_text='SHA-256 of the parameters and requesting user', max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('rows_written', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True)),
+                ('file', models.FileField(blank=True, max_length=500, storage=reporting_templates.models.export_storage, upload_to='exports/')),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('file_size', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['source', 'source_id', 'export_format', 'params_hash'], name='export_job_lookup_idx'), models.Index(fields=['expires_at'], name='export_job_expires_idx')],
+            },
+        ),
+    ]
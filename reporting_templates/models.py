@@ -1,5 +1,10 @@
 # reporting_templates/models.py
 
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
@@ -668,4 +673,84 @@ class PDFGenerationLog(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.template.name} - {self.created_at} - {self.status}"
\ No newline at end of file
+        return f"{self.template.name} - {self.created_at} - {self.status}"
+
+
+def export_storage():
+    """
+    Storage for export artifacts, outside the public media files. Artifacts
+    are only served through the export job download endpoint.
+    """
+    return FileSystemStorage(
+        location=getattr(settings, 'EXPORT_STORAGE_ROOT', os.path.join(settings.MEDIA_ROOT, 'private'))
+    )
+
+
+class ExportJob(models.Model):
+    """
+    A report, inquiry or PDF export produced in the background. Identical
+    requests (same source, format, parameters and user) share one job until
+    its artifact expires.
+    """
+    SOURCE_REPORT = 'report'
+    SOURCE_INQUIRY = 'inquiry'
+    SOURCE_PDF_TEMPLATE = 'pdf_template'
+    SOURCE_CHOICES = [
+        (SOURCE_REPORT, 'Report'),
+        (SOURCE_INQUIRY, 'Inquiry'),
+        (SOURCE_PDF_TEMPLATE, 'PDF Template'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.CharField(max_length=100)
+    export_format = models.CharField(max_length=20)
+    parameters = models.JSONField(default=dict)
+    params_hash = models.CharField(
+        max_length=64,
+        help_text='SHA-256 of the parameters and requesting user'
+    )
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='export_jobs'
+    )
+
+    # Progress
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    rows_written = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+
+    # Artifact
+    file = models.FileField(storage=export_storage, upload_to='exports/', max_length=500, blank=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['source', 'source_id', 'export_format', 'params_hash'],
+                         name='export_job_lookup_idx'),
+            models.Index(fields=['expires_at'], name='export_job_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.source_id} ({self.export_format}) - {self.status}"
@@ -0,0 +1,196 @@
+"""
+Background export jobs.
+
+A job renders a report, inquiry or PDF template export in a Celery worker
+and writes it, chunk by chunk, to private storage while recording how many
+rows were written. Each source registers a writer in ``EXPORT_WRITERS``:
+``writer(job, progress)`` returns ``(chunks, file_name, content_type)``,
+where ``chunks`` is an iterable of bytes and ``progress(rows)`` may be
+called while it is consumed.
+
+Requests are deduplicated by source, format and a hash of the parameters and
+requesting user, so repeating an export returns the job (and artifact)
+already produced. Artifacts expire after
+``REPORTING_TEMPLATES['STORAGE']['RETENTION_DAYS']`` days.
+"""
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from reporting_templates.models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+EXPORT_WRITERS = {
+    ExportJob.SOURCE_REPORT: 'reporting.utils.exporters.export_job_chunks',
+    ExportJob.SOURCE_INQUIRY: 'inquiry.services.exporter.export_job_chunks',
+    ExportJob.SOURCE_PDF_TEMPLATE: 'reporting_templates.services.export_jobs.pdf_export_chunks',
+}
+
+ACTIVE_STATUSES = (ExportJob.STATUS_PENDING, ExportJob.STATUS_RUNNING, ExportJob.STATUS_COMPLETED)
+
+
+def get_retention_days():
+    storage = getattr(settings, 'REPORTING_TEMPLATES', {}).get('STORAGE', {})
+    return storage.get('RETENTION_DAYS', 30)
+
+
+def parameters_hash(parameters, user):
+    payload = json.dumps({'parameters': parameters, 'user': user.pk}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def request_export_job(source, source_id, export_format, parameters, user):
+    """
+    The job exporting ``source``/``source_id`` as ``export_format`` with
+    ``parameters`` for ``user``: an unexpired pending, running or completed
+    job for the same request if there is one, otherwise a new queued job.
+    Returns ``(job, created)``.
+    """
+    params_hash = parameters_hash(parameters, user)
+    existing = ExportJob.objects.filter(
+        source=source,
+        source_id=str(source_id),
+        export_format=export_format,
+        params_hash=params_hash,
+        status__in=ACTIVE_STATUSES,
+    ).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+    ).order_by('-created_at').first()
+    if existing:
+        return existing, False
+
+    job = ExportJob.objects.create(
+        source=source,
+        source_id=str(source_id),
+        export_format=export_format,
+        parameters=parameters,
+        params_hash=params_hash,
+        requested_by=user,
+        # A job whose worker died stops being reused after the retention period
+        expires_at=timezone.now() + timedelta(days=get_retention_days()),
+    )
+    queue_export_job(job.job_id)
+    return job, True
+
+
+def queue_export_job(job_id):
+    from reporting_templates.tasks import run_export_job_task
+
+    transaction.on_commit(lambda: run_export_job_task.delay(str(job_id)))
+
+
+def _load_writer(source):
+    module_path, func_name = EXPORT_WRITERS[source].rsplit('.', 1)
+    return getattr(import_module(module_path), func_name)
+
+
+def _update_job(job, **fields):
+    for name, value in fields.items():
+        setattr(job, name, value)
+    ExportJob.objects.filter(pk=job.pk).update(**fields)
+
+
+def run_export_job(job_id):
+    """Render the job's export into private storage, recording progress as rows are written."""
+    job = ExportJob.objects.select_related('requested_by').get(job_id=job_id)
+    if job.status == ExportJob.STATUS_COMPLETED:
+        return job
+
+    _update_job(job, status=ExportJob.STATUS_RUNNING, started_at=timezone.now(),
+                rows_written=0, error_message='')
+    try:
+        chunks, file_name, content_type = _load_writer(job.source)(
+            job, lambda rows: _update_job(job, rows_written=rows))
+
+        with tempfile.TemporaryFile() as output:
+            for chunk in chunks:
+                output.write(chunk)
+            output.seek(0)
+            storage = job.file.storage
+            stored_name = storage.save(f"exports/{job.job_id}/{storage.get_valid_name(file_name)}", File(output))
+    except Exception as e:
+        logger.exception(f"Export job {job_id} failed")
+        _update_job(job, status=ExportJob.STATUS_FAILED, error_message=str(e), completed_at=timezone.now())
+        raise
+
+    completed_at = timezone.now()
+    _update_job(
+        job,
+        status=ExportJob.STATUS_COMPLETED,
+        file=stored_name,
+        file_name=file_name,
+        content_type=content_type,
+        file_size=job.file.storage.size(stored_name),
+        completed_at=completed_at,
+        expires_at=completed_at + timedelta(days=get_retention_days()),
+    )
+    return job
+
+
+def purge_expired_exports():
+    """Delete expired jobs and their artifacts; returns the number of jobs removed."""
+    expired = ExportJob.objects.filter(expires_at__lte=timezone.now())
+    count = 0
+    for job in expired.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        count += 1
+    return count
+
+
+def job_status(job, request=None):
+    """The status payload polled by clients."""
+    download_url = None
+    if job.status == ExportJob.STATUS_COMPLETED:
+        path = reverse('export-job-download', args=[job.job_id])
+        download_url = request.build_absolute_uri(path) if request else path
+    return {
+        'job_id': str(job.job_id),
+        'source': job.source,
+        'source_id': job.source_id,
+        'export_format': job.export_format,
+        'status': job.status,
+        'rows_written': job.rows_written,
+        'file_name': job.file_name,
+        'file_size': job.file_size,
+        'error': job.error_message or None,
+        'created_at': job.created_at,
+        'completed_at': job.completed_at,
+        'expires_at': job.expires_at,
+        'download_url': download_url,
+    }
+
+
+def pdf_export_chunks(job, progress):
+    """Writer for PDF template jobs."""
+    from reporting_templates.apis.views import GeneratePDFView
+    from reporting_templates.models import PDFTemplate
+
+    template = PDFTemplate.objects.get(pk=job.source_id)
+    options = job.parameters
+    target_user = job.requested_by
+    if options.get('generate_for_user_id'):
+        target_user = get_user_model().objects.get(pk=options['generate_for_user_id'])
+
+    log_entry, pdf_buffer = GeneratePDFView().render_pdf(
+        template=template,
+        generated_by=job.requested_by,
+        target_user=target_user,
+        parameters=options.get('parameters', {}),
+        language=options.get('language') or template.primary_language,
+    )
+    file_name = options.get('filename') or f"{template.code}_{log_entry.created_at.strftime('%Y%m%d_%H%M%S')}.pdf"
+    return [pdf_buffer.getvalue()], file_name, 'application/pdf'
@@ -0,0 +1,29 @@
+# File: reporting_templates/tasks.py
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from reporting_templates.models import ExportJob
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def run_export_job_task(job_id: str):
+    """Render a background export job; failures are recorded on the job."""
+    from reporting_templates.services.export_jobs import run_export_job
+
+    try:
+        run_export_job(job_id)
+    except ExportJob.DoesNotExist:
+        logger.error(f"Export job {job_id} not found")
+
+
+@shared_task
+def purge_expired_exports_task():
+    """Delete export artifacts past their retention period (schedule with celery beat)."""
+    from reporting_templates.services.export_jobs import purge_expired_exports
+
+    count = purge_expired_exports()
+    logger.info(f"Purged {count} expired export jobs")
+    return count
@@ -1,3 +1,85 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import FileSystemStorage
 from django.test import TestCase
+from django.utils import timezone
+
+from reporting.models import Report, ReportDataSource, ReportField
+from reporting.utils.query_builder import ReportQueryBuilder
+from reporting_templates.models import ExportJob
+from reporting_templates.services.export_jobs import (
+    purge_expired_exports, run_export_job
+)
+
+
+class ExportJobTests(TestCase):
+    """Identical exports share one job; expired artifacts are deleted."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='analyst', password='secret')
+        Group.objects.create(name='Reviewers')
+        cls.report = Report.objects.create(name='Groups')
+        source = ReportDataSource.objects.create(
+            report=cls.report, content_type=ContentType.objects.get_for_model(Group),
+            alias='group', is_primary=True)
+        ReportField.objects.create(
+            report=cls.report, data_source=source, field_name='name',
+            field_path='name', display_name='Name', field_type='CharField')
+
+    def setUp(self):
+        export_root = tempfile.TemporaryDirectory()
+        self.addCleanup(export_root.cleanup)
+        self.storage = FileSystemStorage(location=export_root.name)
+        file_field = ExportJob._meta.get_field('file')
+        patcher = mock.patch.object(file_field, 'storage', self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request_export(self, parameters=None):
+        with self.captureOnCommitCallbacks() as queued:
+            result = ReportQueryBuilder(self.report, self.user).execute(
+                parameters=parameters, export_format='csv', background=True)
+        return result, len(queued)
+
+    def test_identical_export_reuses_job(self):
+        first, queued = self.request_export()
+        self.assertTrue(first['created'])
+        self.assertEqual(queued, 1)
+
+        job = run_export_job(first['job']['job_id'])
+        self.assertEqual(job.status, ExportJob.STATUS_COMPLETED)
+        self.assertEqual(job.rows_written, 1)
+        self.assertTrue(self.storage.exists(job.file.name))
+
+        again, queued = self.request_export()
+        self.assertFalse(again['created'])
+        self.assertEqual(queued, 0)
+        self.assertEqual(again['job']['job_id'], first['job']['job_id'])
+        self.assertIsNotNone(again['job']['download_url'])
+
+        other, _ = self.request_export({'name': 'Reviewers'})
+        self.assertTrue(other['created'])
+
+    def test_expired_artifacts_are_purged(self):
+        expired = run_export_job(self.request_export()[0]['job']['job_id'])
+        current = run_export_job(
+            self.request_export({'name': 'Reviewers'})[0]['job']['job_id'])
+        ExportJob.objects.filter(pk=expired.pk).update(
+            expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.assertEqual(purge_expired_exports(), 1)
+        self.assertFalse(ExportJob.objects.filter(pk=expired.pk).exists())
+        self.assertFalse(self.storage.exists(expired.file.name))
+        self.assertTrue(self.storage.exists(current.file.name))
 
-# Create your tests here.
+        # The next identical request queues a fresh job
+        result, queued = self.request_export()
+        self.assertTrue(result['created'])
+        self.assertEqual(queued, 1)
@@ -8,7 +8,7 @@ from reporting_templates.apis.views import (
     PDFTemplateVariableViewSet, PDFTemplateParameterViewSet,
     PDFTemplateDataSourceViewSet, PDFGenerationLogViewSet,
     GeneratePDFView, MyTemplatesView, ContentTypeListView,
-    TemplateDesignerDataView
+    TemplateDesignerDataView, ExportJobView, ExportJobDownloadView
 )
 
 router = DefaultRouter()
@@ -28,4 +28,8 @@ urlpatterns = [
     path('my-templates/', MyTemplatesView.as_view(), name='pdf-my-templates'),
     path('content-types/', ContentTypeListView.as_view(), name='pdf-content-types'),
     path('designer-data/', TemplateDesignerDataView.as_view(), name='pdf-designer-data'),
+
+    # Background export jobs (reports, inquiries and PDF templates)
+    path('export-jobs/<uuid:job_id>/', ExportJobView.as_view(), name='export-job-status'),
+    path('export-jobs/<uuid:job_id>/download/', ExportJobDownloadView.as_view(), name='export-job-download'),
 ]
\ No newline at end of file
@@ -1,53 +1,129 @@
 # scohaz_platform/middleware.py
 
+import logging
+import time
 from importlib import import_module
-from django.urls import resolve
+
 from django.conf import settings
+from prometheus_client import Histogram
 
+from app_builder.utils.hot_registry import hot_app_middleware, is_runtime_app, sync_hot_apps
 
-class CurrentUserRouterMiddleware:
+logger = logging.getLogger(__name__)
+
+APP_MIDDLEWARE_DURATION = Histogram(
+    "app_middleware_duration_seconds",
+    "Time spent running app-specific middlewares routed by app name.",
+    ["router", "app", "middleware"],
+)
+
+
+def load_middleware_classes(mapping, router_name):
     """
-    Middleware to set thread_local.current_user per app before view logic runs.
+    Import every middleware class in ``mapping`` once. ``mapping`` is either
+    ``{app_name: [dotted paths]}`` or a flat list of dotted paths whose first
+    component is the app name. Paths that fail to import are logged and
+    skipped.
+    """
+    if isinstance(mapping, dict):
+        items = mapping.items()
+    else:
+        grouped = {}
+        for middleware_path in mapping or []:
+            grouped.setdefault(middleware_path.split(".", 1)[0], []).append(middleware_path)
+        items = grouped.items()
+
+    classes = {}
+    for app_name, middleware_paths in items:
+        for middleware_path in middleware_paths:
+            try:
+                module_path, class_name = middleware_path.rsplit(".", 1)
+                middleware_class = getattr(import_module(module_path), class_name)
+            except (ImportError, AttributeError, ValueError) as e:
+                logger.error("[%s] Failed to load middleware %s: %s", router_name, middleware_path, e)
+                continue
+            classes.setdefault(app_name, []).append((middleware_path, middleware_class))
+    return classes
+
+
+def get_app_middleware_classes(classes, app_name, kind, router_name):
+    """
+    The middleware classes ``classes`` holds for ``app_name``. An app
+    installed after startup (see app_builder.utils.hot_registry) has its
+    classes loaded and cached on first use; any other unknown name gets none
+    without a cache entry, so app names from arbitrary URLs can't grow it.
+    """
+    if app_name in classes:
+        return classes[app_name]
+    if not is_runtime_app(app_name):
+        return []
+    classes[app_name] = load_middleware_classes(
+        {app_name: hot_app_middleware(app_name)[kind]}, router_name).get(app_name, [])
+    return classes[app_name]
+
+
+class HotAppsMiddleware:
+    """
+    Installs apps published since this worker last looked, before the URL
+    is resolved, so a newly generated app is served without a restart.
     """
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        resolver_match = resolve(request.path_info)
-        app_name = resolver_match.app_name
+        try:
+            sync_hot_apps()
+        except Exception as e:
+            logger.exception("[HotApps] Sync failed: %s", e)
+        return self.get_response(request)
+
+
+def get_app_name(request):
+    """
+    App of the view that handled ``request``, from the resolver match the
+    URL resolver already stored on it. Admin pages map to the app in the URL.
+    """
+    resolver_match = getattr(request, "resolver_match", None)
+    if resolver_match is None:
+        return None
+    app_name = resolver_match.app_name
+    if app_name == "admin":
+        parts = request.path.split("/")
+        return parts[2] if len(parts) > 2 and parts[1] == "admin" else None
+    return app_name
 
-        if app_name == "admin":
-            app_name = self.get_app_from_admin_context(request)
 
-        self.process_current_user_middleware(request, app_name)
+class CurrentUserRouterMiddleware:
+    """
+    Middleware to set thread_local.current_user per app before view logic runs.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.middleware_classes = load_middleware_classes(
+            getattr(settings, "APPS_CURRENT_USER_MIDDLEWARE", {}), "CurrentUserRouter")
+
+    def __call__(self, request):
         return self.get_response(request)
 
-    def get_app_from_admin_context(self, request):
-        try:
-            parts = request.path.split("/")
-            if len(parts) > 2 and parts[1] == "admin":
-                return parts[2]
-        except Exception as e:
-            print(f"[CurrentUserRouter] Error detecting admin app: {e}")
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Called once the URL is resolved, so request.resolver_match is set.
+        self.process_current_user_middleware(request, get_app_name(request))
         return None
 
     def process_current_user_middleware(self, request, app_name):
-        try:
-            if app_name:
-                for middleware_path in settings.APPS_CURRENT_USER_MIDDLEWARE.get(app_name, []):
-                    self.load_and_execute_middleware(middleware_path, request)
-                    break  # Only one user middleware per app
-        except Exception as e:
-            print(f"[CurrentUserRouter] Error: {e}")
-
-    def load_and_execute_middleware(self, middleware_path, request):
-        try:
-            module_path, class_name = middleware_path.rsplit(".", 1)
-            middleware_class = getattr(import_module(module_path), class_name)
-            middleware_instance = middleware_class(lambda req: None)
-            middleware_instance.process_request(request)
-        except Exception as e:
-            print(f"[CurrentUserRouter] Failed to load middleware {middleware_path}: {e}")
+        middleware_classes = get_app_middleware_classes(
+            self.middleware_classes, app_name, "current_user", "CurrentUserRouter")
+        # Only one user middleware per app
+        for middleware_path, middleware_class in middleware_classes[:1]:
+            start = time.perf_counter()
+            try:
+                middleware_class(lambda req: None).process_request(request)
+            except Exception as e:
+                logger.exception("[CurrentUserRouter] Middleware %s failed: %s", middleware_path, e)
+            finally:
+                APP_MIDDLEWARE_DURATION.labels(
+                    router="current_user", app=app_name, middleware=middleware_path,
+                ).observe(time.perf_counter() - start)
 
 # class MiddlewareRouter:
 #     def __init__(self, get_response):
@@ -135,53 +211,31 @@ class MiddlewareRouter:
     Post-request middleware router for app-specific business logic
     (like model-level triggers, logging, etc.)
     """
+    EXCLUDED_APPS = ("jsi18n", "case")
+
     def __init__(self, get_response):
-        print("init ##############")
         self.get_response = get_response
+        self.middleware_classes = load_middleware_classes(
+            getattr(settings, "APP_MIDDLEWARE_MAPPING", {}), "MiddlewareRouter")
 
     def __call__(self, request):
-        print("call ###############")
         response = self.get_response(request)
-        # print("response ###############", response)
-        print("call ###############")
 
-        resolver_match = resolve(request.path_info)
-        app_name = resolver_match.app_name
-
-        if app_name in ["jsi18n", "case"]:
-            return response
-
-        if app_name == "admin":
-            app_name = self.get_app_from_admin_context(request)
-
-        self.process_app_specific_middlewares(request, app_name)
+        app_name = get_app_name(request)
+        if app_name and app_name not in self.EXCLUDED_APPS:
+            self.process_app_specific_middlewares(request, app_name)
         return response
 
-    def get_app_from_admin_context(self, request):
-        try:
-            parts = request.path.split("/")
-            if len(parts) > 2 and parts[1] == "admin":
-                return parts[2]
-        except Exception as e:
-            print(f"[MiddlewareRouter] Error detecting admin app: {e}")
-        return None
-
     def process_app_specific_middlewares(self, request, app_name):
-        # try:
-        if app_name and app_name == "case":
-            print("Case")
-        elif app_name and app_name in settings.APP_MIDDLEWARE_MAPPING:
-            for middleware_path in settings.APP_MIDDLEWARE_MAPPING[app_name]:
-                self.load_and_execute_middleware(middleware_path, request)
-
-        # except Exception as e:
-        #     print(f"[MiddlewareRouter] Error (DynamicModelMiddleware): {e}")
-
-    def load_and_execute_middleware(self, middleware_path, request):
-        try:
-            module_path, class_name = middleware_path.rsplit(".", 1)
-            middleware_class = getattr(import_module(module_path), class_name)
-            middleware_instance = middleware_class(lambda req: None)
-            middleware_instance(request)
-        except Exception as e:
-            print(f"[MiddlewareRouter] Failed to load middleware {middleware_path}: {e}")
\ No newline at end of file
+        middleware_classes = get_app_middleware_classes(
+            self.middleware_classes, app_name, "app", "MiddlewareRouter")
+        for middleware_path, middleware_class in middleware_classes:
+            start = time.perf_counter()
+            try:
+                middleware_class(lambda req: None)(request)
+            except Exception as e:
+                logger.exception("[MiddlewareRouter] Middleware %s failed: %s", middleware_path, e)
+            finally:
+                APP_MIDDLEWARE_DURATION.labels(
+                    router="app", app=app_name, middleware=middleware_path,
+                ).observe(time.perf_counter() - start)
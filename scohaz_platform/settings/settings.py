@@ -8,6 +8,7 @@ from .common import (BASE_DIR, INSTALLED_APPS, MIDDLEWARE, DATABASES,
                      MEDIA_ROOT, MEDIA_URL, STATIC_ROOT, CSRF_TRUSTED_ORIGINS, TRANSLATION_DIR)
 
 from icecream import ic
+from app_builder.utils.hot_registry import hot_app_middleware, read_hot_apps
 from datetime import timedelta
 from os import environ as ENV
 from dotenv import load_dotenv
@@ -57,6 +58,13 @@ CUSTOM_APPS = [
     # 'ab_app',
 
 ]
+
+# Apps published at runtime by the app builder (app_builder.utils.hot_registry)
+HOT_APPS_MANIFEST = os.path.join(BASE_DIR, 'dynamic_apps.json')
+# Seconds between a worker's checks for newly published apps
+HOT_APPS_SYNC_INTERVAL = 5
+HOT_APPS = [app for app in read_hot_apps(HOT_APPS_MANIFEST) if app not in CUSTOM_APPS]
+CUSTOM_APPS += HOT_APPS
 INSTALLED_APPS += CUSTOM_APPS + [
 
     "authentication",
@@ -124,7 +132,12 @@ APP_MIDDLEWARE_MAPPING = {
 
 }
 
+for app in HOT_APPS:
+    APPS_CURRENT_USER_MIDDLEWARE += hot_app_middleware(app)['current_user']
+    APP_MIDDLEWARE_MAPPING[app] = hot_app_middleware(app)['app']
+
 MIDDLEWARE = [
+    "scohaz_platform.middleware.HotAppsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django_prometheus.middleware.PrometheusBeforeMiddleware",
     "scohaz_platform.middleware.MiddlewareRouter",
@@ -214,6 +227,22 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers.DatabaseScheduler'
 CELERY_TIMEZONE = 'UTC'
 
+# Shared cache; rate limits and caches are only enforced across processes
+# when every worker uses the same backend.
+REDIS_CACHE_URL = ENV.get('REDIS_CACHE_URL')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+
+# API Trigger rate limits (calls per API_TRIGGER_RATE_LIMIT_WINDOW seconds)
+API_TRIGGER_RATE_LIMIT = int(ENV.get('API_TRIGGER_RATE_LIMIT', 10))  # per integration and case
+API_TRIGGER_GLOBAL_RATE_LIMIT = None  # across all integrations, None for no limit
+API_TRIGGER_RATE_LIMIT_WINDOW = 60
+
 if not DEBUG:  # Disable ic in production
     ic.disable()
 
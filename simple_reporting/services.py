@@ -363,7 +363,7 @@ class PDFGenerator:
                         elif element.image_selection_method == 'filename' and element.image_filename_contains:
                             # Find by filename
                             for f in matching_files:
-                                if element.image_filename_contains in f.get('file_url', ''):
+                                if element.image_filename_contains in (f.get('name') or f.get('file_url', '')):
                                     selected = f
                                     break
                             else:
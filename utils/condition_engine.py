@@ -0,0 +1,299 @@
+"""
+Compiled evaluator for ``condition_logic`` lists.
+
+Field visibility conditions, field calculations and approval step conditions
+all store the same JSON shape::
+
+    [{"field": "salary", "operation": ">", "value": 1000}, ...]
+
+Instead of re-walking that list and re-dispatching on ``operation`` for every
+evaluation, ``get_compiled_condition`` turns it once into a tree of closures
+(regexes for ``matches`` are compiled up front) and keeps the result in a
+process-wide LRU cache.
+"""
+import operator
+import re
+from collections import OrderedDict
+from datetime import date, datetime
+from threading import Lock
+
+from django.conf import settings
+
+COMPARISONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "contains": lambda a, b: str(b) in str(a),
+    "startswith": lambda a, b: str(a).startswith(str(b)),
+    "endswith": lambda a, b: str(a).endswith(str(b)),
+    "matches": lambda a, b: bool(re.match(b, str(a))),
+    "in": lambda a, b: a in b,
+    "not in": lambda a, b: a not in b,
+}
+
+ARITHMETIC = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": lambda a, b: a / b if b != 0 else 0,
+    "**": operator.pow,
+}
+
+# Calculation operations that work on the raw (non float-converted) values.
+RAW_CALCULATIONS = {"age_conditional", "if", "if_equals"}
+
+
+def evaluate_operation(field_value, operation, value):
+    """Evaluate a single comparison; unknown operations are False."""
+    compare = COMPARISONS.get(operation)
+    return compare(field_value, value) if compare else False
+
+
+def _field_ref(value):
+    if isinstance(value, dict) and "field" in value:
+        return value["field"]
+    return None
+
+
+def _getter(value, missing):
+    """Return a callable resolving ``value`` (a literal or a field reference)."""
+    ref = _field_ref(value)
+    if ref is None:
+        return lambda data: value
+    return lambda data: data.get(ref, missing)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return value
+
+
+class CompiledCondition:
+    """
+    A ``condition_logic`` list compiled into closures.
+    ``evaluate(data)`` returns the boolean outcome, ``calculate(data)`` the
+    calculated value, ``dependencies`` the field names the logic reads.
+    """
+    __slots__ = ("condition_logic", "missing", "dependencies", "_evaluate", "_calculate")
+
+    def __init__(self, condition_logic, missing=None):
+        self.condition_logic = condition_logic or []
+        self.missing = missing
+        self.dependencies = frozenset(self._collect_dependencies())
+        self._evaluate = self._compile_predicate()
+        self._calculate = None
+
+    def evaluate(self, data):
+        return self._evaluate(data)
+
+    def calculate(self, data):
+        if self._calculate is None:
+            self._calculate = self._compile_calculation()
+        return self._calculate(data)
+
+    def _collect_dependencies(self):
+        for logic in self.condition_logic:
+            if logic.get("field"):
+                yield logic["field"]
+            for key in ("value", "then_value", "else_value"):
+                ref = _field_ref(logic.get(key))
+                if ref:
+                    yield ref
+            if logic.get("operation") == "sum" and isinstance(logic.get("value"), list):
+                for name in logic["value"]:
+                    if isinstance(name, str):
+                        yield name.lstrip("-")
+            if logic.get("operation") == "age_conditional":
+                for key in ("under_age_field", "over_age_field"):
+                    if logic.get(key):
+                        yield logic[key]
+
+    # Boolean evaluation
+
+    def _compile_predicate(self):
+        steps = [self._compile_test(logic) for logic in self.condition_logic]
+        tests = tuple(test for combine, test in steps)
+
+        if all(combine is None for combine, _ in steps):
+            def evaluate(data):
+                for test in tests:
+                    if not test(data):
+                        return False
+                return True
+            return evaluate
+
+        def evaluate_with_combinators(data):
+            result = True
+            for combine, test in steps:
+                result = combine(result, test(data)) if combine else (result and test(data))
+            return result
+        return evaluate_with_combinators
+
+    def _compile_test(self, logic):
+        """Return (combine, test); combine is None for the default AND."""
+        missing = self.missing
+        field_name = logic.get("field")
+        operation = logic.get("operation")
+        raw_value = logic.get("value")
+        get_value = _getter(raw_value, missing)
+
+        def get_field(data):
+            return data.get(field_name, missing)
+
+        if operation == "matches":
+            if _field_ref(raw_value) is None:
+                pattern = re.compile(raw_value)
+                return None, lambda data: pattern.match(str(get_field(data))) is not None
+            return None, lambda data: re.match(get_value(data), str(get_field(data))) is not None
+
+        if operation in COMPARISONS:
+            compare = COMPARISONS[operation]
+            if _field_ref(raw_value) is None:
+                return None, lambda data: compare(get_field(data), raw_value)
+            return None, lambda data: compare(get_field(data), get_value(data))
+
+        if operation in ARITHMETIC:
+            calculate = ARITHMETIC[operation]
+            return None, lambda data: bool(calculate(get_field(data), get_value(data)))
+
+        if operation == "sum":
+            names = tuple(raw_value or ())
+            default = 0 if missing is None else missing
+            return None, lambda data: get_field(data) == sum(data.get(name, default) for name in names)
+
+        if operation == "and":
+            return None, lambda data: bool(get_value(data))
+        if operation == "or":
+            return (lambda result, value: result or value), lambda data: bool(get_value(data))
+        if operation == "not":
+            return (lambda result, value: not value), lambda data: bool(get_value(data))
+
+        return None, lambda data: False
+
+    # Calculation
+
+    def _compile_calculation(self):
+        for logic in self.condition_logic:
+            calculate = self._compile_calculation_step(logic)
+            if calculate is not None:
+                return calculate
+        return lambda data: None
+
+    def _compile_calculation_step(self, logic):
+        field_name = logic["field"]
+        operation = logic["operation"]
+        raw_value = logic.get("value", 0)
+        get_raw_value = _getter(raw_value, 0)
+
+        def operands(data):
+            field_value = data.get(field_name, 0)
+            value = get_raw_value(data)
+            if operation not in RAW_CALCULATIONS:
+                field_value = _to_float(field_value)
+                if not isinstance(value, (list, dict)):
+                    value = _to_float(value)
+            return field_value, value
+
+        if operation in ARITHMETIC:
+            calculate = ARITHMETIC[operation]
+
+            def arithmetic(data):
+                field_value, value = operands(data)
+                return calculate(field_value, value)
+            return arithmetic
+
+        if operation == "sum":
+            negative = tuple(name[1:] for name in raw_value if name.startswith("-"))
+            positive = tuple(name for name in raw_value if not name.startswith("-"))
+            return lambda data: (
+                sum(float(data.get(name, 0)) for name in positive)
+                - sum(float(data.get(name, 0)) for name in negative)
+            )
+
+        if operation in ("=", "copy"):
+            return lambda data: operands(data)[0]
+
+        if operation == "age_conditional":
+            threshold = logic.get("age_threshold", 18)
+            under_field = logic.get("under_age_field")
+            over_field = logic.get("over_age_field")
+
+            def age_conditional(data):
+                field_value = data.get(field_name, 0)
+                if not field_value:
+                    return 0
+                if isinstance(field_value, str):
+                    dob = datetime.strptime(field_value, "%Y-%m-%d").date()
+                else:
+                    dob = field_value
+                today = date.today()
+                age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+                return data.get(under_field if age < threshold else over_field, 0)
+            return age_conditional
+
+        if operation in ("if", "if_equals"):
+            if operation == "if":
+                compare = COMPARISONS.get(logic.get("condition_operator", "="), lambda a, b: False)
+            else:
+                compare = operator.eq
+            check_value = logic.get("check_value")
+            get_then = _getter(logic.get("then_value", 0), 0)
+            else_value = logic.get("else_value")
+
+            def conditional(data):
+                field_value = data.get(field_name, 0)
+                if compare(field_value, check_value):
+                    return get_then(data)
+                if "else_value" not in logic:
+                    return field_value
+                ref = _field_ref(else_value)
+                return data.get(ref, 0) if ref is not None else else_value
+            return conditional
+
+        return None
+
+
+_cache = OrderedDict()
+_cache_lock = Lock()
+
+
+def get_cache_size():
+    return getattr(settings, "CONDITION_ENGINE_CACHE_SIZE", 2048)
+
+
+def get_compiled_condition(condition_logic, key=None, missing=None):
+    """
+    Return the compiled form of ``condition_logic``, compiling it on first use.
+    ``key`` identifies the source row (e.g. ``(condition.pk, condition.updated_at)``);
+    without it the logic itself is used as the key.
+    """
+    if key is None:
+        key = repr(condition_logic)
+    key = (key, missing)
+
+    compiled = _cache.get(key)
+    if compiled is not None:
+        try:
+            _cache.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread in the meantime; still valid to use.
+            pass
+        return compiled
+
+    compiled = CompiledCondition(condition_logic, missing=missing)
+
+    with _cache_lock:
+        _cache[key] = compiled
+        while len(_cache) > get_cache_size():
+            _cache.popitem(last=False)
+    return compiled
+
+
+def clear_compiled_conditions():
+    with _cache_lock:
+        _cache.clear()
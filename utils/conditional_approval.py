@@ -1,3 +1,4 @@
+import logging
 import os
 import importlib.util
 from conditional_approval.models import ApprovalStepCondition
@@ -5,6 +6,8 @@ import ast
 
 import re
 
+logger = logging.getLogger(__name__)
+
 
 def validate_dict_values(values, regex_patterns):
     """
@@ -46,44 +49,12 @@ def evaluate_conditions(case_obj, approval_step):
 
     for condition in conditions:
         if condition.condition_logic:
-            # Evaluate each condition in the list
-            result = True
-            for logic in condition.condition_logic:
-                field_name = logic.get('field')
-                operation = logic.get('operation')
-                expected_value = logic.get('value')
-                case_value = case_obj.case_data.get(field_name)
-
-                if operation == "=":
-                    result &= (case_value == expected_value)
-                elif operation == "!=":
-                    result &= (case_value != expected_value)
-                elif operation == ">":
-                    result &= (case_value > expected_value)
-                elif operation == "<":
-                    result &= (case_value < expected_value)
-                elif operation == ">=":
-                    result &= (case_value >= expected_value)
-                elif operation == "<=":
-                    result &= (case_value <= expected_value)
-                elif operation == "contains":
-                    result &= (str(expected_value) in str(case_value))
-                elif operation == "startswith":
-                    result &= str(case_value).startswith(str(expected_value))
-                elif operation == "endswith":
-                    result &= str(case_value).endswith(str(expected_value))
-                elif operation == "in":
-                    result &= (case_value in expected_value)
-                elif operation == "not in":
-                    result &= (case_value not in expected_value)
-                else:
-                    result = False
-
-                if not result:
-                    break  # Exit early if any condition fails
-
-            if result:
-                return True, condition
+            try:
+                if condition.get_compiled().evaluate(case_obj.case_data):
+                    return True, condition
+            except re.error as e:
+                # A malformed "matches" pattern can't match anything.
+                logger.error(f"Invalid regex in approval step condition {condition.pk}: {e}")
 
     return False, None
 
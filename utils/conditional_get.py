@@ -0,0 +1,55 @@
+"""
+Conditional GET for public, rarely changing endpoints.
+
+A view decorated with ``conditional_get(etag_func)`` answers a request whose
+``If-None-Match`` matches the current ETag with ``304 Not Modified`` before
+the view runs, so an unchanged flow, translation file or lookup list costs
+a cache read rather than a rebuild. Both 200 and 304 responses carry the
+ETag and ``Cache-Control: public, max-age=PUBLIC_API_CACHE_MAX_AGE``; after
+that many seconds clients and CDNs revalidate with the ETag.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+
+def get_max_age():
+    return getattr(settings, "PUBLIC_API_CACHE_MAX_AGE", 60)
+
+
+def make_etag(request, *parts):
+    """
+    A strong ETag for the representation of ``parts`` (e.g. a version
+    counter) at the request's path and query string. The Accept header is
+    included since the browsable API and JSON renderers share the URL.
+    """
+    fingerprint = "\n".join(str(part) for part in (
+        *parts,
+        request.path,
+        sorted(request.GET.lists()),
+        request.META.get("HTTP_ACCEPT", ""),
+    ))
+    return '"%s"' % hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+
+
+def conditional_get(etag_func):
+    """
+    Method decorator for APIView handlers. ``etag_func(request, *args,
+    **kwargs)`` returns the current ETag, or None to skip conditional
+    handling (e.g. for a missing resource).
+    """
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag_func)(view_func)
+
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if response.status_code in (200, 304) and response.has_header("ETag"):
+                patch_cache_control(response, public=True, max_age=get_max_age())
+            return response
+        return wrapped
+    return method_decorator(decorator)
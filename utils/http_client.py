@@ -0,0 +1,157 @@
+"""
+Shared outbound HTTP client for integrations.
+
+Each worker thread keeps one ``requests.Session`` whose adapter holds a pool
+of keep-alive connections per host, so repeated calls to the same upstream
+skip the TCP/TLS handshake. Every request gets a timeout and a bounded
+number of retries on connection failures and 502/503/504 responses.
+
+``run_in_pool`` and ``run_concurrently`` run blocking calls on a long-lived
+thread pool, so their sessions (and connections) survive between requests.
+``run_async`` drives a coroutine of such calls from synchronous code.
+"""
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+_local = threading.local()
+_sessions = weakref.WeakSet()
+_executor = None
+_loop_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_default_timeout():
+    return getattr(settings, 'INTEGRATION_HTTP_TIMEOUT', 10)
+
+
+def get_retry_backoff():
+    return getattr(settings, 'INTEGRATION_HTTP_RETRY_BACKOFF', 0.5)
+
+
+def get_session():
+    """The calling thread's pooled session."""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        pool_size = getattr(settings, 'INTEGRATION_HTTP_POOL_SIZE', 10)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _local.session = session
+        _sessions.add(session)
+    return session
+
+
+def close_sessions():
+    """Close the kept-alive connections of every thread's session."""
+    for session in list(_sessions):
+        session.close()
+
+
+def _can_retry(method, error=None):
+    # A connection that was never established never reached the upstream,
+    # so even non-idempotent requests are safe to send again.
+    return method in IDEMPOTENT_METHODS or isinstance(error, requests.exceptions.ConnectTimeout)
+
+
+def send_request(method, url, headers=None, json=None, params=None, timeout=None, retries=0):
+    """
+    Send a request through the pooled session and return the response.
+    Connection errors and 502/503/504 responses are retried up to
+    ``retries`` times with exponential backoff.
+    """
+    method = method.upper()
+    timeout = timeout or get_default_timeout()
+    attempt = 0
+    while True:
+        try:
+            response = get_session().request(
+                method=method, url=url, headers=headers, json=json, params=params, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt >= retries or not _can_retry(method, e):
+                raise
+            logger.warning("Retrying %s %s after error: %s", method, url, e)
+        else:
+            if (response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= retries or not _can_retry(method)):
+                return response
+            logger.warning("Retrying %s %s after HTTP %s", method, url, response.status_code)
+            response.close()
+
+        time.sleep(get_retry_backoff() * 2 ** attempt)
+        attempt += 1
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'INTEGRATION_HTTP_MAX_WORKERS', 16),
+                    thread_name_prefix='integration-http',
+                )
+    return _executor
+
+
+def get_loop_executor():
+    """Threads for event loops started by ``run_async``, separate from the HTTP pool."""
+    global _loop_executor
+    if _loop_executor is None:
+        with _executor_lock:
+            if _loop_executor is None:
+                _loop_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'INTEGRATION_HTTP_MAX_WORKERS', 16),
+                    thread_name_prefix='integration-loop',
+                )
+    return _loop_executor
+
+
+async def run_in_pool(call, *args, **kwargs):
+    """Await a blocking call on the shared HTTP thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), lambda: call(*args, **kwargs))
+
+
+def run_async(coroutine):
+    """
+    Run ``coroutine`` to completion from synchronous code. Inside an already
+    running event loop (e.g. under ASGI) it runs on a thread of its own
+    instead of nesting loops. That thread never comes from the HTTP pool:
+    the coroutine waits on calls queued there, and loops parked on every
+    pool worker would leave none free to run them.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    return get_loop_executor().submit(asyncio.run, coroutine).result()
+
+
+def run_concurrently(calls):
+    """
+    Run zero-argument callables concurrently on the HTTP pool and return
+    their results in the same order; a call that raised yields its
+    exception instead.
+    """
+    futures = [get_executor().submit(call) for call in calls]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
@@ -0,0 +1,142 @@
+"""
+Opt-in response cache for integrations.
+
+Responses are cached under a hash of the resolved request (method, URL after
+path-parameter substitution, merged query params, headers and body) for the
+integration's ``cache_ttl``. Concurrent identical calls share one upstream
+request: inside a process through an in-flight future, across processes
+through a short cache lock that other workers wait on. GET integrations with
+a ``cache_stale_ttl`` are served stale for that long after expiry while a
+single background refresh runs.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+from django.core.cache import cache
+from prometheus_client import Counter
+
+from utils.http_client import get_executor
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "integration:response"
+LOCK_WAIT_INTERVAL = 0.05
+
+INTEGRATION_CACHE_LOOKUPS = Counter(
+    "integration_response_cache_lookups_total",
+    "Integration response cache lookups by result (hit, stale, miss, shared).",
+    ["integration", "result"],
+)
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def response_cache_key(integration, request):
+    fingerprint = json.dumps({
+        "method": request["method"],
+        "url": request["url"],
+        "params": request.get("params"),
+        "headers": request.get("headers"),
+        "json": request.get("json"),
+    }, sort_keys=True, default=str)
+    digest = hashlib.sha256(fingerprint.encode()).hexdigest()
+    return f"{CACHE_PREFIX}:{integration.pk}:{digest}"
+
+
+def _record(integration, result):
+    INTEGRATION_CACHE_LOOKUPS.labels(integration=integration.name, result=result).inc()
+
+
+def _store(key, response, ttl, stale_ttl):
+    cache.set(key, {"response": response, "fresh_until": time.time() + ttl}, ttl + stale_ttl)
+    return response
+
+
+def _single_flight(key, fetch):
+    """Run ``fetch`` once per ``key`` in this process; concurrent callers wait for it."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+
+    if not owner:
+        return True, future.result()
+
+    try:
+        result = fetch()
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return False, result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _fetch_across_processes(key, fetch, ttl, stale_ttl, lock_timeout):
+    """
+    Take the cross-process lock for ``key`` and fetch, or wait (up to
+    ``lock_timeout``) for the worker holding it to fill the cache.
+    """
+    lock_key = f"{key}:lock"
+    deadline = time.monotonic() + lock_timeout
+    while not cache.add(lock_key, 1, lock_timeout):
+        entry = cache.get(key)
+        if entry is not None and entry["fresh_until"] > time.time():
+            return entry["response"]
+        if time.monotonic() >= deadline:
+            # The holder is too slow or died; don't wait on it any longer.
+            return _store(key, fetch(), ttl, stale_ttl)
+        time.sleep(LOCK_WAIT_INTERVAL)
+
+    try:
+        return _store(key, fetch(), ttl, stale_ttl)
+    finally:
+        cache.delete(lock_key)
+
+
+def _refresh_in_background(key, fetch, ttl, stale_ttl):
+    lock_key = f"{key}:refresh"
+    if not cache.add(lock_key, 1, ttl):
+        return
+
+    def refresh():
+        try:
+            _store(key, fetch(), ttl, stale_ttl)
+        except Exception as e:
+            logger.warning("Background refresh of %s failed: %s", key, e)
+        finally:
+            cache.delete(lock_key)
+
+    get_executor().submit(refresh)
+
+
+def cached_call(integration, request, fetch, ttl, stale_ttl=0, lock_timeout=10):
+    """
+    Return ``fetch()`` for ``request`` through the response cache. ``fetch``
+    must return the parsed response and raise on failure; failures are
+    never cached.
+    """
+    key = response_cache_key(integration, request)
+    entry = cache.get(key)
+    if entry is not None:
+        if entry["fresh_until"] > time.time():
+            _record(integration, "hit")
+            return entry["response"]
+        if stale_ttl and request["method"] == "GET":
+            _record(integration, "stale")
+            _refresh_in_background(key, fetch, ttl, stale_ttl)
+            return entry["response"]
+
+    shared, response = _single_flight(
+        key, lambda: _fetch_across_processes(key, fetch, ttl, stale_ttl, lock_timeout))
+    _record(integration, "shared" if shared else "miss")
+    return response
@@ -1,53 +1,97 @@
-import requests
+from base64 import b64encode
+
 from django.conf import settings
 
+from utils.http_client import get_default_timeout, run_in_pool, send_request
+from utils.integration_cache import cached_call
+
 
 class APIRequestHelper:
     def __init__(self, integration):
         self.integration = integration
 
-    def call_api(self, body=None,
-                 query_params=None, headers=None):
-        # Set default values
-        url = self.integration.endpoint
+    def build_request(self, body=None, query_params=None, headers=None, custom_url=None):
+        """
+        Merge the integration's configuration with the call's own body,
+        query parameters, headers and (path-parameter resolved) URL.
+        """
+        url = custom_url or self.integration.endpoint
         method = self.integration.method
 
-        # Prepare headers
-        final_headers = {
-            **{'Content-Type': 'application/json'},
-            **self.integration.headers}
-        if headers:
-            final_headers.update(headers)
+        # Internal endpoints are relative to this site
+        if url.startswith('/api/'):
+            url = f"{getattr(settings, 'SITE_URL', '')}{url}"
+
+        # Build headers
+        request_headers = {
+            'Content-Type': 'application/json',
+            **(self.integration.headers or {}),
+            **(headers or {})
+        }
 
-        # Prepare request body
-        final_body = body if body is not None \
-            else self.integration.request_body
+        # Add authentication
+        credentials = self.integration.auth_credentials or {}
+        if self.integration.authentication_type == 'Basic':
+            basic = f"{credentials.get('username')}:{credentials.get('password')}"
+            request_headers['Authorization'] = f'Basic {b64encode(basic.encode()).decode()}'
+        elif self.integration.authentication_type == 'Bearer':
+            request_headers['Authorization'] = f"Bearer {credentials.get('token')}"
 
-        # Prepare query parameters
-        final_query_params = query_params \
-            if query_params is not None \
-            else self.integration.query_params
+        # Merge query parameters
+        final_query_params = {
+            **(self.integration.query_params or {}),
+            **(query_params or {})
+        }
 
-        # Check if the URL is internal or external
-        if url.startswith('/api/'):
-            url = f"{settings.SITE_URL}{url}"
+        # Merge request body
+        if method in ['POST', 'PUT', 'PATCH']:
+            final_body = {
+                **(self.integration.request_body or {}),
+                **(body or {})
+            }
+        else:
+            final_body = None
+
+        return {
+            'method': method,
+            'url': url,
+            'headers': request_headers,
+            'json': final_body,
+            'params': final_query_params,
+            'timeout': self.integration.timeout,
+            'retries': self.integration.http_retries,
+        }
+
+    def call_api(self, body=None, query_params=None, headers=None, custom_url=None, cache_ttl=None):
+        """
+        Make the API request through the shared pooled client. With a cache
+        TTL (``cache_ttl`` or the integration's own) the parsed response is
+        served from the integration response cache.
+        """
+        request = self.build_request(body, query_params, headers, custom_url)
+
+        def fetch():
+            return self.parse_response(send_request(**request))
+
+        ttl = cache_ttl if cache_ttl is not None else self.integration.cache_ttl
+        if not ttl:
+            return fetch()
+        return cached_call(self.integration, request, fetch, ttl,
+                           stale_ttl=self.integration.cache_stale_ttl or 0,
+                           lock_timeout=request['timeout'] or get_default_timeout())
+
+    async def acall_api(self, body=None, query_params=None, headers=None, custom_url=None, cache_ttl=None):
+        """
+        Awaitable ``call_api``; the request runs on the shared HTTP thread pool.
+        """
+        return await run_in_pool(self.call_api, body, query_params, headers, custom_url, cache_ttl)
+
+    @staticmethod
+    def parse_response(response):
+        response.raise_for_status()
 
-        # Make the API call based on the method
+        # Return JSON response if available
         try:
-            if method == 'GET':
-                response = requests.get(
-                    url, headers=final_headers, params=final_query_params)
-            elif method == 'POST':
-                response = requests.post(
-                    url, headers=final_headers, json=final_body)
-            elif method == 'PUT':
-                response = requests.put(
-                    url, headers=final_headers, json=final_body)
-            elif method == 'DELETE':
-                response = requests.delete(
-                    url, headers=final_headers, json=final_body)
-
-            response.raise_for_status()  # Raise an error for bad responses
             return response.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"API request failed: {str(e)}")
+        except ValueError:
+            return {'status_code': response.status_code, 'text': response.text}
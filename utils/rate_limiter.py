@@ -0,0 +1,81 @@
+"""
+Sliding-window rate limiter on the Django cache.
+
+Each key counts calls in fixed windows (``cache.add`` + ``cache.incr``, both
+atomic on the shared cache backends) and weighs the previous window by how
+much of it still overlaps the sliding window. Nothing is ever rewritten
+with ``set``, so concurrent workers can't lose increments and a busy key
+still rolls over to a new window.
+"""
+import math
+import time
+
+from django.core.cache import cache
+
+CACHE_PREFIX = "ratelimit"
+
+
+class SlidingWindowRateLimiter:
+    def __init__(self, key, limit, window=60):
+        self.key = key
+        self.limit = limit
+        self.window = window
+        self._acquired = None
+
+    def _bucket(self, index):
+        return f"{CACHE_PREFIX}:{self.key}:{self.window}:{index}"
+
+    def _incr(self, bucket, delta=1):
+        cache.add(bucket, 0, self.window * 2)
+        try:
+            return cache.incr(bucket, delta)
+        except ValueError:
+            # Expired between add and incr; start the window over.
+            cache.add(bucket, 0, self.window * 2)
+            return cache.incr(bucket, delta)
+
+    def acquire(self, now=None):
+        """
+        Take one call from the limit. Returns 0 when allowed, otherwise the
+        number of seconds until a call is expected to fit again.
+        """
+        now = time.time() if now is None else now
+        index = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+
+        current = self._incr(self._bucket(index))
+        previous = cache.get(self._bucket(index - 1), 0)
+        if previous * (1 - elapsed) + current <= self.limit:
+            self._acquired = index
+            return 0
+
+        # Over the limit: give the slot back and work out when one frees up.
+        cache.decr(self._bucket(index))
+        room = self.limit - current
+        if room < 0 or not previous:
+            wait = (1 - elapsed) * self.window
+        else:
+            wait = max(0.0, (1 - room / previous) - elapsed) * self.window
+        return max(1, math.ceil(wait))
+
+    def release(self):
+        """Hand back the call taken by the last successful ``acquire``."""
+        if self._acquired is not None:
+            cache.decr(self._bucket(self._acquired))
+            self._acquired = None
+
+
+def acquire_all(limiters, now=None):
+    """
+    Take a call from every limiter, or from none of them. Returns 0 when
+    allowed, otherwise the wait reported by the limiter that refused.
+    """
+    acquired = []
+    for limiter in limiters:
+        wait = limiter.acquire(now)
+        if wait:
+            for taken in acquired:
+                taken.release()
+            return wait
+        acquired.append(limiter)
+    return 0
@@ -0,0 +1,208 @@
+"""
+Opt-in result cache for report and inquiry executions.
+
+A result is cached under a hash of everything it depends on: the version of
+the report or inquiry definition, the versions of the models it reads, the
+normalized parameters, the caller's permission scope and the page. Nothing is
+ever deleted on invalidation; bumping a version makes the old entries
+unreachable and they expire with their TTL.
+
+Model versions are bumped after commit by ``post_save``/``post_delete`` of
+the models read by a cache-enabled definition; the receivers are connected
+to those models only. Which models those are is asked from the loaders
+registered with ``register_tracked_models``, after a definition changes and
+otherwise at the start of a request or Celery task once every
+``RESULT_CACHE_TRACKING_REFRESH`` seconds per process, so nothing is queried
+while migrating or inside other writes. Writes that bypass signals
+(``QuerySet.update``, ``bulk_create``) are only covered by the TTL.
+
+Hits are counted in ``result_cache_lookups_total``; only a sample of them
+(``RESULT_CACHE_HIT_LOG_SAMPLE_RATE``) is written to the execution logs.
+"""
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+
+from celery.signals import task_prerun
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_started
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_delete, post_save
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "result_cache"
+
+RESULT_CACHE_LOOKUPS = Counter(
+    "result_cache_lookups_total",
+    "Report and inquiry result cache lookups by result (hit, durable_hit, miss).",
+    ["source", "result"],
+)
+
+_tracked_loaders = []
+_tracked = {"labels": frozenset(), "loaded_at": None}
+_connected = {}
+_tracked_lock = threading.Lock()
+
+
+def get_tracking_refresh():
+    return getattr(settings, "RESULT_CACHE_TRACKING_REFRESH", 60)
+
+
+def get_hit_log_sample_rate():
+    return getattr(settings, "RESULT_CACHE_HIT_LOG_SAMPLE_RATE", 0.01)
+
+
+def get_version(name):
+    """
+    Current value of the version counter ``name``. Counters never expire;
+    a missing one is seeded from the clock so it can't restart at a value
+    that cached results are still stored under.
+    """
+    key = f"{CACHE_PREFIX}:version:{name}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(name):
+    try:
+        return cache.incr(f"{CACHE_PREFIX}:version:{name}")
+    except ValueError:
+        return get_version(name)
+
+
+def model_version_name(label_lower):
+    return f"model:{label_lower}"
+
+
+def normalize(value):
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def result_cache_key(source, source_id, definition_version, dependencies,
+                     parameters, scope, page):
+    """
+    Cache key of one result. ``dependencies`` are the lower-cased labels of
+    the models the result reads; their current versions are part of the key.
+    """
+    versions = {
+        label: get_version(model_version_name(label)) for label in sorted(dependencies)
+    }
+    fingerprint = normalize({
+        "definition": definition_version,
+        "models": versions,
+        "parameters": parameters,
+        "scope": scope,
+        "page": page,
+    })
+    digest = hashlib.sha256(fingerprint.encode()).hexdigest()
+    return f"{CACHE_PREFIX}:{source}:{source_id}:{digest}"
+
+
+def get_cached_result(key):
+    return cache.get(key)
+
+
+def set_cached_result(key, result, ttl):
+    cache.set(key, result, ttl)
+
+
+def record_lookup(source, result):
+    RESULT_CACHE_LOOKUPS.labels(source=source, result=result).inc()
+
+
+def should_log_hit():
+    return random.random() < get_hit_log_sample_rate()
+
+
+def register_tracked_models(loader):
+    """
+    Register ``loader()``, returning the lower-cased labels of the models
+    read by cache-enabled definitions, e.g. a report's data sources.
+    """
+    if loader not in _tracked_loaders:
+        _tracked_loaders.append(loader)
+    _tracked["loaded_at"] = None
+
+
+def reset_tracked_models():
+    """A definition changed in this process; re-read the tracked models after commit."""
+    _tracked["loaded_at"] = None
+    transaction.on_commit(refresh_tracked_models)
+
+
+def tracked_model_labels():
+    return _tracked["labels"]
+
+
+def refresh_tracked_models(sender=None, **kwargs):
+    """
+    Re-read the tracked models, unless that was done less than
+    ``RESULT_CACHE_TRACKING_REFRESH`` seconds ago, and connect the version
+    bumps to them.
+    """
+    loaded_at = _tracked["loaded_at"]
+    if loaded_at is not None and time.monotonic() - loaded_at < get_tracking_refresh():
+        return
+
+    with _tracked_lock:
+        # Set before loading so a failure is retried after the refresh
+        # interval rather than on every request
+        _tracked["loaded_at"] = time.monotonic()
+        labels = set()
+        try:
+            # In a savepoint, so a failure can't break an enclosing transaction
+            with transaction.atomic():
+                for loader in _tracked_loaders:
+                    labels.update(loader())
+        except DatabaseError:
+            # e.g. the tables don't exist yet
+            logger.warning("Could not load result cache dependencies", exc_info=True)
+            return
+        _tracked["labels"] = frozenset(labels)
+        _connect_tracked_models(labels)
+
+
+def _connect_tracked_models(labels):
+    for label in set(_connected) - labels:
+        model = _connected.pop(label)
+        post_save.disconnect(sender=model, dispatch_uid=f"result_cache_save_{label}")
+        post_delete.disconnect(sender=model,
+                               dispatch_uid=f"result_cache_delete_{label}")
+
+    for label in labels - set(_connected):
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            continue
+        post_save.connect(invalidate_model_results, sender=model,
+                          dispatch_uid=f"result_cache_save_{label}")
+        post_delete.connect(invalidate_model_results, sender=model,
+                            dispatch_uid=f"result_cache_delete_{label}")
+        _connected[label] = model
+
+
+def invalidate_model_results(sender, **kwargs):
+    label = sender._meta.label_lower
+    # After commit, so a concurrent request can't cache pre-change rows
+    # under the new version
+    transaction.on_commit(lambda: bump_version(model_version_name(label)))
+
+
+def connect_dependency_signals():
+    """
+    Refresh the tracked models as requests and tasks start; called from the
+    apps' signal modules.
+    """
+    request_started.connect(refresh_tracked_models,
+                            dispatch_uid="result_cache_request_started")
+    task_prerun.connect(refresh_tracked_models, dispatch_uid="result_cache_task_prerun")
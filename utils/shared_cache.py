@@ -0,0 +1,17 @@
+"""
+Whether the default cache is shared between processes.
+
+Version counters bumped in one process (service flows, hot apps) only reach
+the other web and Celery workers through a cache that lives outside the
+process, e.g. Redis via ``REDIS_CACHE_URL``. Without it Django falls back to
+``LocMemCache``, which every process keeps to itself.
+"""
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared_cache(alias=DEFAULT_CACHE_ALIAS):
+    return not isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
@@ -0,0 +1,127 @@
+"""
+Row-at-a-time export writers.
+
+Every writer turns an iterable of rows into an iterable of ``bytes`` chunks,
+so a ``StreamingHttpResponse`` (or a file written by a background job)
+only ever holds one chunk of rows. JSON is written incrementally; XLSX goes
+through an openpyxl write-only workbook, which spools rows to disk, and the
+finished file is read back in blocks.
+"""
+import csv
+import json
+import tempfile
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+CSV_CONTENT_TYPE = 'text/csv'
+JSON_CONTENT_TYPE = 'application/json'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+FILE_BLOCK_SIZE = 64 * 1024
+
+
+def get_chunk_size():
+    """Rows fetched per database round trip (``QuerySet.iterator(chunk_size=...)``)."""
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+
+class CountingIterator:
+    """
+    Wraps a row iterable and counts the rows that went through it, calling
+    ``on_progress(count)`` every ``every`` rows when given.
+    """
+
+    def __init__(self, rows, on_progress=None, every=None):
+        self._rows = iter(rows)
+        self.count = 0
+        self._on_progress = on_progress
+        self._every = every or get_chunk_size()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self._rows)
+        self.count += 1
+        if self._on_progress and self.count % self._every == 0:
+            self._on_progress(self.count)
+        return row
+
+
+class _LineBuffer:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, value):
+        self.lines.append(value)
+
+
+def csv_chunks(header, rows, delimiter=',', rows_per_chunk=500):
+    """CSV bytes for ``header`` (or None) followed by ``rows`` (lists of cell values)."""
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
+    if header is not None:
+        writer.writerow(header)
+
+    for row in rows:
+        writer.writerow(row)
+        if len(buffer.lines) >= rows_per_chunk:
+            yield ''.join(buffer.lines).encode('utf-8')
+            buffer.lines.clear()
+    if buffer.lines:
+        yield ''.join(buffer.lines).encode('utf-8')
+
+
+def json_chunks(rows, head=None, tail=None, rows_per_chunk=500):
+    """
+    A JSON object ``{**head, "data": [rows...], **tail()}`` written row by
+    row. ``tail`` is called after the last row, so it can report counts.
+    """
+    def encode(value):
+        return json.dumps(value, default=str)
+
+    parts = ['{']
+    for key, value in (head or {}).items():
+        parts.append(f'{encode(key)}: {encode(value)}, ')
+    parts.append('"data": [')
+
+    first = True
+    for row in rows:
+        parts.append(('\n' if first else ',\n') + encode(row))
+        first = False
+        if len(parts) >= rows_per_chunk:
+            yield ''.join(parts).encode('utf-8')
+            parts = []
+
+    parts.append('\n]')
+    for key, value in (tail() if tail else {}).items():
+        parts.append(f', {encode(key)}: {encode(value)}')
+    parts.append('}')
+    yield ''.join(parts).encode('utf-8')
+
+
+def xlsx_chunks(write_workbook):
+    """
+    XLSX bytes of a write-only workbook filled by ``write_workbook(wb)``.
+    The rows never accumulate in memory; the zipped file is assembled in a
+    temporary file and streamed back in blocks.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    write_workbook(workbook)
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            block = output.read(FILE_BLOCK_SIZE)
+            if not block:
+                break
+            yield block
+
+
+def streaming_response(chunks, content_type, filename):
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response